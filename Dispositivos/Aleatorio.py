@@ -0,0 +1,133 @@
+"""
+Números aleatórios reproduzíveis, um fluxo independente por dispositivo.
+
+O fluxo de cada dispositivo é determinado pela semente da frota e pelo token: a chave do
+fluxo é o BLAKE2b dos dois, e os números saem em blocos gerados pelo SHAKE-128 da chave com
+o número do bloco. A mesma semente reproduz a frota inteira, em qualquer processo, ordem de
+criação ou plataforma; sem semente, cada dispositivo usa uma chave de os.urandom.
+"""
+import hashlib
+import os
+import sys
+from array import array
+
+# Quantidade de números de cada bloco (8 bytes do SHAKE-128 por número).
+TAMANHO_BLOCO = 32
+
+# 2**-53: converte os 53 bits mais altos de um número de 64 bits em um float em [0, 1).
+_ESCALA = 2.0 ** -53
+
+# 2**-64: converte um número de 64 bits em um float em [0, 1] (1 só por arredondamento, como em random.uniform).
+_ESCALA64 = 2.0 ** -64
+
+
+def chaveDispositivo(semente, token: str) -> bytes:
+    """
+    Deriva a chave do fluxo de um dispositivo a partir da semente da frota e do token.
+
+    Parâmetros
+    ----------
+        - semente (int | str): A semente da frota.
+        - token (str): O token do dispositivo.
+
+    Retorna
+    -------
+        bytes: A chave de 16 bytes do fluxo.
+    """
+    return hashlib.blake2b(f"{semente}:{token}".encode(), digest_size=16, person=b"Dispositivos").digest()
+
+
+class FluxoAleatorio():
+    """
+    Fluxo de números aleatórios de um dispositivo, com a interface de random usada pelos sensores.
+
+    Os números são gerados em blocos de TAMANHO_BLOCO e consumidos um a um: cada sorteio só
+    retira um número já pronto, e o fluxo inteiro ocupa algumas centenas de bytes (um
+    random.Random ocupa 2,5 kB e leva microssegundos para ser semeado).
+
+    Atributos
+    ---------
+        - chave (bytes): A chave do fluxo (ver chaveDispositivo).
+        - bloco (int): O número do próximo bloco a ser gerado.
+    """
+
+    __slots__ = ("chave", "bloco", "_numeros")
+
+    def __init__(self, chave: bytes) -> None:
+        """
+        Inicializa o fluxo no primeiro bloco.
+
+        Parâmetros
+        ----------
+            - chave (bytes): A chave do fluxo.
+        """
+        self.chave = chave
+        self.bloco = 0
+        self._numeros = array("Q")
+
+    @classmethod
+    def doDispositivo(cls, token: str, semente=None) -> "FluxoAleatorio":
+        """
+        Cria o fluxo de um dispositivo.
+
+        Parâmetros
+        ----------
+            - token (str): O token do dispositivo.
+            - semente (int | str): A semente da frota.
+                Padrão = None (chave aleatória, não reproduzível).
+
+        Retorna
+        -------
+            FluxoAleatorio: O fluxo do dispositivo.
+        """
+        return cls(os.urandom(16) if semente is None else chaveDispositivo(semente, token))
+
+    def _gera(self) -> int:
+        numeros = array("Q", hashlib.shake_128(self.chave + self.bloco.to_bytes(8, "little")).digest(8 * TAMANHO_BLOCO))
+        if sys.byteorder == "big":
+            numeros.byteswap()
+        self.bloco += 1
+        self._numeros = numeros
+        return numeros.pop()
+
+    def inteiro64(self) -> int:
+        """
+        Retorna o próximo número do fluxo, um inteiro de 64 bits (ex.: a semente de um numpy.random.Generator).
+        """
+        try:
+            return self._numeros.pop()
+        except IndexError:
+            return self._gera()
+
+    def random(self) -> float:
+        """
+        Retorna um float em [0, 1).
+        """
+        try:
+            numero = self._numeros.pop()
+        except IndexError:
+            numero = self._gera()
+        return (numero >> 11) * _ESCALA
+
+    def uniform(self, a: float, b: float) -> float:
+        """
+        Retorna um float entre a e b, como random.uniform.
+        """
+        try:
+            numero = self._numeros.pop()
+        except IndexError:
+            numero = self._gera()
+        return a + (b - a) * (numero * _ESCALA64)
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        Retorna um inteiro entre a e b, inclusive, como random.randint.
+        """
+        try:
+            numero = self._numeros.pop()
+        except IndexError:
+            numero = self._gera()
+        return a + (numero * (b - a + 1) >> 64)
+
+    def __repr__(self) -> str:
+        return f"FluxoAleatorio(chave={self.chave.hex()}, bloco={self.bloco})"
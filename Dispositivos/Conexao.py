@@ -0,0 +1,139 @@
+import http.client
+import json
+import ssl
+import threading
+from urllib.parse import urlsplit
+from Dispositivos.Leitura import SerializadorTagoIO
+from Dispositivos.Transporte import URL_TAGOIO, LimiteRequisicoes
+
+_contextoSSL = None
+
+
+def _obtemContextoSSL() -> ssl.SSLContext:
+    global _contextoSSL
+    if _contextoSSL is None:
+        _contextoSSL = ssl.create_default_context()
+    return _contextoSSL
+
+
+class ConexaoTagoIO():
+    """
+    Conexão HTTP persistente (keep-alive) com a API de dispositivos do TagoIO.
+
+    Equivalente ao método sendData de tagoio_sdk.Device, mas reaproveita a mesma conexão
+    TCP/TLS entre envios em vez de abrir uma nova sessão a cada chamada. Se o servidor
+    fechar a conexão ociosa, ela é reaberta de forma transparente no próximo envio.
+
+    Atributos
+    ---------
+        - token (str): O token de autenticação do dispositivo.
+        - url (str): A URL base da API (ex.: um servidor local para testes).
+        - timeout (float): O tempo limite em segundos de cada requisição.
+        - politica (PoliticaEnvio): A política que comprime o corpo das requisições, ou None.
+    """
+
+    def __init__(self, token: str, url: str = URL_TAGOIO, timeout: float = 10, politica=None) -> None:
+        """
+        Inicializa a conexão. O socket só é aberto no primeiro envio.
+
+        Parâmetros
+        ----------
+            - token (str): O token de autenticação do dispositivo.
+            - url (str): A URL base da API.
+                Padrão = "https://api.tago.io".
+            - timeout (float): O tempo limite em segundos de cada requisição.
+                Padrão = 10.
+            - politica (PoliticaEnvio): A política que comprime o corpo das requisições (ver PoliticaEnvio.comprime).
+                Padrão = None (sem compressão).
+        """
+        self.token = token
+        self.url = url
+        self.timeout = timeout
+        self.politica = politica
+        partes = urlsplit(url)
+        self._https = partes.scheme == "https"
+        self._host = partes.netloc
+        self._caminho = partes.path.rstrip("/") + "/data"
+        self._cabecalhos = {
+            "Device-Token": token,
+            "Content-Type": "application/json",
+        }
+        self._conexao = None
+        self._trava = threading.Lock()
+        self._serializador = SerializadorTagoIO()
+
+    def _abre(self) -> http.client.HTTPConnection:
+        if self._https:
+            return http.client.HTTPSConnection(self._host, timeout=self.timeout, context=_obtemContextoSSL())
+        return http.client.HTTPConnection(self._host, timeout=self.timeout)
+
+    def fecha(self) -> None:
+        """
+        Fecha a conexão persistente, se estiver aberta.
+        """
+        with self._trava:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
+
+    def _requisita(self, corpo: bytes) -> tuple:
+        cabecalhos = self._cabecalhos
+        if self.politica is not None:
+            corpo, codificacao = self.politica.comprime(corpo)
+            if codificacao is not None:
+                cabecalhos = {**cabecalhos, "Content-Encoding": codificacao}
+        for tentativa in range(2):
+            reaproveitada = self._conexao is not None
+            if not reaproveitada:
+                self._conexao = self._abre()
+            try:
+                self._conexao.request("POST", self._caminho, body=corpo, headers=cabecalhos)
+                resposta = self._conexao.getresponse()
+                conteudo = resposta.read()
+            except (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionError):
+                self._conexao.close()
+                self._conexao = None
+                # Só tenta de novo se a falha veio de uma conexão ociosa fechada pelo servidor.
+                if reaproveitada and tentativa == 0:
+                    continue
+                raise
+            except Exception:
+                self._conexao.close()
+                self._conexao = None
+                raise
+            if resposta.will_close:
+                self._conexao.close()
+                self._conexao = None
+            return resposta.status, conteudo, resposta.getheader("Retry-After")
+
+    def sendData(self, dados) -> str:
+        """
+        Envia um ou mais registros de dados para o TagoIO.
+
+        Parâmetros
+        ----------
+            - dados (Leitura | dict | list): Um registro ou uma lista de registros no formato do TagoIO.
+                Timestamps inteiros (ns) no campo 'time' são formatados em texto.
+
+        Retorna
+        -------
+            str: O resultado retornado pela API (ex.: "1 Data Added").
+
+        Lança
+        -----
+            LimiteRequisicoes: Se a API recusar o envio por excesso de requisições (HTTP 429).
+            Exception: Se a API recusar os dados ou a requisição falhar.
+        """
+        with self._trava:
+            # O corpo é o buffer do serializador, reaproveitado no próximo envio: só é usado sob a trava.
+            status, conteudo, retryAfter = self._requisita(self._serializador.serializa(dados))
+        if status == 429:
+            raise LimiteRequisicoes(f"HTTP 429: limite de requisições do TagoIO (Retry-After: {retryAfter})",
+                                    LimiteRequisicoes.esperaRetryAfter(retryAfter))
+        try:
+            resposta = json.loads(conteudo)
+        except ValueError:
+            raise Exception(f"Resposta inválida do TagoIO (HTTP {status})")
+        if status >= 400 or not resposta.get("status", False):
+            raise Exception(resposta.get("message") or resposta.get("result") or f"HTTP {status}")
+        return resposta.get("result")
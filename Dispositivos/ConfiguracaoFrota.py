@@ -0,0 +1,340 @@
+import datetime
+import functools
+import importlib
+import inspect
+import json
+import os
+from typing import Callable
+from Dispositivos.Dispositivo import Dispositivo, coletaDados
+from Dispositivos.PoliticaEnvio import PoliticaEnvio
+from Dispositivos.LimitadorEnvio import LimitadorEnvio
+
+TIPOS = ("Termometro", "SensorAgua", "SensorUmidade", "SensorLuminosidade", "SensorSom", "SensorPressao", "SensorMovimento")
+
+# Chaves de um grupo que não são parâmetros do dispositivo.
+_CHAVES_GRUPO = ("tipo", "tokens", "quantidade", "inicio", "intervalo", "execucoes")
+
+
+def _partesHorario(valor: str) -> tuple:
+    # "H:MM" ou "H:MM:SS"; as horas podem ter um dígito e, em durações, passar de 23.
+    partes = valor.split(":")
+    if len(partes) not in (2, 3) or not all(parte.strip().isdigit() for parte in partes[:2]):
+        raise ValueError(f"Horário inválido: {valor!r} (use \"HH:MM[:SS]\")")
+    horas, minutos = int(partes[0]), int(partes[1])
+    segundos = float(partes[2]) if len(partes) == 3 else 0
+    if minutos >= 60 or not 0 <= segundos < 60:
+        raise ValueError(f"Horário inválido: {valor!r} (use \"HH:MM[:SS]\")")
+    return horas, minutos, segundos
+
+
+def _converteHorario(valor) -> datetime.time:
+    if isinstance(valor, datetime.time):
+        return valor
+    if not isinstance(valor, str):
+        raise ValueError(f"Horário inválido: {valor!r} (escreva horários como texto, ex.: \"16:00\")")
+    horas, minutos, segundos = _partesHorario(valor)
+    return datetime.time(horas, minutos, int(segundos), round(segundos % 1 * 1e6))
+
+
+def _converteDuracao(valor) -> datetime.timedelta:
+    if isinstance(valor, datetime.timedelta):
+        return valor
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return datetime.timedelta(seconds=valor)
+    if isinstance(valor, datetime.time):
+        return datetime.timedelta(hours=valor.hour, minutes=valor.minute, seconds=valor.second)
+    if not isinstance(valor, str):
+        raise ValueError(f"Duração inválida: {valor!r} (use segundos ou \"HH:MM[:SS]\")")
+    horas, minutos, segundos = _partesHorario(valor)
+    return datetime.timedelta(hours=horas, minutes=minutos, seconds=segundos)
+
+
+def _converteJanelas(valor) -> list:
+    # Pares [início, fim]; um número no lugar do fim é a duração em segundos.
+    return [(_converteHorario(inicio),
+             _converteDuracao(fim) if isinstance(fim, (int, float, datetime.timedelta)) else _converteHorario(fim))
+            for inicio, fim in valor]
+
+
+def _convertePolitica(valor) -> PoliticaEnvio:
+    if isinstance(valor, PoliticaEnvio):
+        return valor
+    return PoliticaEnvio(**valor)
+
+
+def _converteLimitador(valor, limitadores: dict = None) -> LimitadorEnvio:
+    # limitadores: os já criados em uma mesma frota, por configuração; grupos com o mesmo
+    # limitador (ex.: em [padrao]) compartilham a instância, e o limite global vale para todos.
+    if isinstance(valor, LimitadorEnvio):
+        return valor
+    if limitadores is None:
+        return LimitadorEnvio(**valor)
+    chave = json.dumps(valor, sort_keys=True, default=str)
+    if chave not in limitadores:
+        limitadores[chave] = LimitadorEnvio(**valor)
+    return limitadores[chave]
+
+
+# Conversores dos parâmetros que não têm representação direta em JSON ("16:00" -> time(16, 0)).
+CONVERSORES = {
+    "horarioInicial": _converteHorario,
+    "diferencaTempoFinal": _converteDuracao,
+    "janelas": _converteJanelas,
+    "politica": _convertePolitica,
+    "limitador": _converteLimitador,
+}
+
+
+class FaixaTokens():
+    """
+    Sequência de tokens gerados a partir de um modelo, sem criar a lista inteira em memória.
+
+    Atributos
+    ---------
+        - modelo (str): O modelo do token, formatado com o índice (ex.: "termometro-{:06d}").
+        - inicio (int): O índice do primeiro token.
+        - quantidade (int): A quantidade de tokens.
+    """
+
+    def __init__(self, modelo: str, quantidade: int, inicio: int = 0) -> None:
+        self.modelo = modelo
+        self.quantidade = quantidade
+        self.inicio = inicio
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    def __getitem__(self, indice: int) -> str:
+        if indice < 0:
+            indice += self.quantidade
+        if not 0 <= indice < self.quantidade:
+            raise IndexError(indice)
+        return self.modelo.format(self.inicio + indice)
+
+
+def _classeDoTipo(tipo: str) -> type:
+    if tipo in TIPOS:
+        modulo, nome = f"Dispositivos.{tipo}", tipo
+    elif isinstance(tipo, str) and "." in tipo:
+        modulo, nome = tipo.rsplit(".", 1)
+    else:
+        raise ValueError(f"Tipo de dispositivo desconhecido: {tipo}")
+    try:
+        classe = getattr(importlib.import_module(modulo), nome)
+    except (ImportError, AttributeError):
+        raise ValueError(f"Tipo de dispositivo desconhecido: {tipo}") from None
+    if not (isinstance(classe, type) and issubclass(classe, Dispositivo)):
+        raise ValueError(f"{tipo} não é um Dispositivo")
+    return classe
+
+
+class GrupoDispositivos():
+    """
+    Um grupo de dispositivos do mesmo tipo, com os mesmos parâmetros e intervalo.
+
+    O tipo é o nome de um dos sensores do pacote (TIPOS) ou o caminho "modulo.Classe" de
+    qualquer subclasse de Dispositivo (ver Dispositivo.geraDados).
+
+    Os dispositivos não são criados no carregamento: fabrica(i) devolve uma função que cria
+    o i-ésimo dispositivo, chamada pelo Escalonador na primeira execução (ver adicionaPendente).
+
+    Atributos
+    ---------
+        - tipo (str): O nome da classe dos dispositivos (ex.: "Termometro" ou "meupacote.sensores.Sensor").
+        - classe (type): A classe dos dispositivos.
+        - tokens (list | FaixaTokens): Os tokens dos dispositivos.
+        - parametros (dict): Os parâmetros passados ao construtor de cada dispositivo.
+        - intervalo (float): O intervalo em segundos entre leituras (por padrão, o da classe).
+        - execucoes (int): A quantidade de leituras de cada dispositivo, ou None para executar indefinidamente.
+    """
+
+    def __init__(self, tipo: str, tokens, parametros: dict, intervalo: float = None, execucoes: int = None) -> None:
+        """
+        Inicializa o grupo, validando o tipo e os parâmetros.
+
+        Lança
+        -----
+            ValueError: Se o tipo não for conhecido ou algum parâmetro não for aceito pela classe.
+        """
+        self.tipo = tipo
+        self.classe = _classeDoTipo(tipo)
+        aceitos = set(inspect.signature(self.classe.__init__).parameters) | set(inspect.signature(Dispositivo.__init__).parameters)
+        desconhecidos = set(parametros) - aceitos
+        if desconhecidos:
+            raise ValueError(f"Parâmetros desconhecidos para {tipo}: {', '.join(sorted(desconhecidos))}")
+        self.tokens = tokens
+        self.parametros = {nome: CONVERSORES[nome](valor) if nome in CONVERSORES else valor
+                           for nome, valor in parametros.items()}
+        self.intervalo = self.classe.intervalo if intervalo is None else intervalo
+        self.execucoes = execucoes
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def fabrica(self, indice: int) -> Callable[[], Dispositivo]:
+        """
+        Retorna uma função sem argumentos que cria o dispositivo de um índice (serializável com pickle).
+        """
+        return functools.partial(self.classe, token=self.tokens[indice], **self.parametros)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self.fabrica(indice)()
+
+
+class ConfiguracaoFrota():
+    """
+    Frota de dispositivos descrita em um arquivo TOML, JSON ou YAML (ver carregaFrota).
+
+    Atributos
+    ---------
+        - grupos (list): Os grupos de dispositivos (GrupoDispositivos).
+    """
+
+    def __init__(self, grupos: list) -> None:
+        self.grupos = grupos
+
+    def __len__(self) -> int:
+        return sum(len(grupo) for grupo in self.grupos)
+
+    def agenda(self, escalonador, tarefas: dict = None) -> None:
+        """
+        Agenda todos os dispositivos da frota em um escalonador, sem criá-los.
+
+        Parâmetros
+        ----------
+            - escalonador (Escalonador | EscalonadorParalelo): O escalonador que executa a frota.
+            - tarefas (dict): Tarefas próprias de alguns tipos, indexadas pelo tipo; os demais tipos
+                usam a tarefa padrão (coletaDados, ver Dispositivo.coleta).
+                Padrão = None (todos usam a tarefa padrão).
+        """
+        for grupo in self.grupos:
+            tarefa = (tarefas or {}).get(grupo.tipo, coletaDados)
+            for indice in range(len(grupo)):
+                escalonador.adicionaPendente(grupo.fabrica(indice), tarefa, intervalo=grupo.intervalo, execucoes=grupo.execucoes)
+
+
+def _leYAML(arquivo) -> dict:
+    import yaml
+
+    # O YAML 1.1 lê 2:00 sem aspas como o número sexagesimal 120 (2 * 60), que viraria uma
+    # duração de 120 segundos ou um horário recusado. Esses números ficam como o texto escrito,
+    # e são lidos como "HH:MM[:SS]".
+    class CarregadorFrota(yaml.SafeLoader):
+        pass
+
+    def constroiNumero(constroi, carregador, no):
+        if ":" in no.value:
+            return carregador.construct_scalar(no)
+        return constroi(carregador, no)
+
+    CarregadorFrota.add_constructor("tag:yaml.org,2002:int",
+                                    functools.partial(constroiNumero, yaml.SafeLoader.construct_yaml_int))
+    CarregadorFrota.add_constructor("tag:yaml.org,2002:float",
+                                    functools.partial(constroiNumero, yaml.SafeLoader.construct_yaml_float))
+    return yaml.load(arquivo, Loader=CarregadorFrota)
+
+
+def _leArquivo(caminho: str) -> dict:
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".toml":
+        import tomllib
+        with open(caminho, "rb") as arquivo:
+            return tomllib.load(arquivo)
+    if extensao == ".json":
+        with open(caminho) as arquivo:
+            return json.load(arquivo)
+    if extensao in (".yaml", ".yml"):
+        with open(caminho) as arquivo:
+            return _leYAML(arquivo)
+    raise ValueError(f"Formato de configuração não suportado: {extensao}")
+
+
+def montaFrota(configuracao: dict) -> ConfiguracaoFrota:
+    """
+    Monta uma frota a partir de uma configuração já lida (ver carregaFrota para o formato).
+
+    Parâmetros
+    ----------
+        - configuracao (dict): As seções "padrao", "tipos" e "grupos".
+
+    Retorna
+    -------
+        ConfiguracaoFrota: A frota, com os dispositivos ainda não criados.
+
+    Lança
+    -----
+        ValueError: Se algum grupo for inválido.
+    """
+    padrao = dict(configuracao.get("padrao", {}))
+    intervaloPadrao = padrao.pop("intervalo", None)
+    execucoesPadrao = padrao.pop("execucoes", None)
+    tipos = configuracao.get("tipos", {})
+    limitadores = {}
+    grupos = []
+    for grupo in configuracao.get("grupos", []):
+        tipo = grupo.get("tipo")
+        if "tokens" not in grupo:
+            raise ValueError(f"Grupo de {tipo} sem tokens")
+        tokens = grupo["tokens"]
+        if isinstance(tokens, str):
+            if "quantidade" not in grupo:
+                raise ValueError(f"Grupo de {tipo} com modelo de token sem quantidade")
+            tokens = FaixaTokens(tokens, grupo["quantidade"], grupo.get("inicio", 0))
+        parametros = {**padrao, **tipos.get(tipo, {}),
+                      **{nome: valor for nome, valor in grupo.items() if nome not in _CHAVES_GRUPO}}
+        if "limitador" in parametros:
+            parametros["limitador"] = _converteLimitador(parametros["limitador"], limitadores)
+        grupos.append(GrupoDispositivos(tipo, tokens, parametros,
+                                        intervalo=grupo.get("intervalo", intervaloPadrao),
+                                        execucoes=grupo.get("execucoes", execucoesPadrao)))
+    return ConfiguracaoFrota(grupos)
+
+
+def carregaFrota(caminho: str) -> ConfiguracaoFrota:
+    """
+    Carrega uma frota de um arquivo TOML, JSON ou YAML (YAML requer PyYAML).
+
+    Formato (em TOML):
+
+        [padrao]                      # valem para todos os grupos
+        intervalo = 10                # segundos entre leituras (omitido = o intervalo do tipo)
+        execucoes = 100               # omitido = executa indefinidamente
+        tamanhoLote = 1               # demais chaves = parâmetros de Dispositivo
+        semente = 42                  # reproduz os números aleatórios de toda a frota
+        politica = { compressao = "gzip", adaptativo = true }   # ver PoliticaEnvio
+        limitador = { taxaPorToken = 1, taxaGlobal = 100 }      # ver LimitadorEnvio (um só para a frota)
+
+        [tipos.SensorMovimento]       # parâmetros de todos os grupos de um tipo
+        chanceMovimento = 30
+        janelas = [["06:00", "08:00"], ["22:00", "02:00"]]   # pares [início, fim]
+
+        [[grupos]]
+        tipo = "Termometro"
+        tokens = ["e5c937f2-..."]     # lista de tokens, ou
+        # tokens = "termometro-{:06d}" + quantidade = 100000 (+ inicio = 0)
+        escala = "F"                  # parâmetros deste grupo
+
+        [[grupos]]
+        tipo = "meupacote.sensores.SensorCO2"   # qualquer subclasse de Dispositivo
+        tokens = ["..."]
+
+    Horários e durações (horarioInicial, diferencaTempoFinal, janelas) aceitam texto "HH:MM[:SS]";
+    durações também aceitam um número de segundos. Uma janela cujo fim é anterior ao início
+    termina no dia seguinte. Em YAML, 2:00 sem aspas também é lido como "HH:MM" (duas horas), e
+    não como o número sexagesimal 120 do YAML 1.1.
+
+    Parâmetros
+    ----------
+        - caminho (str): O caminho do arquivo; o formato vem da extensão.
+
+    Retorna
+    -------
+        ConfiguracaoFrota: A frota, com os dispositivos ainda não criados.
+
+    Lança
+    -----
+        ValueError: Se o formato não for suportado, algum grupo for inválido ou algum horário ou
+            duração não for texto "HH:MM[:SS]" (durações também podem ser um número de segundos).
+    """
+    return montaFrota(_leArquivo(caminho))
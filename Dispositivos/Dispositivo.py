@@ -1,29 +1,211 @@
-from tagoio_sdk import Device
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from Dispositivos import Relogio
+from Dispositivos.Transporte import URL_TAGOIO, LimiteRequisicoes, criaTransporte
+from Dispositivos.Aleatorio import FluxoAleatorio
+from Dispositivos.FilaReenvio import FilaReenvio
+from Dispositivos.Metricas import registro
+from Dispositivos.PoliticaEnvio import PoliticaEnvio
+from Dispositivos.LimitadorEnvio import LimitadorEnvio
 
-class Dispositivo():
+
+def coletaDados(dispositivo: "Dispositivo"):
+    """
+    A tarefa padrão do Escalonador para qualquer dispositivo: uma leitura (ver Dispositivo.coleta).
+
+    Parâmetros
+    ----------
+        - dispositivo (Dispositivo): O dispositivo lido.
+
+    Retorna
+    -------
+        Os dados a enviar, ou None se não houver o que enviar.
+    """
+    return dispositivo.coleta()
+
+
+class Outlier(Exception):
+    """
+    A leitura gerada é um outlier e foi descartada (ver Dispositivo.geraDados).
+    """
+
+
+class Dispositivo(ABC):
     """
-    Classe que representa um dispositivo para envio de dados usando a biblioteca tagoio_sdk.
+    Classe que representa um dispositivo para envio de dados ao TagoIO.
+
+    As subclasses só descrevem a leitura: geraDados() retorna os dados no formato enviado
+    (uma Leitura, um dicionário ou uma lista deles), None quando não há o que enviar (ex.: o
+    SensorMovimento fora das janelas) ou lança Outlier quando a leitura é um outlier. O
+    atributo de classe intervalo é o intervalo padrão entre leituras do tipo. O agendamento,
+    o envio, as métricas e o tratamento de erros são os mesmos para todos os tipos (ver coleta,
+    coletaDados e Escalonador), então um novo tipo de dispositivo não precisa de loop próprio.
+
+    Os dados podem ser enviados um a um (padrão) ou em lotes: nesse modo as leituras
+    se acumulam na fila e são enviadas em uma única requisição quando a fila atinge
+    tamanhoLote itens, quando o item mais antigo passa de idadeMaximaLote milissegundos
+    ou quando descarrega()/encerra() são chamados.
+
+    Lotes cujo envio falhou vão para uma fila de reenvio limitada (ver FilaReenvio), gravada
+    em um log em disco se diretorioReenvio for informado, e são reenviados em lotes, com
+    espera exponencial, assim que os envios voltam a funcionar.
+
+    Uma PoliticaEnvio pode comprimir o corpo das requisições e ajustar tamanhoLote (e o lote
+    do reenvio) à vazão, aos timeouts e aos erros medidos nos envios.
+
+    Envios recusados por excesso de requisições (HTTP 429) não são falhas: o lote volta para a
+    fila e nada é enviado até o fim do Retry-After. Um LimitadorEnvio, compartilhado entre os
+    dispositivos, segura os envios acima da taxa permitida antes que a API os recuse. Enquanto
+    os envios estão retidos, as novas leituras se juntam na fila e saem na mesma requisição.
+
+    Os números aleatórios das simulações vêm do fluxo próprio do dispositivo (ver
+    Dispositivos.Aleatorio), derivado da semente da frota e do token: com a mesma semente,
+    a execução de uma frota pode ser reproduzida.
 
     Atributos
     ---------
+        - intervalo (float): O intervalo padrão, em segundos, entre leituras do tipo.
         - token (str): O token de autenticação do dispositivo.
+        - aleatorio (FluxoAleatorio): O fluxo de números aleatórios do dispositivo.
         - fila (list): Uma lista para armazenar os dados a serem enviados.
+        - url (str): A URL base da API do TagoIO.
+        - transporte (str): O nome do transporte dos envios (ver Dispositivos.Transporte).
+        - conexao: O transporte usado nos envios (por padrão, uma ConexaoTagoIO persistente).
+            Criado no primeiro envio e reaproveitado nos seguintes.
+        - tamanhoLote (int): Quantidade de itens na fila que dispara o envio.
+        - idadeMaximaLote (float): Idade máxima, em milissegundos, do item mais antigo da fila
+            antes do envio, no relógio da simulação (ver Dispositivos.Relogio). None desativa o limite de idade.
+        - reenvio (FilaReenvio): A fila dos dados cujo envio falhou.
+        - politica (PoliticaEnvio): A política de compressão e de tamanho de lote, ou None.
+        - limitador (LimitadorEnvio): O limitador da taxa de envios, ou None.
+        - lotesReenvioPorEnvio (int): A quantidade máxima de lotes reenviados a cada envio bem-sucedido.
+        - esperaMaximaEncerramento (float): Os segundos que encerra() espera o fim de uma retenção
+            antes de passar a fila para o reenvio.
+        - metricas (RegistroMetricas): O registro onde são contados os envios, suas latências
+            e a profundidade da fila (por padrão, o registro global de Dispositivos.Metricas).
+
+    Os métodos de envio podem ser chamados de várias threads (ver ExecutorEnvio):
+    a fila, o reenvio e a conexão são protegidos por uma trava do dispositivo.
     """
 
-    def __init__(self, token: str) -> None:
+    intervalo = 30
+    lotesReenvioPorEnvio = 10
+    esperaMaximaEncerramento = 5.0
+    metricas = registro
+
+    def __init__(self, token: str, url: str = URL_TAGOIO, tamanhoLote: int = 1, idadeMaximaLote: float = None,
+                 capacidadeReenvio: int = 10000, diretorioReenvio: str = None, transporte: str = "http",
+                 politica: PoliticaEnvio = None, limitador: LimitadorEnvio = None, semente=None) -> None:
         """
         Inicializa uma instância da classe Dispositivo.
 
         Parâmetros
         ----------
             - token (str): O token de autenticação do dispositivo.
+            - url (str): A URL base da API do TagoIO.
+                Padrão = "https://api.tago.io".
+            - tamanhoLote (int): Quantidade de itens na fila que dispara o envio.
+                Padrão = 1 (envia cada leitura imediatamente).
+            - idadeMaximaLote (float): Idade máxima, em milissegundos, do item mais antigo da fila.
+                Padrão = None (sem limite de idade).
+            - capacidadeReenvio (int): A quantidade máxima de itens da fila de reenvio mantidos em memória.
+                Padrão = 10000.
+            - diretorioReenvio (str): O diretório do log em disco da fila de reenvio (sobrevive a quedas do processo).
+                Cada dispositivo usa um subdiretório com o seu token.
+                Padrão = None (sem disco; descarta os itens mais antigos quando a memória enche).
+            - transporte (str): O transporte dos envios: "http" (conexão persistente), "sdk" (tagoio_sdk),
+                "nulo" (descarta os dados) ou um registrado com registraTransporte.
+                Só é importado e criado no primeiro envio.
+                Padrão = "http".
+            - politica (PoliticaEnvio): A política de compressão e de tamanho de lote. O dispositivo
+                usa uma cópia, com o próprio estado adaptativo; a compressão requer o transporte "http".
+                Padrão = None (sem compressão, lote fixo).
+            - limitador (LimitadorEnvio): O limitador da taxa de envios, compartilhado (não copiado)
+                para que o limite global valha para todos os dispositivos que o recebem.
+                Padrão = None (só respeita o Retry-After das respostas HTTP 429).
+            - semente (int | str): A semente da frota; o fluxo aleatório do dispositivo é derivado
+                dela e do token.
+                Padrão = None (fluxo não reproduzível).
         """
         self.token = token
+        self.aleatorio = FluxoAleatorio.doDispositivo(token, semente)
         self.fila = []
+        self.url = url
+        self.transporte = transporte
+        self.conexao = None
+        self.tamanhoLote = tamanhoLote
+        self.idadeMaximaLote = idadeMaximaLote
+        self._inicioLote = None
+        diretorio = os.path.join(diretorioReenvio, token) if diretorioReenvio is not None else None
+        self.reenvio = FilaReenvio(capacidade=capacidadeReenvio, diretorio=diretorio)
+        self.politica = politica.copia() if politica is not None else None
+        if self.politica is not None:
+            self._aplicaPolitica()
+        self.limitador = limitador
+        self._liberadoEm = 0.0
+        self._reservado = False
+        self._profundidadeRegistrada = 0
+        self._travaEnvio = threading.RLock()
+        self._adiados = deque()
+
+    def __getstate__(self) -> dict:
+        # A conexão e a trava não passam entre processos (ver EscalonadorParalelo);
+        # a conexão é reaberta no primeiro envio após a cópia.
+        estado = self.__dict__.copy()
+        estado["conexao"] = None
+        del estado["_travaEnvio"]
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        self.__dict__.update(estado)
+        self._travaEnvio = threading.RLock()
+
+    @abstractmethod
+    def geraDados(self):
+        """
+        Gera uma leitura simulada do dispositivo (implementado pelas subclasses).
+
+        Retorna
+        -------
+            Leitura | dict | list: Os dados no formato enviado ao TagoIO, ou None se não houver o que enviar.
+
+        Lança
+        -----
+            Outlier: Se a leitura for um outlier.
+        """
+
+    def coleta(self):
+        """
+        Faz uma leitura com geraDados() e a conta nas métricas do tipo ("leituras", "outliers" ou "erros").
+
+        Retorna
+        -------
+            Os dados a enviar, ou None se a leitura foi um outlier ou não há o que enviar.
+
+        Lança
+        -----
+            Exception: Os erros de geraDados que não são Outlier (ex.: um parâmetro inválido),
+                depois de contados em "erros"; o Escalonador os reporta ao handler de exceções do loop.
+        """
+        try:
+            dados = self.geraDados()
+        except Outlier:
+            self.metricas.incrementa("outliers", type(self).__name__)
+            return None
+        except Exception:
+            self.metricas.incrementa("erros", type(self).__name__)
+            raise
+        if dados is not None:
+            self.metricas.incrementa("leituras", type(self).__name__)
+        return dados
 
     def enviaDados(self, dados: dict):
         """
-        Adiciona dados à fila e os envia para o token TagoIO definido.
+        Adiciona dados à fila e os envia para o token TagoIO definido
+        quando o lote está completo ou vencido.
 
         Parâmetros
         ----------
@@ -32,14 +214,244 @@ class Dispositivo():
         Retorna
         -------
             dict: O resultado do envio dos dados.
-            str: Um texto do erro gerado pelo envio 
-                (os dados continuam armazenados na fila)
+            str: Um texto do erro gerado pelo envio
+                (os dados vão para a fila de reenvio)
+            None: Se os dados apenas foram adicionados ao lote (ou os envios estão retidos).
         """
-        dispositivo = Device({"token": self.token})
-        self.fila.append(dados)
+        with self._travaEnvio:
+            if not self.fila:
+                self._inicioLote = Relogio.atual.monotonico()
+            self.fila.append(dados)
+            if len(self.fila) < self.tamanhoLote and not self.loteVencido():
+                self._registraProfundidade()
+                return None
+            return self.descarrega()
+
+    def adiaDados(self, dados: dict) -> None:
+        """
+        Coloca dados direto na fila de reenvio, sem tentar enviá-los agora.
+
+        Usado quando os envios não acompanham a geração (ver ExecutorEnvio); os dados
+        saem junto com os próximos envios ou em descarregaSeVencido. Não espera a trava
+        do dispositivo, que pode estar presa em um envio lento.
+
+        Parâmetros
+        ----------
+            - dados (dict): Um dicionário contendo os dados a serem enviados.
+        """
+        self._adiados.append(dados)
+
+    def _registraProfundidade(self) -> None:
+        profundidade = len(self.fila) + len(self.reenvio) + len(self._adiados)
+        if profundidade != self._profundidadeRegistrada:
+            self.metricas.ajusta("fila_profundidade", type(self).__name__, profundidade - self._profundidadeRegistrada)
+            self._profundidadeRegistrada = profundidade
+
+    def _aplicaPolitica(self) -> None:
+        self.tamanhoLote = self.politica.tamanhoLote(self.tamanhoLote)
+        if self.politica.adaptativo:
+            self.reenvio.tamanhoLote = self.tamanhoLote
+
+    def _envia(self, lote: list):
+        tipo = type(self).__name__
+        inicio = time.perf_counter()
         try:
-            resultado = dispositivo.sendData(self.fila)
+            resultado = self.conexao.sendData(lote)
+        except LimiteRequisicoes:
+            # Não é falha do envio: não conta para a taxa de erros nem diminui o lote.
+            self.metricas.incrementa("envios_limitados", tipo)
+            raise
+        except Exception as e:
+            self.metricas.incrementa("envios_falha", tipo)
+            if self.politica is not None:
+                self.politica.registraFalha(e)
+                self._aplicaPolitica()
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.metricas.registraLatencia("latencia_envio", tipo, duracao)
+        self.metricas.incrementa("envios_sucesso", tipo)
+        if self.politica is not None:
+            self.politica.registraEnvio(len(lote), duracao)
+            self._aplicaPolitica()
+        return resultado
+
+    def _retido(self) -> bool:
+        # Reserva no limitador a vez da próxima requisição; se ela não for agora, retém os envios
+        # até a vez reservada, quando a requisição sai sem nova reserva.
+        if self.limitador is None:
+            return False
+        if self._reservado:
+            self._reservado = False
+            return False
+        espera = self.limitador.reserva(self.token)
+        if espera <= 0:
+            return False
+        self._liberadoEm = time.monotonic() + espera
+        self._reservado = True
+        self.metricas.incrementa("envios_retidos", type(self).__name__)
+        return True
+
+    def _limita(self, erro: LimiteRequisicoes) -> None:
+        self._liberadoEm = time.monotonic() + erro.espera
+        if self.limitador is not None:
+            self.limitador.penaliza(self.token, erro.espera)
+
+    def loteVencido(self) -> bool:
+        """
+        Verifica se o item mais antigo da fila passou da idade máxima do lote.
+
+        Retorna
+        -------
+            bool: True se a fila tem itens e o mais antigo passou de idadeMaximaLote, False caso contrário.
+        """
+        if self.idadeMaximaLote is None or not self.fila:
+            return False
+        return (Relogio.atual.monotonico() - self._inicioLote) * 1000 >= self.idadeMaximaLote
+
+    def envioPendente(self) -> bool:
+        """
+        Verifica se há algo a enviar fora dos envios normais: lote vencido, lote retido
+        já liberado, dados adiados ou reenvio pendente fora da espera.
+
+        Retorna
+        -------
+            bool: True se descarregaSeVencido() enviaria algo, False caso contrário.
+        """
+        if time.monotonic() < self._liberadoEm:
+            return False
+        return (self.loteVencido() or len(self.fila) >= self.tamanhoLote
+                or ((len(self.reenvio) or len(self._adiados)) and self.reenvio.podeTentar()))
+
+    def descarregaSeVencido(self):
+        """
+        Envia a fila se o lote estiver vencido ou se houver reenvio pendente fora da espera.
+
+        Retorna
+        -------
+            O mesmo que descarrega(), ou None se não houver nada a enviar.
+        """
+        with self._travaEnvio:
+            if self.envioPendente():
+                return self.descarrega()
+            return None
+
+    def descarrega(self):
+        """
+        Envia imediatamente todos os itens da fila em uma única requisição e,
+        se o envio funcionar, reenvia em lotes os dados pendentes da fila de reenvio.
+
+        Durante a espera após uma falha, os itens vão direto para a fila de reenvio
+        sem nova tentativa. Durante uma retenção (limitador ou HTTP 429), os itens
+        continuam na fila e saem no primeiro envio depois da liberação.
+
+        Retorna
+        -------
+            dict: O resultado do envio dos dados.
+            str: Um texto do erro gerado pelo envio
+                (os dados vão para a fila de reenvio)
+            None: Se não houver nada a enviar ou os envios estiverem retidos.
+        """
+        with self._travaEnvio:
+            try:
+                return self._descarrega()
+            finally:
+                self._registraProfundidade()
+
+    def _descarrega(self):
+        if self._adiados:
+            adiados = []
+            while self._adiados:
+                adiados.append(self._adiados.popleft())
+            self.reenvio.adiciona(adiados)
+        if not self.reenvio.podeTentar():
+            self.reenvio.adiciona(self.fila)
             self.fila = []
+            return None
+        if time.monotonic() < self._liberadoEm:
+            return None
+        if self.conexao is None:
+            opcoes = {"politica": self.politica} if self.politica is not None and self.politica.compressao else {}
+            self.conexao = criaTransporte(self.transporte, token=self.token, url=self.url, **opcoes)
+        resultado = None
+        if self.fila:
+            if self._retido():
+                return None
+            lote, self.fila = self.fila, []
+            try:
+                resultado = self._envia(lote)
+            except LimiteRequisicoes as e:
+                self.fila = lote
+                self._limita(e)
+                return None
+            except Exception as e:
+                self.reenvio.adiciona(lote)
+                self.reenvio.registraFalha()
+                return e
+        return self._reenviaPendentes(resultado)
+
+    def _reenviaPendentes(self, resultado):
+        for _ in range(self.lotesReenvioPorEnvio):
+            lote = self.reenvio.proximoLote()
+            if not lote or self._retido():
+                break
+            try:
+                resultado = self._envia(lote)
+            except LimiteRequisicoes as e:
+                # O lote continua no reenvio, sem a espera exponencial das falhas.
+                self._limita(e)
+                break
+            except Exception as e:
+                self.reenvio.registraFalha()
+                return e
+            self.reenvio.confirma(len(lote))
+        self.reenvio.registraSucesso()
+        return resultado
+
+    def geraLote(self, n: int, intervalo: float = 30, inicio=None, semente=None):
+        """
+        Gera n leituras consecutivas do dispositivo de forma vetorizada (requer NumPy).
+
+        Ver Dispositivos.Lote.geraLote.
+
+        Parâmetros
+        ----------
+            - n (int): A quantidade de leituras.
+            - intervalo (float): O intervalo em segundos entre leituras.
+                Padrão = 30.
+            - inicio (int): O instante de referência, em ns desde a época; a primeira leitura ocorre um intervalo depois.
+                Padrão = None (timestamp da última medição do dispositivo).
+            - semente (int | numpy.random.Generator): A semente dos números aleatórios.
+                Padrão = None (tirada do fluxo aleatório do dispositivo).
+
+        Retorna
+        -------
+            Lote: Os valores, a indicação de leituras aceitas e os timestamps.
+        """
+        from Dispositivos.Lote import geraLote
+        return geraLote(self, n, intervalo=intervalo, inicio=inicio, semente=semente)
+
+    def encerra(self):
+        """
+        Envia o que restar na fila e fecha a conexão com o TagoIO.
+
+        Se os envios estiverem retidos, espera a liberação (até esperaMaximaEncerramento
+        segundos); o que não puder sair passa para a fila de reenvio, que fica no log em disco
+        se o dispositivo tiver diretorioReenvio.
+
+        Retorna
+        -------
+            O mesmo que descarrega().
+        """
+        with self._travaEnvio:
+            espera = self._liberadoEm - time.monotonic()
+            if 0 < espera <= self.esperaMaximaEncerramento and (self.fila or len(self.reenvio)):
+                time.sleep(espera)
+            resultado = self.descarrega()
+            if self.fila:
+                self.reenvio.adiciona(self.fila)
+                self.fila = []
+            self.reenvio.salva()
+            if self.conexao is not None:
+                self.conexao.fecha()
             return resultado
-        except Exception as e:
-            return e
\ No newline at end of file
@@ -0,0 +1,550 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import math
+import time
+from typing import Callable
+from Dispositivos import Relogio
+from Dispositivos.Dispositivo import Dispositivo, coletaDados
+from Dispositivos.ExecutorEnvio import ExecutorEnvio
+from Dispositivos.Metricas import registro
+
+PULAR = "pular"
+AGRUPAR = "agrupar"
+RECUPERAR = "recuperar"
+POLITICAS_ATRASO = (PULAR, AGRUPAR, RECUPERAR)
+
+_RAZAO_AUREA = (math.sqrt(5) - 1) / 2
+
+# Execuções seguidas no tempo virtual antes de devolver o controle ao loop asyncio.
+PASSO_VIRTUAL = 1000
+
+
+def faseInicial(indice: int, intervalo: float) -> float:
+    """
+    Calcula o atraso da primeira execução do indice-ésimo dispositivo com um dado intervalo.
+
+    As fases seguem a sequência da razão áurea, que preenche o intervalo de forma uniforme
+    qualquer que seja a quantidade de dispositivos. O primeiro dispositivo executa um intervalo depois.
+
+    Parâmetros
+    ----------
+        - indice (int): A posição do dispositivo entre os que têm o mesmo intervalo.
+        - intervalo (float): O intervalo em segundos entre execuções.
+
+    Retorna
+    -------
+        float: O atraso em segundos, entre 0 e intervalo.
+    """
+    return intervalo * (1 - (indice * _RAZAO_AUREA) % 1)
+
+
+def intervaloDaFabrica(fabrica: Callable[[], Dispositivo]) -> float:
+    """
+    Descobre, sem criar o dispositivo, o intervalo da classe que uma fábrica cria.
+
+    Parâmetros
+    ----------
+        - fabrica (Callable): A classe do dispositivo ou um functools.partial dela (como em
+            ConfiguracaoFrota), possivelmente com o parâmetro intervalo.
+
+    Retorna
+    -------
+        float: O intervalo, ou None se não puder ser descoberto antes da criação.
+    """
+    if isinstance(fabrica, functools.partial):
+        if "intervalo" in fabrica.keywords:
+            return fabrica.keywords["intervalo"]
+        fabrica = fabrica.func
+    if isinstance(fabrica, type) and issubclass(fabrica, Dispositivo):
+        return fabrica.intervalo
+    return None
+
+
+def fundeEntrada(abertas: dict, entrada: list, fusao: int) -> list:
+    """
+    Junta a entrada de um dispositivo a uma entrada fundida com o mesmo intervalo, tarefa e execuções.
+
+    Uma entrada fundida tem a lista dos dispositivos (None nos ainda não criados) no lugar do
+    dispositivo e a lista das fábricas (None nos já criados), ou None se todos já existem.
+
+    Parâmetros
+    ----------
+        - abertas (dict): As entradas fundidas que ainda aceitam dispositivos, por (intervalo, tarefa, execucoes).
+        - entrada (list): A entrada [dispositivo, tarefa, intervalo, execucoes, fabrica] de um dispositivo.
+        - fusao (int): A quantidade máxima de dispositivos de uma entrada fundida.
+
+    Retorna
+    -------
+        list: Uma nova entrada fundida, a ser agendada, ou None se o dispositivo entrou em uma já agendada.
+    """
+    dispositivo, tarefa, intervalo, execucoes, fabrica = entrada
+    chave = (intervalo, tarefa, execucoes)
+    fundida = abertas.get(chave)
+    nova = None
+    if fundida is None or len(fundida[0]) >= fusao:
+        fundida = nova = abertas[chave] = [[], tarefa, intervalo, execucoes, None]
+    if fabrica is not None and fundida[4] is None:
+        fundida[4] = [None] * len(fundida[0])
+    fundida[0].append(dispositivo)
+    if fundida[4] is not None:
+        fundida[4].append(fabrica)
+    return nova
+
+
+def _membros(entrada: list):
+    # Os dispositivos de uma entrada, fundida ou não (None nos ainda não criados).
+    return entrada[0] if type(entrada[0]) is list else (entrada[0],)
+
+
+def _criados(entrada: list) -> list:
+    return [dispositivo for dispositivo in _membros(entrada) if dispositivo is not None]
+
+
+class Escalonador():
+    """
+    Executa tarefas periódicas de vários dispositivos em um único loop asyncio.
+
+    Em vez de um processo por dispositivo, mantém um heap de temporizadores ordenado
+    pelo próximo horário de execução de cada dispositivo. O loop dorme até o primeiro
+    horário do heap, dispara as tarefas vencidas e as reagenda, de modo que milhares de
+    dispositivos cabem em um único processo sem threads ou processos dedicados.
+
+    Os horários são prazos absolutos no relógio monotônico (prazo anterior + intervalo),
+    então o período real não acumula o tempo de geração e envio. Quando uma execução
+    termina depois de um ou mais prazos seguintes, a política de atraso decide o que fazer:
+
+        - "pular": descarta os prazos perdidos e segue no próximo prazo futuro;
+        - "agrupar": executa uma única vez imediatamente no lugar dos prazos perdidos;
+        - "recuperar": executa todos os prazos perdidos, um após o outro.
+
+    Dispositivos com o mesmo intervalo podem ter as fases espalhadas ao longo do intervalo
+    (sequência da razão áurea), para que os envios não disparem todos no mesmo milissegundo.
+    Ou, no outro extremo, ser fundidos (parâmetro fusao): até fusao dispositivos com o mesmo
+    intervalo, tarefa e execuções compartilham uma entrada do heap e são executados juntos, em
+    sequência, no mesmo prazo, com um único temporizador e uma única passagem pelo loop.
+    O erro de um dispositivo não interrompe os demais da entrada.
+
+    Os dados retornados pela tarefa são enviados pelo dispositivo. Sem executor, a tarefa e o
+    envio rodam juntos em uma thread do executor padrão do asyncio; com um ExecutorEnvio, a tarefa
+    roda no próprio loop, uma de cada vez, e os dados vão para a fila do executor, de modo que a
+    latência do TagoIO não altera a cadência das leituras. O loop nunca espera o executor: com a
+    política "bloquear" e a fila cheia, só o dispositivo que ainda tem leituras aguardando envio
+    pula a execução (métrica execucoes_adiadas).
+
+    Os prazos seguem o relógio do processo (ver Dispositivos.Relogio). Com um RelogioVirtual,
+    o loop não dorme: avança o relógio até o próximo prazo e, sem executor, executa a tarefa e o
+    envio no próprio loop, na ordem dos prazos. A simulação roda tão rápido quanto a CPU
+    permite e, com a mesma semente, se repete exatamente (só sem executor: com ele, o ritmo
+    dos envios, que seguem o tempo real, altera as leituras transbordadas ou puladas).
+
+    Atributos
+    ---------
+        - heap (list): Entradas (prazo, sequencia, [dispositivo, tarefa, intervalo, execucoes, fabrica])
+            ordenadas pelo prazo (ver fundeEntrada para as entradas fundidas).
+        - emExecucao (set): Tarefas asyncio das execuções em andamento.
+        - dispositivos (dict): Os dispositivos agendados, indexados por id, descarregados no encerramento.
+        - politicaAtraso (str): "pular", "agrupar" ou "recuperar".
+        - espalhaFases (bool): Se as fases de dispositivos com o mesmo intervalo são espalhadas.
+        - executor (ExecutorEnvio): O executor dos envios, ou None para enviar junto com a tarefa.
+        - fusao (int): A quantidade máxima de dispositivos executados em um único prazo.
+        - totalExecucoes (int): A quantidade de execuções realizadas (uma por dispositivo).
+        - tempoOcupado (float): O tempo em segundos gasto pelo loop executando tarefas
+            (só as executadas no próprio loop, com executor ou no tempo virtual).
+        - maiorAtraso (float): O maior atraso, em segundos, do início de uma execução em relação
+            ao seu prazo desde a última chamada de estatisticas().
+    """
+
+    def __init__(self, politicaAtraso: str = AGRUPAR, espalhaFases: bool = True, executor: ExecutorEnvio = None,
+                 fusao: int = 1) -> None:
+        """
+        Inicializa um escalonador vazio.
+
+        Parâmetros
+        ----------
+            - politicaAtraso (str): O que fazer com prazos perdidos: "pular", "agrupar" ou "recuperar".
+                Padrão = "agrupar".
+            - espalhaFases (bool): Se as fases de dispositivos com o mesmo intervalo são espalhadas.
+                Padrão = True.
+            - executor (ExecutorEnvio): O executor dos envios, já iniciado. É encerrado junto com o escalonador.
+                Padrão = None (cada execução envia os próprios dados).
+            - fusao (int): A quantidade máxima de dispositivos com o mesmo intervalo, tarefa e execuções
+                executados em um único prazo. Só valem os dispositivos agendados antes de executa().
+                Padrão = 1 (um prazo por dispositivo).
+
+        Lança
+        -----
+            ValueError: Se a política de atraso não for conhecida ou fusao for menor que 1.
+        """
+        if politicaAtraso not in POLITICAS_ATRASO:
+            raise ValueError(f"Política de atraso desconhecida: {politicaAtraso}")
+        if fusao < 1:
+            raise ValueError(f"Fusão inválida: {fusao}")
+        self.politicaAtraso = politicaAtraso
+        self.espalhaFases = espalhaFases
+        self.executor = executor
+        self.fusao = fusao
+        self.heap = []
+        self.emExecucao = set()
+        self.dispositivos = {}
+        self.totalExecucoes = 0
+        self.tempoOcupado = 0.0
+        self.maiorAtraso = 0.0
+        self._sequencia = itertools.count()
+        self._fases = {}
+        self._fundidas = {}
+        self._acorda = asyncio.Event()
+        self._parar = False
+
+    def adiciona(self, dispositivo: Dispositivo, tarefa: Callable[[Dispositivo], dict] = coletaDados, intervalo: float = None,
+                 execucoes: int = None) -> None:
+        """
+        Agenda a execução periódica de uma tarefa para um dispositivo.
+
+        A primeira execução ocorre até um intervalo depois (exatamente um intervalo depois,
+        como nos antigos loops de main.py, se as fases não forem espalhadas).
+
+        Parâmetros
+        ----------
+            - dispositivo (Dispositivo): O dispositivo passado para a tarefa.
+            - tarefa (Callable): Função que faz uma leitura do dispositivo e retorna os dados
+                a serem enviados (ou None se não houver o que enviar).
+                Padrão = coletaDados (ver Dispositivo.coleta).
+            - intervalo (float): O intervalo em segundos entre execuções.
+                Padrão = None (o intervalo da classe do dispositivo).
+            - execucoes (int): A quantidade de execuções. None executa indefinidamente.
+                Padrão = None.
+        """
+        self.dispositivos[id(dispositivo)] = dispositivo
+        self._adicionaEntrada([dispositivo, tarefa, dispositivo.intervalo if intervalo is None else intervalo, execucoes, None])
+
+    def adicionaPendente(self, fabrica: Callable[[], Dispositivo], tarefa: Callable[[Dispositivo], dict] = coletaDados,
+                         intervalo: float = None, execucoes: int = None) -> None:
+        """
+        Agenda um dispositivo que só é criado na sua primeira execução.
+
+        Permite agendar frotas muito grandes sem o custo de criar todos os dispositivos
+        no início (ver ConfiguracaoFrota).
+
+        Parâmetros
+        ----------
+            - fabrica (Callable): Função sem argumentos que cria o dispositivo.
+            - tarefa (Callable): Como em adiciona().
+                Padrão = coletaDados.
+            - intervalo (float): O intervalo em segundos entre execuções.
+                Padrão = None (o intervalo da classe que a fábrica cria, ver intervaloDaFabrica; se
+                não puder ser descoberto antes, o do dispositivo criado, com a primeira execução
+                agendada pelo intervalo padrão de Dispositivo).
+            - execucoes (int): A quantidade de execuções. None executa indefinidamente.
+                Padrão = None.
+        """
+        if intervalo is None:
+            intervalo = intervaloDaFabrica(fabrica)
+        self._adicionaEntrada([None, tarefa, intervalo, execucoes, fabrica])
+
+    def _adicionaEntrada(self, entrada: list) -> None:
+        # Intervalo None: só é conhecido quando o dispositivo for criado (ver _dispositivo).
+        if self.fusao > 1 and self._fundidas is not None and entrada[2] is not None:
+            entrada = fundeEntrada(self._fundidas, entrada, self.fusao)
+            if entrada is None:
+                return
+        intervalo = Dispositivo.intervalo if entrada[2] is None else entrada[2]
+        fase = intervalo
+        if self.espalhaFases:
+            indice = self._fases.get(intervalo, 0)
+            self._fases[intervalo] = indice + 1
+            fase = faseInicial(indice, intervalo)
+        self._agenda(Relogio.atual.monotonico() + fase, entrada)
+
+    def _dispositivo(self, entrada: list) -> Dispositivo:
+        # Cria o dispositivo de uma entrada pendente na primeira execução.
+        if entrada[0] is None:
+            entrada[0] = entrada[4]()
+            entrada[4] = None
+            self.dispositivos[id(entrada[0])] = entrada[0]
+            if entrada[2] is None:
+                entrada[2] = entrada[0].intervalo
+        return entrada[0]
+
+    def _fundidos(self, entrada: list) -> list:
+        # Os dispositivos de uma entrada fundida, criando os pendentes na primeira execução.
+        dispositivos, fabricas = entrada[0], entrada[4]
+        if fabricas is not None:
+            for indice, fabrica in enumerate(fabricas):
+                if fabrica is not None:
+                    dispositivo = dispositivos[indice] = fabrica()
+                    self.dispositivos[id(dispositivo)] = dispositivo
+            entrada[4] = None
+        return dispositivos
+
+    def _agenda(self, prazo: float, entrada: list) -> None:
+        heapq.heappush(self.heap, (prazo, next(self._sequencia), entrada))
+        self._acorda.set()
+
+    def recebe(self, entradas: list) -> None:
+        """
+        Agenda entradas retiradas de outro escalonador (ver retira), mantendo seus prazos.
+
+        Parâmetros
+        ----------
+            - entradas (list): Pares (prazo, [dispositivo, tarefa, intervalo, execucoes, fabrica]),
+                com prazos no relógio monotônico; dispositivo é None enquanto não for criado.
+        """
+        for prazo, entrada in entradas:
+            for dispositivo in _criados(entrada):
+                self.dispositivos[id(dispositivo)] = dispositivo
+            self._agenda(prazo, entrada)
+
+    def retira(self, quantidade: int) -> list:
+        """
+        Remove até quantidade dispositivos do escalonador, para que sejam executados em outro.
+
+        Dispositivos com execução em andamento, ou com leituras aguardando envio no executor,
+        não são retirados (o loop não espera os envios). Os de uma entrada fundida são
+        retirados juntos (podem passar um pouco de quantidade). Os envios pendentes do executor
+        terminam antes, e a conexão de cada dispositivo retirado é fechada.
+
+        Parâmetros
+        ----------
+            - quantidade (int): A quantidade máxima de dispositivos retirados.
+
+        Retorna
+        -------
+            list: Pares (prazo, entrada) no formato aceito por recebe().
+        """
+        retirados = []
+        ocupados = []
+        total = 0
+        while self.heap and total < quantidade:
+            # Remover o último elemento mantém a propriedade do heap.
+            item = self.heap.pop()
+            prazo, _, entrada = item
+            criados = _criados(entrada)
+            if self.executor is not None and any(self.executor.ocupado(dispositivo) for dispositivo in criados):
+                ocupados.append(item)
+                continue
+            for dispositivo in criados:
+                del self.dispositivos[id(dispositivo)]
+                if dispositivo.conexao is not None:
+                    dispositivo.conexao.fecha()
+            total += len(entrada[0]) if type(entrada[0]) is list else 1
+            retirados.append((prazo, entrada))
+        for item in ocupados:
+            heapq.heappush(self.heap, item)
+        return retirados
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna o estado atual do escalonador.
+
+        O atraso é o maior entre o prazo vencido mais antigo ainda no heap e o maior atraso
+        de início de execução desde a chamada anterior (que é zerado).
+
+        Retorna
+        -------
+            dict: execucoes (total), tempoOcupado, dispositivos (já criados), pendentes (entradas
+                ainda agendadas ou em execução) e atraso (em segundos).
+        """
+        atraso = max(0.0, Relogio.atual.monotonico() - self.heap[0][0]) if self.heap else 0.0
+        atraso = max(atraso, self.maiorAtraso)
+        self.maiorAtraso = 0.0
+        return {
+            "execucoes": self.totalExecucoes,
+            "tempoOcupado": self.tempoOcupado,
+            "dispositivos": len(self.dispositivos),
+            "pendentes": len(self.heap) + len(self.emExecucao),
+            "atraso": atraso,
+        }
+
+    def proximoPrazo(self, prazo: float, intervalo: float, agora: float) -> tuple:
+        """
+        Calcula o prazo seguinte a partir do anterior, aplicando a política de atraso.
+
+        Parâmetros
+        ----------
+            - prazo (float): O prazo da execução que terminou (relógio monotônico).
+            - intervalo (float): O intervalo em segundos entre execuções.
+            - agora (float): O instante em que a execução terminou.
+
+        Retorna
+        -------
+            tuple: (próximo prazo, quantidade de prazos descartados ou agrupados).
+        """
+        proximo = prazo + intervalo
+        if proximo > agora or self.politicaAtraso == RECUPERAR:
+            return proximo, 0
+        perdidos = int((agora - proximo) // intervalo) + 1
+        if self.politicaAtraso == PULAR:
+            return proximo + perdidos * intervalo, perdidos
+        # AGRUPAR: uma execução imediata no lugar de todos os prazos perdidos,
+        # mantendo a grade (o prazo seguinte a ela já está no futuro).
+        return proximo + (perdidos - 1) * intervalo, perdidos - 1
+
+    async def executa(self, permanente: bool = False) -> None:
+        """
+        Executa o loop do escalonador até que todas as execuções agendadas terminem.
+
+        Ao final (ou se o loop for interrompido), envia os lotes pendentes de todos os dispositivos.
+
+        Parâmetros
+        ----------
+            - permanente (bool): Continua aguardando novas entradas (ver recebe) mesmo sem
+                execuções agendadas, até que para() seja chamado.
+                Padrão = False.
+        """
+        # Os dispositivos agendados daqui em diante não são fundidos aos que já podem estar em execução.
+        self._fundidas = None
+        try:
+            await self._executaLoop(permanente)
+            if self.emExecucao:
+                await asyncio.gather(*self.emExecucao, return_exceptions=True)
+        finally:
+            self.encerra()
+
+    def para(self) -> None:
+        """
+        Interrompe o loop: as execuções em andamento terminam e nenhuma outra é iniciada.
+        """
+        self._parar = True
+        self._acorda.set()
+
+    def encerra(self) -> None:
+        """
+        Envia os dados que restaram nas filas dos dispositivos e fecha suas conexões.
+        """
+        if self.executor is not None:
+            self.executor.encerra()
+        for dispositivo in self.dispositivos.values():
+            dispositivo.encerra()
+
+    async def _executaLoop(self, permanente: bool = False) -> None:
+        while not self._parar and (permanente or self.heap or self.emExecucao):
+            self._acorda.clear()
+            if not self.heap:
+                await self._acorda.wait()
+                continue
+            relogio = Relogio.atual
+            if relogio.virtual:
+                if self.emExecucao:
+                    # O tempo só avança depois das execuções em andamento.
+                    await self._acorda.wait()
+                    continue
+                self._executaVirtual(relogio)
+                await asyncio.sleep(0)
+                continue
+            espera = self.heap[0][0] - relogio.monotonico()
+            if espera > 0:
+                try:
+                    await asyncio.wait_for(self._acorda.wait(), timeout=espera)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            prazo, _, entrada = heapq.heappop(self.heap)
+            if self.executor is not None:
+                # Com executor a tarefa só gera e enfileira: roda no próprio loop, e as
+                # execuções atrasadas continuam no heap (visíveis em estatisticas e retira).
+                self._submeteTarefa(prazo, entrada)
+                await asyncio.sleep(0)
+                continue
+            execucao = asyncio.create_task(self._executaTarefa(prazo, entrada))
+            self.emExecucao.add(execucao)
+            execucao.add_done_callback(self._finaliza)
+
+    def _executaVirtual(self, relogio: Relogio.RelogioVirtual) -> None:
+        # No tempo virtual não há prazo real a proteger: executa em sequência até
+        # PASSO_VIRTUAL prazos, avançando o relógio até cada um, e só então devolve o
+        # controle ao loop (para recebe, para e as demais tarefas asyncio). Sem executor,
+        # o envio também roda no loop, na ordem dos prazos.
+        heap = self.heap
+        for _ in range(PASSO_VIRTUAL):
+            if self._parar or not heap:
+                return
+            prazo, _, entrada = heapq.heappop(heap)
+            relogio.avancaAte(prazo)
+            self._submeteTarefa(prazo, entrada)
+
+    def _finaliza(self, execucao: asyncio.Task) -> None:
+        self.emExecucao.discard(execucao)
+        self._acorda.set()
+
+    @staticmethod
+    def _executaTick(tarefa: Callable[[Dispositivo], dict], dispositivo: Dispositivo) -> None:
+        try:
+            dados = tarefa(dispositivo)
+            if dados is not None:
+                dispositivo.enviaDados(dados=dados)
+        finally:
+            dispositivo.descarregaSeVencido()
+
+    def _submeteTick(self, tarefa: Callable[[Dispositivo], dict], dispositivo: Dispositivo) -> None:
+        if not self.executor.aceita(dispositivo):
+            # Política "bloquear" com a fila cheia: só este dispositivo espera os seus envios.
+            registro.incrementa("execucoes_adiadas", type(dispositivo).__name__)
+            return
+        try:
+            dados = tarefa(dispositivo)
+            if dados is not None:
+                self.executor.submete(dispositivo, dados, espera=False)
+        finally:
+            if dispositivo.envioPendente():
+                self.executor.agendaDescarga(dispositivo)
+
+    @classmethod
+    def _executaTicks(cls, tarefa: Callable[[Dispositivo], dict], dispositivos) -> list:
+        # Na thread: o erro de um dispositivo não interrompe os demais da entrada fundida.
+        erros = []
+        for dispositivo in dispositivos:
+            try:
+                cls._executaTick(tarefa, dispositivo)
+            except Exception as e:
+                erros.append((dispositivo, e))
+        return erros
+
+    @staticmethod
+    def _reportaErro(dispositivo: Dispositivo, erro: Exception) -> None:
+        asyncio.get_running_loop().call_exception_handler({
+            "message": f"Erro na tarefa de {type(dispositivo).__name__}",
+            "exception": erro,
+        })
+
+    def _dispositivosDa(self, entrada: list):
+        return self._fundidos(entrada) if type(entrada[0]) is list else (self._dispositivo(entrada),)
+
+    async def _executaTarefa(self, prazo: float, entrada: list) -> None:
+        dispositivos, tarefa = self._dispositivosDa(entrada), entrada[1]
+        self.maiorAtraso = max(self.maiorAtraso, Relogio.atual.monotonico() - prazo)
+        try:
+            for dispositivo, erro in await asyncio.to_thread(self._executaTicks, tarefa, dispositivos):
+                self._reportaErro(dispositivo, erro)
+        finally:
+            self._reagenda(prazo, entrada)
+
+    def _submeteTarefa(self, prazo: float, entrada: list) -> None:
+        dispositivos, tarefa = self._dispositivosDa(entrada), entrada[1]
+        executa = self._executaTick if self.executor is None else self._submeteTick
+        inicio = time.monotonic()
+        self.maiorAtraso = max(self.maiorAtraso, Relogio.atual.monotonico() - prazo)
+        try:
+            for dispositivo in dispositivos:
+                try:
+                    executa(tarefa, dispositivo)
+                except Exception as e:
+                    self._reportaErro(dispositivo, e)
+        finally:
+            self.tempoOcupado += time.monotonic() - inicio
+            self._reagenda(prazo, entrada)
+
+    def _reagenda(self, prazo: float, entrada: list) -> None:
+        _, _, intervalo, execucoes, _ = entrada
+        dispositivos = _membros(entrada)
+        self.totalExecucoes += len(dispositivos)
+        if execucoes is not None:
+            execucoes -= 1
+            entrada[3] = execucoes
+        if execucoes is None or execucoes > 0:
+            proximo, perdidos = self.proximoPrazo(prazo, intervalo, Relogio.atual.monotonico())
+            if perdidos:
+                for dispositivo in dispositivos:
+                    registro.incrementa("prazos_perdidos", type(dispositivo).__name__, perdidos)
+            self._agenda(proximo, entrada)
@@ -0,0 +1,333 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from multiprocessing.connection import wait
+from typing import Callable
+from Dispositivos import Relogio
+from Dispositivos.Dispositivo import Dispositivo, coletaDados
+from Dispositivos.Escalonador import (Escalonador, AGRUPAR, POLITICAS_ATRASO, faseInicial, fundeEntrada,
+                                      intervaloDaFabrica, _membros)
+from Dispositivos.ExecutorEnvio import ExecutorEnvio
+from Dispositivos.Metricas import registro
+
+# Segundos que cada processo tem para terminar depois do fim da execução, antes de ser encerrado à força.
+ESPERA_ENCERRAMENTO = 5.0
+
+
+def _trabalhador(indice: int, conexao, politicaAtraso: str, enviosSimultaneos: int, intervaloEstatisticas: float,
+                 relogio) -> None:
+    Relogio.define(relogio)
+    asyncio.run(_executaTrabalhador(indice, conexao, politicaAtraso, enviosSimultaneos, intervaloEstatisticas))
+
+
+async def _executaTrabalhador(indice: int, conexao, politicaAtraso: str, enviosSimultaneos: int,
+                              intervaloEstatisticas: float) -> None:
+    loop = asyncio.get_running_loop()
+    executor = ExecutorEnvio(trabalhadores=enviosSimultaneos).inicia()
+    escalonador = Escalonador(politicaAtraso=politicaAtraso, executor=executor)
+    recebidos = 0
+
+    def estatisticas() -> dict:
+        return {**escalonador.estatisticas(), "indice": indice, "recebidos": recebidos}
+
+    def trata(tipo: str, conteudo) -> None:
+        nonlocal recebidos
+        if tipo == "recebe":
+            escalonador.recebe(conteudo)
+            recebidos += 1
+        elif tipo == "cede":
+            conexao.send(("cedidos", escalonador.retira(conteudo)))
+        elif tipo == "encerra":
+            escalonador.para()
+
+    def le() -> None:
+        # Thread de leitura do pipe; as mensagens são tratadas no loop do processo.
+        while True:
+            try:
+                tipo, conteudo = conexao.recv()
+            except EOFError:
+                tipo, conteudo = "encerra", None
+            loop.call_soon_threadsafe(trata, tipo, conteudo)
+            if tipo == "encerra":
+                return
+
+    async def reporta() -> None:
+        while True:
+            await asyncio.sleep(intervaloEstatisticas)
+            conexao.send(("estatisticas", estatisticas()))
+
+    threading.Thread(target=le, name="EscalonadorParalelo-pipe", daemon=True).start()
+    relatorio = asyncio.create_task(reporta())
+    try:
+        await escalonador.executa(permanente=True)
+    finally:
+        relatorio.cancel()
+        conexao.send(("final", {**estatisticas(), "metricas": registro.instantaneo()}))
+        conexao.close()
+
+
+def _envia(conexao, mensagem: tuple) -> None:
+    # Um processo que morreu é detectado pelo EOFError na leitura; aqui a mensagem só é perdida.
+    try:
+        conexao.send(mensagem)
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+
+
+def somaMetricas(instantaneos: list) -> dict:
+    """
+    Soma os instantâneos de RegistroMetricas de vários processos.
+
+    Contadores e medidores são somados; dos histogramas, só total e soma
+    (percentis de processos diferentes não podem ser combinados).
+
+    Parâmetros
+    ----------
+        - instantaneos (list): Resultados de RegistroMetricas.instantaneo().
+
+    Retorna
+    -------
+        dict: {tipo: {métrica: valor}}.
+    """
+    resultado = {}
+    for instantaneo in instantaneos:
+        for tipo, metricas in instantaneo.items():
+            destino = resultado.setdefault(tipo, {})
+            for nome, valor in metricas.items():
+                if isinstance(valor, dict):
+                    histograma = destino.setdefault(nome, {"total": 0, "soma": 0.0})
+                    histograma["total"] += valor["total"]
+                    histograma["soma"] += valor["soma"]
+                else:
+                    destino[nome] = destino.get(nome, 0) + valor
+    return resultado
+
+
+class EscalonadorParalelo():
+    """
+    Distribui os dispositivos entre vários processos, cada um com o seu Escalonador e loop asyncio.
+
+    Os dispositivos são divididos em partes iguais (alternando tipos e fases) entre os processos.
+    Cada processo envia periodicamente suas estatísticas pelo pipe; se um processo ficar saturado
+    (prazo vencido há mais de atrasoSaturacao segundos) enquanto outro está folgado, parte dos seus
+    dispositivos é transferida para o mais folgado, com fila, reenvio e prazos preservados.
+
+    A tarefa e os dispositivos precisam ser serializáveis com pickle (a tarefa deve ser uma função
+    de nível de módulo); conexões e travas são recriadas em cada processo.
+
+    Cada processo recebe uma cópia do relógio do processo principal (ver Dispositivos.Relogio).
+    Com um RelogioVirtual, cada processo avança a sua cópia de forma independente; como o
+    atraso no tempo virtual é sempre zero, não há transferências entre processos.
+
+    Se um processo terminar sem enviar o relatório final (ex.: morto pelo sistema), os seus
+    dispositivos são perdidos, mas os demais processos continuam até terminar as execuções;
+    o índice do processo fica em mortos.
+
+    Atributos
+    ---------
+        - processos (int): A quantidade de processos.
+        - politicaAtraso (str): A política de atraso de cada Escalonador.
+        - espalhaFases (bool): Se as fases de dispositivos com o mesmo intervalo são espalhadas.
+        - enviosSimultaneos (int): A quantidade de threads de envio de cada processo.
+        - fusao (int): A quantidade máxima de dispositivos executados em um único prazo (ver Escalonador).
+        - intervaloEstatisticas (float): O intervalo em segundos entre relatórios dos processos.
+        - atrasoSaturacao (float): O atraso, em segundos, a partir do qual um processo é considerado saturado.
+        - entradas (list): Pares (fase, entrada) agendados antes de executa().
+        - estatisticas (dict): O último relatório de cada processo, indexado pelo índice do processo.
+        - transferidos (int): A quantidade de dispositivos transferidos entre processos.
+        - mortos (set): Os índices dos processos que terminaram sem enviar o relatório final.
+    """
+
+    def __init__(self, processos: int = None, politicaAtraso: str = AGRUPAR, espalhaFases: bool = True,
+                 enviosSimultaneos: int = 4, intervaloEstatisticas: float = 1.0, atrasoSaturacao: float = 1.0,
+                 contexto: str = None, fusao: int = 1) -> None:
+        """
+        Inicializa o escalonador (os processos só começam em executa()).
+
+        Parâmetros
+        ----------
+            - processos (int): A quantidade de processos.
+                Padrão = None (um por núcleo).
+            - politicaAtraso (str): O que fazer com prazos perdidos: "pular", "agrupar" ou "recuperar".
+                Padrão = "agrupar".
+            - espalhaFases (bool): Se as fases de dispositivos com o mesmo intervalo são espalhadas.
+                Padrão = True.
+            - enviosSimultaneos (int): A quantidade de threads de envio de cada processo.
+                Padrão = 4.
+            - intervaloEstatisticas (float): O intervalo em segundos entre relatórios dos processos.
+                Padrão = 1.0.
+            - atrasoSaturacao (float): O atraso, em segundos, a partir do qual um processo é considerado saturado.
+                Padrão = 1.0.
+            - contexto (str): O método de início dos processos ("fork", "spawn" ou "forkserver").
+                Padrão = None (o padrão da plataforma).
+            - fusao (int): A quantidade máxima de dispositivos com o mesmo intervalo, tarefa e execuções
+                executados em um único prazo. Os dispositivos fundidos ficam no mesmo processo.
+                Padrão = 1 (um prazo por dispositivo).
+
+        Lança
+        -----
+            ValueError: Se a política de atraso não for conhecida ou fusao for menor que 1.
+        """
+        if politicaAtraso not in POLITICAS_ATRASO:
+            raise ValueError(f"Política de atraso desconhecida: {politicaAtraso}")
+        if fusao < 1:
+            raise ValueError(f"Fusão inválida: {fusao}")
+        self.processos = processos or os.cpu_count() or 1
+        self.politicaAtraso = politicaAtraso
+        self.espalhaFases = espalhaFases
+        self.enviosSimultaneos = enviosSimultaneos
+        self.intervaloEstatisticas = intervaloEstatisticas
+        self.atrasoSaturacao = atrasoSaturacao
+        self.fusao = fusao
+        self.entradas = []
+        self.estatisticas = {}
+        self.transferidos = 0
+        self.mortos = set()
+        self._contexto = multiprocessing.get_context(contexto)
+        self._fases = {}
+        self._fundidas = {}
+        self._cedente = None
+
+    def adiciona(self, dispositivo: Dispositivo, tarefa: Callable[[Dispositivo], dict] = coletaDados, intervalo: float = None,
+                 execucoes: int = None) -> None:
+        """
+        Agenda a execução periódica de uma tarefa para um dispositivo (ver Escalonador.adiciona).
+
+        Parâmetros
+        ----------
+            - dispositivo (Dispositivo): O dispositivo passado para a tarefa.
+            - tarefa (Callable): Função de nível de módulo que faz uma leitura do dispositivo
+                e retorna os dados a serem enviados (ou None).
+                Padrão = coletaDados (ver Dispositivo.coleta).
+            - intervalo (float): O intervalo em segundos entre execuções.
+                Padrão = None (o intervalo da classe do dispositivo).
+            - execucoes (int): A quantidade de execuções. None executa indefinidamente.
+                Padrão = None.
+        """
+        self._adicionaEntrada([dispositivo, tarefa, dispositivo.intervalo if intervalo is None else intervalo, execucoes, None])
+
+    def adicionaPendente(self, fabrica: Callable[[], Dispositivo], tarefa: Callable[[Dispositivo], dict] = coletaDados,
+                         intervalo: float = None, execucoes: int = None) -> None:
+        """
+        Agenda um dispositivo que só é criado na primeira execução, já no processo que o executa
+        (ver Escalonador.adicionaPendente). A fábrica precisa ser serializável com pickle.
+        """
+        if intervalo is None:
+            intervalo = intervaloDaFabrica(fabrica)
+        self._adicionaEntrada([None, tarefa, intervalo, execucoes, fabrica])
+
+    def _adicionaEntrada(self, entrada: list) -> None:
+        if self.fusao > 1 and entrada[2] is not None:
+            entrada = fundeEntrada(self._fundidas, entrada, self.fusao)
+            if entrada is None:
+                return
+        intervalo = Dispositivo.intervalo if entrada[2] is None else entrada[2]
+        fase = intervalo
+        if self.espalhaFases:
+            indice = self._fases.get(intervalo, 0)
+            self._fases[intervalo] = indice + 1
+            fase = faseInicial(indice, intervalo)
+        self.entradas.append((fase, entrada))
+
+    def executa(self) -> dict:
+        """
+        Inicia os processos, distribui os dispositivos e aguarda até que todas as execuções terminem.
+
+        Retorna
+        -------
+            dict: execucoes (total), transferidos, processos (o relatório final de cada processo),
+                mortos (os processos sem relatório final) e metricas (as métricas somadas de todos os processos).
+        """
+        conexoes = []
+        processos = []
+        for indice in range(self.processos):
+            conexao, conexaoFilho = self._contexto.Pipe()
+            processo = self._contexto.Process(
+                target=_trabalhador, name=f"EscalonadorParalelo-{indice}", daemon=True,
+                args=(indice, conexaoFilho, self.politicaAtraso, self.enviosSimultaneos, self.intervaloEstatisticas,
+                      Relogio.atual))
+            processo.start()
+            conexaoFilho.close()
+            conexoes.append(conexao)
+            processos.append(processo)
+
+        inicio = Relogio.atual.monotonico()
+        enviados = [1] * self.processos
+        for indice, conexao in enumerate(conexoes):
+            conexao.send(("recebe", [(inicio + fase, entrada) for fase, entrada in self.entradas[indice::self.processos]]))
+        self.entradas = []
+        self._fundidas = {}
+
+        finais = {}
+        ativos = {conexao: indice for indice, conexao in enumerate(conexoes)}
+        self.mortos = set()
+        transferencia = None
+        encerrando = False
+        try:
+            while ativos:
+                for conexao in wait(list(ativos), timeout=self.intervaloEstatisticas):
+                    indice = ativos[conexao]
+                    try:
+                        tipo, conteudo = conexao.recv()
+                    except EOFError:
+                        # Terminou sem o relatório final: deixa de contar nas decisões abaixo.
+                        del ativos[conexao]
+                        self.mortos.add(indice)
+                        self.estatisticas.pop(indice, None)
+                        if transferencia is not None and indice in (transferencia, self._cedente):
+                            transferencia = None
+                        continue
+                    if tipo == "estatisticas":
+                        self.estatisticas[indice] = conteudo
+                    elif tipo == "cedidos":
+                        destino = transferencia
+                        transferencia = None
+                        if destino is None:
+                            # O destino morreu durante a transferência: os dispositivos voltam para a origem.
+                            destino = indice
+                        _envia(conexoes[destino], ("recebe", conteudo))
+                        enviados[destino] += 1
+                        self.transferidos += sum(len(_membros(entrada)) for _, entrada in conteudo)
+                    elif tipo == "final":
+                        finais[indice] = conteudo
+                        del ativos[conexao]
+
+                vivos = [i for i in range(self.processos) if i not in self.mortos]
+                atualizados = [self.estatisticas.get(i, {}).get("recebidos") == enviados[i] for i in vivos]
+                if encerrando or transferencia is not None or not all(atualizados):
+                    continue
+                if all(self.estatisticas[i]["pendentes"] == 0 for i in vivos):
+                    for i in vivos:
+                        _envia(conexoes[i], ("encerra", None))
+                    encerrando = True
+                else:
+                    transferencia = self._rebalanceia(conexoes)
+        finally:
+            for processo in processos:
+                processo.join(ESPERA_ENCERRAMENTO)
+                if processo.is_alive():
+                    processo.terminate()
+                    processo.join()
+
+        return {
+            "execucoes": sum(final["execucoes"] for final in finais.values()),
+            "transferidos": self.transferidos,
+            "processos": finais,
+            "mortos": sorted(self.mortos),
+            "metricas": somaMetricas([final["metricas"] for final in finais.values()]),
+        }
+
+    def _rebalanceia(self, conexoes: list) -> int:
+        # Pede ao processo mais atrasado que ceda 10% dos dispositivos ao menos atrasado,
+        # se um estiver saturado e o outro folgado. Retorna o índice do destino, ou None.
+        ordenados = sorted(self.estatisticas.values(), key=lambda e: e["atraso"])
+        folgado, saturado = ordenados[0], ordenados[-1]
+        if saturado["atraso"] < self.atrasoSaturacao or folgado["atraso"] >= self.atrasoSaturacao / 2:
+            return None
+        quantidade = max(1, saturado["dispositivos"] // 10)
+        self._cedente = saturado["indice"]
+        conexoes[saturado["indice"]].send(("cede", quantidade))
+        # Evita uma nova transferência com estatísticas anteriores a esta.
+        del self.estatisticas[saturado["indice"]]
+        return folgado["indice"]
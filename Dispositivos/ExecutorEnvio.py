@@ -0,0 +1,235 @@
+import threading
+from collections import deque
+from Dispositivos.Dispositivo import Dispositivo
+from Dispositivos.Metricas import registro
+
+BLOQUEAR = "bloquear"
+DESCARTAR_ANTIGO = "descartarAntigo"
+TRANSBORDAR = "transbordar"
+POLITICAS_SOBRECARGA = (BLOQUEAR, DESCARTAR_ANTIGO, TRANSBORDAR)
+
+_DESCARGA = object()
+
+
+class ExecutorEnvio():
+    """
+    Executa os envios ao TagoIO em um conjunto de threads, separado da geração dos dados.
+
+    A geração apenas coloca as leituras em uma fila limitada; as threads de envio (o limite
+    de envios simultâneos) a esvaziam chamando enviaDados de cada dispositivo. Assim uma
+    resposta lenta do TagoIO não atrasa a amostragem dos sensores.
+
+    As leituras de um mesmo dispositivo nunca são enviadas por duas threads ao mesmo tempo:
+    cada dispositivo tem a sua fila, e uma thread leva todas as leituras pendentes dele, em
+    ordem. Um dispositivo lento ocupa uma única thread; as demais seguem com os outros.
+
+    Quando a fila está cheia, a política de sobrecarga decide o que fazer:
+
+        - "bloquear": a geração desacelera. Quem submete de fora do loop asyncio (ex.:
+          Reproducao) espera até haver espaço. No Escalonador, o loop nunca espera: o
+          dispositivo que ainda tem leituras aguardando envio pula a execução (ver aceita),
+          e os demais continuam;
+        - "descartarAntigo": a leitura mais antiga do dispositivo que espera há mais tempo é descartada;
+        - "transbordar": a leitura vai direto para a fila de reenvio do dispositivo
+          (ver FilaReenvio), que é enviada quando os envios alcançarem a geração.
+
+    Atributos
+    ---------
+        - trabalhadores (int): A quantidade de threads de envio.
+        - capacidade (int): A quantidade máxima de leituras aguardando envio.
+        - politica (str): "bloquear", "descartarAntigo" ou "transbordar".
+        - fila (dict): Por id do dispositivo, o par (dispositivo, deque dos dados aguardando envio),
+            na ordem em que os dispositivos passaram a ter dados pendentes.
+        - pendentes (int): A quantidade de leituras aguardando envio (sem as que já estão sendo enviadas).
+        - descartados (int): A quantidade de leituras descartadas pela política "descartarAntigo".
+    """
+
+    def __init__(self, trabalhadores: int = 8, capacidade: int = 10000, politica: str = TRANSBORDAR) -> None:
+        """
+        Inicializa o executor (as threads só começam em inicia()).
+
+        Parâmetros
+        ----------
+            - trabalhadores (int): A quantidade de threads de envio.
+                Padrão = 8.
+            - capacidade (int): A quantidade máxima de leituras aguardando envio.
+                Padrão = 10000.
+            - politica (str): O que fazer com a fila cheia: "bloquear", "descartarAntigo" ou "transbordar".
+                Padrão = "transbordar".
+
+        Lança
+        -----
+            ValueError: Se a política de sobrecarga não for conhecida.
+        """
+        if politica not in POLITICAS_SOBRECARGA:
+            raise ValueError(f"Política de sobrecarga desconhecida: {politica}")
+        self.trabalhadores = trabalhadores
+        self.capacidade = capacidade
+        self.politica = politica
+        self.fila = {}
+        self.pendentes = 0
+        self.descartados = 0
+        self._condicao = threading.Condition()
+        self._prontos = deque()
+        self._emEnvio = set()
+        self._encerrando = False
+        self._threads = []
+
+    def inicia(self) -> "ExecutorEnvio":
+        """
+        Inicia as threads de envio. Leituras submetidas antes disso ficam na fila até lá.
+        """
+        self._encerrando = False
+        for i in range(self.trabalhadores):
+            thread = threading.Thread(target=self._executa, name=f"ExecutorEnvio-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def ocupado(self, dispositivo: Dispositivo) -> bool:
+        """
+        Verifica se o dispositivo tem leituras aguardando envio ou um envio em andamento.
+        """
+        chave = id(dispositivo)
+        with self._condicao:
+            return chave in self.fila or chave in self._emEnvio
+
+    def aceita(self, dispositivo: Dispositivo) -> bool:
+        """
+        Verifica, sem esperar, se a próxima leitura do dispositivo deve ser gerada.
+
+        Só com a política "bloquear" e a fila cheia a resposta é False, e só para dispositivos
+        que ainda têm leituras aguardando envio ou em envio: a geração deles espera os envios,
+        sem parar a dos outros.
+        """
+        if self.politica != BLOQUEAR or self.pendentes < self.capacidade:
+            return True
+        return not self.ocupado(dispositivo)
+
+    def submete(self, dispositivo: Dispositivo, dados: dict, espera: bool = True) -> bool:
+        """
+        Coloca uma leitura na fila de envio do dispositivo.
+
+        Parâmetros
+        ----------
+            - dispositivo (Dispositivo): O dispositivo que envia os dados.
+            - dados (dict): Os dados a serem enviados.
+            - espera (bool): Com a política "bloquear" e a fila cheia, espera até haver espaço.
+                False enfileira mesmo assim (quem chama do loop asyncio consulta aceita antes),
+                assim como antes de inicia(), quando não há threads para liberar espaço.
+                Padrão = True.
+
+        Retorna
+        -------
+            bool: True se a leitura entrou na fila de envio, False se foi transbordada
+                para a fila de reenvio do dispositivo.
+        """
+        transborda = False
+        with self._condicao:
+            if self.pendentes >= self.capacidade:
+                if self.politica == BLOQUEAR:
+                    while espera and self.pendentes >= self.capacidade and self._threads and not self._encerrando:
+                        self._condicao.wait()
+                elif self.politica == DESCARTAR_ANTIGO:
+                    self._descartaAntigo()
+                else:
+                    transborda = True
+            if not transborda:
+                self._enfileira(dispositivo, dados)
+                return True
+        # Fora da trava do executor, pois adiaDados usa a trava do dispositivo.
+        dispositivo.adiaDados(dados)
+        registro.incrementa("envios_transbordados", type(dispositivo).__name__)
+        return False
+
+    def _enfileira(self, dispositivo: Dispositivo, dados) -> None:
+        chave = id(dispositivo)
+        entrada = self.fila.get(chave)
+        if entrada is None:
+            entrada = self.fila[chave] = (dispositivo, deque())
+            # Com envio em andamento, a thread que o faz devolve o dispositivo aos prontos ao terminar.
+            if chave not in self._emEnvio:
+                self._prontos.append(dispositivo)
+        entrada[1].append(dados)
+        self.pendentes += 1
+        self._condicao.notify_all()
+
+    def _descartaAntigo(self) -> None:
+        chave, (descartado, pendentes) = next(iter(self.fila.items()))
+        dadosDescartados = pendentes.popleft()
+        self.pendentes -= 1
+        if not pendentes:
+            del self.fila[chave]
+            if chave not in self._emEnvio:
+                self._prontos.remove(descartado)
+        if dadosDescartados is not _DESCARGA:
+            self.descartados += 1
+            registro.incrementa("envios_descartados", type(descartado).__name__)
+
+    def agendaDescarga(self, dispositivo: Dispositivo) -> None:
+        """
+        Pede a uma thread de envio que chame descarregaSeVencido do dispositivo.
+
+        Com a fila cheia o pedido é ignorado; a próxima execução do dispositivo pede de novo.
+        """
+        with self._condicao:
+            if self.pendentes < self.capacidade:
+                entrada = self.fila.get(id(dispositivo))
+                if entrada is None or entrada[1][-1] is not _DESCARGA:
+                    self._enfileira(dispositivo, _DESCARGA)
+
+    def aguarda(self) -> None:
+        """
+        Espera até que a fila esteja vazia e não haja envios em andamento.
+        """
+        with self._condicao:
+            while self.fila or self._emEnvio:
+                self._condicao.wait()
+
+    def encerra(self) -> None:
+        """
+        Envia o que restar na fila e para as threads de envio.
+
+        Sem threads (inicia() não foi chamado), o que restar na fila é enviado na thread que chama.
+        """
+        if not self._threads:
+            with self._condicao:
+                self._encerrando = True
+            self._executa()
+            return
+        self.aguarda()
+        with self._condicao:
+            self._encerrando = True
+            self._condicao.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _executa(self) -> None:
+        while True:
+            with self._condicao:
+                while not self._prontos and not self._encerrando:
+                    self._condicao.wait()
+                if not self._prontos:
+                    return
+                dispositivo = self._prontos.popleft()
+                chave = id(dispositivo)
+                _, pendentes = self.fila.pop(chave)
+                self.pendentes -= len(pendentes)
+                self._emEnvio.add(chave)
+                self._condicao.notify_all()
+            try:
+                for dados in pendentes:
+                    try:
+                        if dados is _DESCARGA:
+                            dispositivo.descarregaSeVencido()
+                        else:
+                            dispositivo.enviaDados(dados)
+                    except Exception:
+                        registro.incrementa("envios_falha", type(dispositivo).__name__)
+            finally:
+                with self._condicao:
+                    self._emEnvio.discard(chave)
+                    if chave in self.fila:
+                        self._prontos.append(dispositivo)
+                    self._condicao.notify_all()
@@ -0,0 +1,267 @@
+import json
+import os
+import time
+from collections import deque
+
+ARQUIVO_POSICAO = "posicao"
+EXTENSAO_SEGMENTO = ".seg"
+
+
+class FilaReenvio():
+    """
+    Fila limitada dos dados cujo envio falhou, com log em disco.
+
+    Sem diretório, os itens ficam em um anel em memória com capacidade fixa e, quando ele
+    enche, o item mais antigo é descartado.
+
+    Com diretório, todo item é gravado ao entrar na fila em segmentos de log (um JSON por
+    linha), e o anel em memória é só um cache do início do log, de até capacidade itens,
+    recarregado do disco à medida que os lotes são confirmados. A posição de leitura (o
+    segmento e a quantidade de itens já confirmados nele) é gravada a cada confirmação, e os
+    segmentos inteiramente confirmados são apagados. Como o log é gravado a cada adiciona(),
+    uma queda do processo (SIGKILL, falta de memória) não perde nenhum item: a fila é
+    recarregada ao ser criada no mesmo diretório. Um lote enviado cuja confirmação não chegou
+    a ser gravada é reenviado depois de reiniciar.
+
+    O reenvio é feito em lotes, respeitando uma espera exponencial entre tentativas que
+    falharam.
+
+    Atributos
+    ---------
+        - capacidade (int): A quantidade máxima de itens mantidos em memória.
+        - diretorio (str): O diretório dos segmentos em disco. None mantém tudo em memória.
+        - tamanhoLote (int): A quantidade máxima de itens por lote de reenvio.
+        - esperaInicial (float): A espera, em segundos, após a primeira falha.
+        - esperaMaxima (float): O limite, em segundos, da espera exponencial.
+        - memoria (deque): Os primeiros itens da fila, do mais antigo para o mais recente.
+        - descartados (int): A quantidade de itens descartados por falta de espaço.
+    """
+
+    def __init__(self, capacidade: int = 10000, diretorio: str = None, tamanhoLote: int = 500,
+                 esperaInicial: float = 1.0, esperaMaxima: float = 300.0) -> None:
+        """
+        Inicializa a fila, recarregando os itens gravados em disco por uma execução anterior.
+
+        Parâmetros
+        ----------
+            - capacidade (int): A quantidade máxima de itens mantidos em memória.
+                Padrão = 10000.
+            - diretorio (str): O diretório do log em disco.
+                Padrão = None (descarta os itens mais antigos quando a memória enche).
+            - tamanhoLote (int): A quantidade máxima de itens por lote de reenvio.
+                Padrão = 500.
+            - esperaInicial (float): A espera, em segundos, após a primeira falha.
+                Padrão = 1.
+            - esperaMaxima (float): O limite, em segundos, da espera exponencial.
+                Padrão = 300.
+        """
+        self.capacidade = capacidade
+        self.diretorio = diretorio
+        self.tamanhoLote = tamanhoLote
+        self.esperaInicial = esperaInicial
+        self.esperaMaxima = esperaMaxima
+        self.memoria = deque()
+        self.descartados = 0
+        self.espera = 0.0
+        self._proximaTentativa = 0.0
+        self._segmentos = deque()
+        self._contagens = deque()
+        self._confirmados = 0
+        self._itensNoLog = 0
+        self._arquivo = None
+        if diretorio is not None:
+            os.makedirs(diretorio, exist_ok=True)
+            self._carrega()
+
+    def __len__(self) -> int:
+        return len(self.memoria) if self.diretorio is None else self._itensNoLog
+
+    def _caminhoSegmento(self, numero: int) -> str:
+        return os.path.join(self.diretorio, f"{numero:012d}{EXTENSAO_SEGMENTO}")
+
+    def _carrega(self) -> None:
+        numeros = sorted(int(nome[:-len(EXTENSAO_SEGMENTO)]) for nome in os.listdir(self.diretorio)
+                         if nome.endswith(EXTENSAO_SEGMENTO))
+        segmento, confirmados = self._lePosicao()
+        for numero in numeros:
+            if numero < segmento:
+                # Confirmado por inteiro, mas a queda veio antes de apagá-lo.
+                os.remove(self._caminhoSegmento(numero))
+                continue
+            self._segmentos.append(numero)
+            self._contagens.append(self._contaLinhas(self._caminhoSegmento(numero)))
+        if self._segmentos and self._segmentos[0] == segmento:
+            self._confirmados = min(confirmados, self._contagens[0])
+        self._itensNoLog = sum(self._contagens) - self._confirmados
+        self._recarrega()
+
+    def _lePosicao(self) -> tuple:
+        try:
+            with open(os.path.join(self.diretorio, ARQUIVO_POSICAO)) as arquivo:
+                segmento, confirmados = arquivo.read().split()
+            return int(segmento), int(confirmados)
+        except (OSError, ValueError):
+            return -1, 0
+
+    @staticmethod
+    def _contaLinhas(caminho: str) -> int:
+        # Uma linha incompleta no fim (queda durante a gravação) é removida.
+        with open(caminho, "rb+") as arquivo:
+            conteudo = arquivo.read()
+            fim = conteudo.rfind(b"\n") + 1
+            if fim < len(conteudo):
+                arquivo.truncate(fim)
+        return conteudo.count(b"\n", 0, fim)
+
+    def __getstate__(self) -> dict:
+        # O segmento aberto não passa entre processos: é fechado aqui, e a cópia grava em um segmento novo.
+        self._fechaSegmento()
+        return self.__dict__.copy()
+
+    def _fechaSegmento(self) -> None:
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def adiciona(self, itens: list) -> None:
+        """
+        Adiciona ao final da fila os itens de um envio que falhou (com diretório, já gravados no log).
+
+        Parâmetros
+        ----------
+            - itens (list): Os itens a serem reenviados.
+        """
+        if self.diretorio is None:
+            for item in itens:
+                if len(self.memoria) >= self.capacidade:
+                    self.memoria.popleft()
+                    self.descartados += 1
+                self.memoria.append(item)
+            return
+        if not itens:
+            return
+        for item in itens:
+            self._gravaNoLog(item)
+            # O anel guarda só o início do log: um item entra se todos os anteriores estão nele.
+            if len(self.memoria) == self._itensNoLog and len(self.memoria) < self.capacidade:
+                self.memoria.append(item)
+            self._itensNoLog += 1
+        self._arquivo.flush()
+
+    def _gravaNoLog(self, item) -> None:
+        if self._arquivo is None or self._contagens[-1] >= self.capacidade:
+            self._fechaSegmento()
+            numero = self._segmentos[-1] + 1 if self._segmentos else 0
+            self._segmentos.append(numero)
+            self._contagens.append(0)
+            self._arquivo = open(self._caminhoSegmento(numero), "ab")
+        self._arquivo.write(json.dumps(item, default=dict).encode() + b"\n")
+        self._contagens[-1] += 1
+
+    def _recarrega(self) -> None:
+        # Completa o anel com os itens do log que vêm depois dos que já estão nele.
+        falta = min(self.capacidade, self._itensNoLog) - len(self.memoria)
+        if falta <= 0:
+            return
+        inicio = self._confirmados + len(self.memoria)
+        for numero, contagem in zip(self._segmentos, self._contagens):
+            if inicio >= contagem:
+                inicio -= contagem
+                continue
+            with open(self._caminhoSegmento(numero), "rb") as arquivo:
+                for indice, linha in enumerate(arquivo):
+                    if indice < inicio:
+                        continue
+                    if indice >= contagem:
+                        break
+                    self.memoria.append(json.loads(linha))
+                    falta -= 1
+                    if not falta:
+                        return
+            inicio = 0
+
+    def proximoLote(self) -> list:
+        """
+        Retorna o próximo lote a ser reenviado, sem removê-lo da fila.
+
+        Retorna
+        -------
+            list: Até tamanhoLote itens, do mais antigo para o mais recente.
+        """
+        if self.diretorio is not None and len(self.memoria) < min(self.tamanhoLote, self._itensNoLog):
+            self._recarrega()
+        quantidade = min(self.tamanhoLote, len(self.memoria))
+        return [self.memoria[i] for i in range(quantidade)]
+
+    def confirma(self, quantidade: int) -> None:
+        """
+        Remove da fila os itens de um lote reenviado com sucesso (com diretório, grava a nova posição do log).
+
+        Parâmetros
+        ----------
+            - quantidade (int): A quantidade de itens do início da fila que foram enviados.
+        """
+        for _ in range(quantidade):
+            self.memoria.popleft()
+        if self.diretorio is None or not quantidade:
+            return
+        self._itensNoLog -= quantidade
+        self._confirmados += quantidade
+        if not self._itensNoLog:
+            self._esvaziaLog()
+            return
+        while self._confirmados >= self._contagens[0]:
+            self._confirmados -= self._contagens.popleft()
+            os.remove(self._caminhoSegmento(self._segmentos.popleft()))
+        self._gravaPosicao()
+
+    def _gravaPosicao(self) -> None:
+        caminho = os.path.join(self.diretorio, ARQUIVO_POSICAO)
+        temporario = caminho + ".tmp"
+        with open(temporario, "w") as arquivo:
+            arquivo.write(f"{self._segmentos[0]} {self._confirmados}\n")
+        os.replace(temporario, caminho)
+
+    def _esvaziaLog(self) -> None:
+        self._fechaSegmento()
+        while self._segmentos:
+            os.remove(self._caminhoSegmento(self._segmentos.popleft()))
+        self._contagens.clear()
+        self._confirmados = 0
+        caminho = os.path.join(self.diretorio, ARQUIVO_POSICAO)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+    def podeTentar(self) -> bool:
+        """
+        Verifica se já passou a espera desde a última falha.
+
+        Retorna
+        -------
+            bool: True se um novo envio pode ser tentado, False caso contrário.
+        """
+        return time.monotonic() >= self._proximaTentativa
+
+    def registraFalha(self) -> None:
+        """
+        Dobra a espera até a próxima tentativa (limitada a esperaMaxima).
+        """
+        self.espera = min(max(self.esperaInicial, self.espera * 2), self.esperaMaxima)
+        self._proximaTentativa = time.monotonic() + self.espera
+
+    def registraSucesso(self) -> None:
+        """
+        Zera a espera após um envio bem-sucedido.
+        """
+        self.espera = 0.0
+        self._proximaTentativa = 0.0
+
+    def salva(self) -> None:
+        """
+        Fecha o segmento aberto do log (os itens já foram gravados por adiciona()).
+
+        Os itens são recarregados na próxima vez que uma fila for criada no mesmo diretório.
+        Sem diretório configurado, não faz nada.
+        """
+        if self.diretorio is not None:
+            self._fechaSegmento()
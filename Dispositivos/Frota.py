@@ -0,0 +1,213 @@
+import inspect
+import numpy as np
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Lote import Lote, ACEITO, modeloDaClasse, passoVetorizado
+from Dispositivos.Outliers import regrasDoTipo
+from Dispositivos.Tempo import agora
+
+
+class GrupoFrota():
+    """
+    Estado colunar de um grupo de sensores da mesma classe e com a mesma escala.
+
+    Atributos
+    ---------
+        - classe (type): A classe de sensor simulada (ex.: Termometro).
+        - modelo: O modelo vetorizado da classe (ver Dispositivos.Lote).
+        - escala (str): A unidade enviada nas leituras (None se a classe não tiver unidade).
+        - tokens (list): O token de cada sensor.
+        - valores (numpy.ndarray): O valor atual de cada sensor (float64).
+        - timestamps (numpy.ndarray): O timestamp da última medição de cada sensor, em ns desde a época (int64).
+        - parametros (dict): Um array por parâmetro do modelo (chanceOutlier, limites), com um valor por sensor,
+            e os parâmetros comuns ao grupo (ex.: as janelas de horário do SensorMovimento, as regras
+            de outlier e o estado das regras com janela).
+        - inicio (int): O índice do primeiro sensor do grupo na frota.
+    """
+
+    def __init__(self, classe: type, tokens: list, escala: str, parametros: dict, valores: np.ndarray,
+                 timestamp: int, inicio: int) -> None:
+        self.classe = classe
+        self.modelo = modeloDaClasse(classe)
+        self.escala = escala
+        self.tokens = tokens
+        self.valores = valores.astype(np.float64)
+        self.timestamps = np.full(len(tokens), timestamp, dtype=np.int64)
+        self.parametros = parametros
+        self.inicio = inicio
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+class SensorFrota():
+    """
+    Visão leve de um sensor armazenado em uma FrotaSensores.
+
+    Não guarda estado próprio: lê e escreve diretamente nos arrays do grupo.
+
+    Atributos
+    ---------
+        - grupo (GrupoFrota): O grupo que armazena o sensor.
+        - indice (int): A posição do sensor dentro do grupo.
+    """
+    __slots__ = ("grupo", "indice")
+
+    def __init__(self, grupo: GrupoFrota, indice: int) -> None:
+        self.grupo = grupo
+        self.indice = indice
+
+    @property
+    def token(self) -> str:
+        return self.grupo.tokens[self.indice]
+
+    @property
+    def valor(self) -> float:
+        return self.grupo.valores[self.indice].item()
+
+    @valor.setter
+    def valor(self, valor: float) -> None:
+        self.grupo.valores[self.indice] = valor
+
+    @property
+    def timestamp(self) -> int:
+        return self.grupo.timestamps[self.indice].item()
+
+    def parametro(self, nome: str):
+        """
+        Retorna o valor de um parâmetro do modelo (ex.: "chanceOutlier") para este sensor.
+        """
+        return self.grupo.parametros[nome][self.indice].item()
+
+    def dados(self) -> Leitura:
+        """
+        Monta a leitura no formato do TagoIO com o valor atual do sensor.
+
+        Retorna
+        -------
+            Leitura: Uma leitura com 'variable', 'value', 'unit' (se houver) e 'time' (timestamp em ns).
+        """
+        modelo = self.grupo.modelo
+        if modelo.texto is not None:
+            valor = modelo.texto
+        elif modelo.casas is None:
+            valor = int(self.valor)
+        else:
+            valor = round(self.valor, modelo.casas)
+        return Leitura(modelo.variavel, valor, self.grupo.escala, self.timestamp)
+
+    def __repr__(self) -> str:
+        return f"SensorFrota({self.grupo.classe.__name__}, token={self.token!r}, valor={self.valor})"
+
+
+class FrotaSensores():
+    """
+    Armazena o estado de muitos sensores simulados em arrays paralelos (formato colunar).
+
+    Em vez de um objeto Python por dispositivo, cada grupo de sensores da mesma classe guarda
+    valores atuais (float64), timestamps (int64, ns desde a época) e limites/chances de outlier
+    em arrays NumPy. Os sensores individuais são acessados por visões leves (SensorFrota) e o
+    passo de simulação, com as regras de outlier de cada classe, é calculado para a frota inteira
+    de uma vez (ver Dispositivos.Lote).
+
+    Atributos
+    ---------
+        - grupos (list): Os grupos de sensores (GrupoFrota), na ordem em que foram adicionados.
+        - rng (numpy.random.Generator): O gerador de números aleatórios da frota.
+    """
+
+    def __init__(self, semente=None) -> None:
+        """
+        Inicializa uma frota vazia.
+
+        Parâmetros
+        ----------
+            - semente (int): A semente dos números aleatórios da frota.
+                Padrão = None (semente aleatória).
+        """
+        self.grupos = []
+        self.rng = np.random.default_rng(semente)
+        self._tamanho = 0
+
+    def adiciona(self, classe: type, tokens: list, **parametros) -> GrupoFrota:
+        """
+        Adiciona à frota um grupo de sensores de uma classe.
+
+        Parâmetros
+        ----------
+            - classe (type): A classe de sensor (Termometro, SensorAgua, SensorUmidade,
+                SensorLuminosidade, SensorSom, SensorPressao ou SensorMovimento).
+            - tokens (list): O token de cada sensor do grupo.
+            - **parametros: Os parâmetros do inicializador da classe (ex.: chanceOutlier, temperaturaLimite,
+                escala). Cada um pode ser um valor único ou uma sequência com um valor por sensor.
+                Os omitidos usam o padrão da classe. As janelas de horário do SensorMovimento
+                (janelas, horarioInicial, diferencaTempoFinal) valem para o grupo inteiro.
+
+        Retorna
+        -------
+            GrupoFrota: O grupo criado.
+
+        Lança
+        -----
+            TypeError: Se a classe não suportar simulação vetorizada.
+        """
+        modelo = modeloDaClasse(classe)
+        padroes = {nome: p.default for nome, p in inspect.signature(classe.__init__).parameters.items()
+                   if p.default is not inspect.Parameter.empty}
+        padroes.update(parametros)
+        escala = padroes.pop("escala", None)
+        n = len(tokens)
+        colunas = {nome: np.broadcast_to(np.asarray(padroes[nome]), (n,)).copy() for nome in modelo.parametros}
+        if modelo.compartilhados is not None:
+            colunas.update(modelo.compartilhados(padroes))
+        regras = regrasDoTipo(classe)
+        colunas["regrasOutlier"] = regras
+        if regras.temEstado:
+            colunas["estadoOutlier"] = regras.novoEstado(n)
+        valores = modelo.inicial(self.rng, n, dict(colunas, escala=escala))
+        grupo = GrupoFrota(classe, list(tokens), escala, colunas, valores, agora(), self._tamanho)
+        self.grupos.append(grupo)
+        self._tamanho += n
+        return grupo
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __getitem__(self, indice: int) -> SensorFrota:
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("índice fora da frota")
+        for grupo in self.grupos:
+            if indice < grupo.inicio + len(grupo):
+                return SensorFrota(grupo, indice - grupo.inicio)
+
+    def __iter__(self):
+        for grupo in self.grupos:
+            for indice in range(len(grupo)):
+                yield SensorFrota(grupo, indice)
+
+    def passo(self, instante: int = None) -> list:
+        """
+        Gera uma leitura de cada sensor da frota, aplicando as regras de outlier de cada classe.
+
+        Parâmetros
+        ----------
+            - instante (int): O instante das leituras, em ns desde a época.
+                Padrão = None (agora).
+
+        Retorna
+        -------
+            list: Um Lote por grupo, na ordem de grupos. Nas leituras descartadas (aceitos = False),
+                o valor é o que o sensor passou a ter.
+        """
+        ts = agora() if instante is None else instante
+        lotes = []
+        for grupo in self.grupos:
+            tsLeitura = np.full(len(grupo), ts, dtype=np.int64)
+            novo, tsNovo, codigo = passoVetorizado(grupo.modelo, self.rng, grupo.valores, grupo.timestamps,
+                                                   tsLeitura, grupo.parametros)
+            grupo.valores[:] = novo
+            grupo.timestamps[:] = tsNovo
+            casas = grupo.modelo.casas
+            lotes.append(Lote(novo if casas is None else np.round(novo, casas), codigo == ACEITO, tsLeitura))
+        return lotes
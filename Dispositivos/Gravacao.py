@@ -0,0 +1,446 @@
+"""
+Gravação offline de leituras em arquivos colunares comprimidos (formato próprio, sem dependências).
+
+Cada arquivo começa com o cabeçalho b"IOTC" + versão (uint16) + reservado (uint16) e contém
+uma sequência de blocos. Cada bloco tem:
+
+    - cabeçalho "<4sII6I": b"BLOC", quantidade de linhas, tamanho do dicionário e o tamanho
+      comprimido de cada uma das 6 colunas;
+    - dicionário: JSON comprimido com os textos novos deste bloco (tokens, variáveis, unidades, textos);
+    - colunas comprimidas com zlib, na ordem de COLUNAS.
+
+Token, variável, unidade e valores em texto são gravados como índices nos dicionários do
+arquivo, que só crescem (um bloco traz apenas os textos que ainda não apareceram no arquivo).
+Cada arquivo é independente: os dicionários recomeçam a cada rotação.
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from array import array
+from collections.abc import Mapping
+from itertools import compress
+from typing import NamedTuple
+from Dispositivos.Leitura import Leitura
+
+ASSINATURA_ARQUIVO = b"IOTC"
+ASSINATURA_BLOCO = b"BLOC"
+VERSAO = 1
+EXTENSAO = ".iotc"
+
+_CABECALHO_ARQUIVO = struct.Struct("<4sHH")
+_CABECALHO_BLOCO = struct.Struct("<4sII6I")
+
+# Nome e typecode (módulo array) de cada coluna, na ordem em que são gravadas.
+COLUNAS = (
+    ("tokens", "I"),
+    ("variaveis", "I"),
+    ("unidades", "i"),
+    ("valores", "d"),
+    ("codigos", "i"),
+    ("instantes", "q"),
+)
+
+# Valores da coluna codigos: >= 0 é o índice de um valor em texto.
+REAL = -1
+INTEIRO = -2
+
+SEM_UNIDADE = -1
+
+_FORMATOS_COMPATIVEIS = {"d": ("d",), "q": ("q", "l"), "i": ("i",), "I": ("I",)}
+
+
+def _estende(coluna: array, dados) -> None:
+    # Arrays contíguos com o mesmo tipo (ex.: NumPy float64/int64) são copiados de uma vez.
+    try:
+        memoria = memoryview(dados)
+    except TypeError:
+        coluna.extend(dados)
+        return
+    if (memoria.c_contiguous and memoria.itemsize == coluna.itemsize
+            and memoria.format.lstrip("<=@") in _FORMATOS_COMPATIVEIS[coluna.typecode]):
+        coluna.frombytes(memoria.cast("B"))
+    else:
+        coluna.extend(dados)
+
+
+class _Dicionario():
+    def __init__(self) -> None:
+        self.indices = {}
+        self.novos = []
+
+    def indice(self, texto: str) -> int:
+        indice = self.indices.get(texto)
+        if indice is None:
+            indice = self.indices[texto] = len(self.indices)
+            self.novos.append(texto)
+        return indice
+
+
+class TransporteGravacao():
+    """
+    Transporte que grava os dados enviados por um dispositivo em um GravadorColunar (ver Dispositivos.Transporte).
+
+    Os envios de vários dispositivos (e threads de envio) são serializados pela trava do gravador.
+    """
+
+    def __init__(self, gravador: "GravadorColunar", token: str) -> None:
+        self.gravador = gravador
+        self.token = token
+
+    def sendData(self, dados) -> str:
+        registros = [dados] if isinstance(dados, Mapping) else dados
+        with self.gravador.trava:
+            for registro in registros:
+                self.gravador.grava(self.token, registro['variable'], registro['value'], registro.get('unit'), registro['time'])
+        return f"{len(registros)} Data Added"
+
+    def fecha(self) -> None:
+        pass
+
+
+class GravadorColunar():
+    """
+    Grava leituras em arquivos colunares comprimidos, em blocos de tamanho fixo e com rotação por tamanho.
+
+    As leituras ficam em arrays (uma coluna por campo) até completar um bloco, que é comprimido e
+    gravado; a memória usada é limitada por linhasPorBloco, e nenhuma leitura vira dicionário.
+
+    Os métodos não são thread-safe: quem grava de várias threads deve usar a trava (como TransporteGravacao).
+
+    Atributos
+    ---------
+        - diretorio (str): O diretório dos arquivos.
+        - prefixo (str): O prefixo do nome dos arquivos ({prefixo}-{n:06d}.iotc).
+        - linhasPorBloco (int): A quantidade de leituras de cada bloco.
+        - tamanhoMaximoArquivo (int): O tamanho, em bytes, a partir do qual o arquivo é fechado e outro é aberto.
+        - nivelCompressao (int): O nível de compressão do zlib (1 a 9).
+        - arquivos (list): Os caminhos dos arquivos gravados, em ordem.
+        - linhas (int): A quantidade de leituras gravadas.
+        - trava (threading.Lock): Trava para gravações de várias threads.
+    """
+
+    def __init__(self, diretorio: str, prefixo: str = "leituras", linhasPorBloco: int = 65536,
+                 tamanhoMaximoArquivo: int = 256 * 1024 * 1024, nivelCompressao: int = 6) -> None:
+        """
+        Inicializa o gravador. O primeiro arquivo só é criado na gravação do primeiro bloco.
+
+        Parâmetros
+        ----------
+            - diretorio (str): O diretório dos arquivos (criado se não existir).
+            - prefixo (str): O prefixo do nome dos arquivos.
+                Padrão = "leituras".
+            - linhasPorBloco (int): A quantidade de leituras de cada bloco.
+                Padrão = 65536.
+            - tamanhoMaximoArquivo (int): O tamanho, em bytes, que dispara a rotação do arquivo.
+                Padrão = 256 MiB.
+            - nivelCompressao (int): O nível de compressão do zlib (1 a 9).
+                Padrão = 6.
+        """
+        self.diretorio = diretorio
+        self.prefixo = prefixo
+        self.linhasPorBloco = linhasPorBloco
+        self.tamanhoMaximoArquivo = tamanhoMaximoArquivo
+        self.nivelCompressao = nivelCompressao
+        self.arquivos = []
+        self.linhas = 0
+        self.trava = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+        self._arquivo = None
+        self._colunas = [array(typecode) for _, typecode in COLUNAS]
+        self._novoArquivo()
+
+    def _novoArquivo(self) -> None:
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+        self._dicionarios = [_Dicionario() for _ in range(4)]
+        self._cacheTokens = {}
+        self._geracao = len(self.arquivos)
+
+    def _abre(self) -> None:
+        caminho = os.path.join(self.diretorio, f"{self.prefixo}-{len(self.arquivos):06d}{EXTENSAO}")
+        self._arquivo = open(caminho, "wb")
+        self._arquivo.write(_CABECALHO_ARQUIVO.pack(ASSINATURA_ARQUIVO, VERSAO, 0))
+        self.arquivos.append(caminho)
+
+    def _codigo(self, valor) -> tuple:
+        if isinstance(valor, str):
+            return 0.0, self._dicionarios[3].indice(valor)
+        if isinstance(valor, int):
+            return float(valor), INTEIRO
+        return valor, REAL
+
+    def grava(self, token: str, variavel: str, valor, unidade: str, instante: int) -> None:
+        """
+        Grava uma leitura.
+
+        Parâmetros
+        ----------
+            - token (str): O token do dispositivo.
+            - variavel (str): O nome da variável (ex.: "Temperatura").
+            - valor (float | int | str): O valor medido.
+            - unidade (str): A unidade, ou None.
+            - instante (int): O timestamp em nanossegundos desde a época.
+        """
+        tokens, variaveis, unidades, valores, codigos, instantes = self._colunas
+        numero, codigo = self._codigo(valor)
+        tokens.append(self._dicionarios[0].indice(token))
+        variaveis.append(self._dicionarios[1].indice(variavel))
+        unidades.append(SEM_UNIDADE if unidade is None else self._dicionarios[2].indice(unidade))
+        valores.append(numero)
+        codigos.append(codigo)
+        instantes.append(instante)
+        if len(tokens) >= self.linhasPorBloco:
+            self.descarregaBloco()
+
+    def _indicesTokens(self, tokens, aceitos) -> array:
+        # Os índices de uma lista de tokens são guardados enquanto o arquivo (e seu dicionário) não mudar,
+        # pois FrotaSensores grava a mesma lista a cada passo.
+        chave = id(tokens)
+        encontrado = self._cacheTokens.get(chave)
+        if encontrado is None or encontrado[0] is not tokens:
+            if len(self._cacheTokens) >= 64:
+                self._cacheTokens.clear()
+            dicionario = self._dicionarios[0]
+            encontrado = self._cacheTokens[chave] = (tokens, array("I", [dicionario.indice(token) for token in tokens]))
+        return encontrado[1] if aceitos is None else array("I", compress(encontrado[1], aceitos))
+
+    def gravaLote(self, tokens, variavel: str, unidade: str, valores, instantes, aceitos=None, inteiros: bool = False,
+                  texto: str = None) -> None:
+        """
+        Grava várias leituras numéricas da mesma variável de uma vez (ex.: um Lote de geraLote ou FrotaSensores.passo).
+
+        Parâmetros
+        ----------
+            - tokens (str | list): O token de todas as leituras, ou um token por leitura.
+            - variavel (str): O nome da variável.
+            - unidade (str): A unidade, ou None.
+            - valores (Sequence[float]): Os valores (ex.: numpy.ndarray float64).
+            - instantes (Sequence[int]): Os timestamps em ns (ex.: numpy.ndarray int64).
+            - aceitos (Sequence[bool]): Se informado, só as leituras marcadas são gravadas
+                (requer arrays que aceitem indexação por máscara, como os do NumPy).
+                Padrão = None.
+            - inteiros (bool): Se os valores são inteiros (gravados e lidos como int).
+                Padrão = False.
+            - texto (str): Valor em texto lido no lugar dos números (ex.: "Movimentação").
+                Padrão = None.
+        """
+        if aceitos is not None:
+            valores, instantes = valores[aceitos], instantes[aceitos]
+        inicio = 0
+        total = len(valores)
+        geracao = None
+        while inicio < total:
+            if geracao != self._geracao and not isinstance(tokens, str):
+                # Recalculados se o arquivo rotacionou no meio do lote (o dicionário recomeça).
+                indices = self._indicesTokens(tokens, aceitos)
+                geracao = self._geracao
+            espaco = self.linhasPorBloco - len(self._colunas[0])
+            fim = min(total, inicio + espaco)
+            n = fim - inicio
+            colunaTokens, variaveis, unidades, colunaValores, codigos, colunaInstantes = self._colunas
+            if isinstance(tokens, str):
+                colunaTokens.extend(array("I", [self._dicionarios[0].indice(tokens)]) * n)
+            else:
+                colunaTokens.extend(indices[inicio:fim])
+            variaveis.extend(array("I", [self._dicionarios[1].indice(variavel)]) * n)
+            unidades.extend(array("i", [SEM_UNIDADE if unidade is None else self._dicionarios[2].indice(unidade)]) * n)
+            _estende(colunaValores, valores[inicio:fim])
+            codigo = self._dicionarios[3].indice(texto) if texto is not None else (INTEIRO if inteiros else REAL)
+            codigos.extend(array("i", [codigo]) * n)
+            _estende(colunaInstantes, instantes[inicio:fim])
+            inicio = fim
+            if len(colunaTokens) >= self.linhasPorBloco:
+                self.descarregaBloco()
+
+    def gravaFrota(self, frota, lotes: list) -> None:
+        """
+        Grava as leituras aceitas de um passo de uma FrotaSensores.
+
+        Parâmetros
+        ----------
+            - frota (FrotaSensores): A frota.
+            - lotes (list): O resultado de frota.passo(), um Lote por grupo.
+        """
+        for grupo, lote in zip(frota.grupos, lotes):
+            self.gravaLote(grupo.tokens, grupo.modelo.variavel, grupo.escala, lote.valores, lote.timestamps,
+                           aceitos=lote.aceitos, inteiros=grupo.modelo.casas is None, texto=grupo.modelo.texto)
+
+    def descarregaBloco(self) -> None:
+        """
+        Comprime e grava as leituras acumuladas como um bloco, rotacionando o arquivo se necessário.
+        """
+        linhas = len(self._colunas[0])
+        if linhas == 0:
+            return
+        if self._arquivo is None:
+            self._abre()
+        dicionario = zlib.compress(json.dumps([d.novos for d in self._dicionarios]).encode(), self.nivelCompressao)
+        colunas = [zlib.compress(coluna, self.nivelCompressao) for coluna in self._colunas]
+        self._arquivo.write(_CABECALHO_BLOCO.pack(ASSINATURA_BLOCO, linhas, len(dicionario), *map(len, colunas)))
+        self._arquivo.write(dicionario)
+        for coluna in colunas:
+            self._arquivo.write(coluna)
+        self.linhas += linhas
+        for d in self._dicionarios:
+            d.novos = []
+        self._colunas = [array(typecode) for _, typecode in COLUNAS]
+        if self._arquivo.tell() >= self.tamanhoMaximoArquivo:
+            self._novoArquivo()
+
+    def transporte(self, token: str, url: str = None) -> TransporteGravacao:
+        """
+        Fábrica de transporte para registraTransporte: os envios do dispositivo são gravados neste gravador.
+
+        Exemplo: registraTransporte("arquivo", gravador.transporte) e Termometro(token, transporte="arquivo").
+        """
+        return TransporteGravacao(self, token)
+
+    def fecha(self) -> None:
+        """
+        Grava o bloco pendente e fecha o arquivo atual.
+        """
+        with self.trava:
+            self.descarregaBloco()
+            if self._arquivo is not None:
+                self._arquivo.close()
+                self._arquivo = None
+
+    def __enter__(self) -> "GravadorColunar":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fecha()
+
+
+class Bloco(NamedTuple):
+    """
+    Um bloco lido de um arquivo colunar: uma coluna (array) por campo e os dicionários do arquivo.
+    """
+    tokens: array
+    variaveis: array
+    unidades: array
+    valores: array
+    codigos: array
+    instantes: array
+    dicionarios: tuple
+
+    @property
+    def linhas(self) -> int:
+        return len(self.tokens)
+
+    def registro(self, i: int) -> Leitura:
+        """
+        Monta a i-ésima leitura no formato do TagoIO ('time' em ns), sem o token.
+        """
+        tokens, variaveis, unidades, textos = self.dicionarios
+        codigo = self.codigos[i]
+        valor = textos[codigo] if codigo >= 0 else (int(self.valores[i]) if codigo == INTEIRO else self.valores[i])
+        unidade = unidades[self.unidades[i]] if self.unidades[i] != SEM_UNIDADE else None
+        return Leitura(variaveis[self.variaveis[i]], valor, unidade, self.instantes[i])
+
+    def token(self, i: int) -> str:
+        return self.dicionarios[0][self.tokens[i]]
+
+    def leituras(self):
+        """
+        Percorre as leituras do bloco em ordem, mais rápido que registro(i) para o bloco inteiro.
+
+        Retorna
+        -------
+            Iterator[tuple]: Pares (token, dados), com os dados no formato de registro(i).
+        """
+        tokens, variaveis, unidades, textos = self.dicionarios
+        for token, variavel, unidade, valor, codigo, instante in zip(
+                self.tokens.tolist(), self.variaveis.tolist(), self.unidades.tolist(),
+                self.valores.tolist(), self.codigos.tolist(), self.instantes.tolist()):
+            if codigo >= 0:
+                valor = textos[codigo]
+            elif codigo == INTEIRO:
+                valor = int(valor)
+            yield tokens[token], Leitura(variaveis[variavel], valor, unidades[unidade] if unidade != SEM_UNIDADE else None, instante)
+
+
+class LeitorColunar():
+    """
+    Lê um arquivo colunar bloco a bloco, por mapeamento em memória (mmap).
+
+    Só o bloco atual é descomprimido; o resto do arquivo fica no cache de páginas do sistema,
+    então arquivos de vários GB não são carregados na memória do processo.
+
+    Atributos
+    ---------
+        - caminho (str): O caminho do arquivo.
+    """
+
+    def __init__(self, caminho: str) -> None:
+        """
+        Abre e mapeia o arquivo.
+
+        Lança
+        -----
+            ValueError: Se o arquivo não estiver no formato colunar.
+        """
+        self.caminho = caminho
+        self._arquivo = open(caminho, "rb")
+        tamanho = os.fstat(self._arquivo.fileno()).st_size
+        if tamanho < _CABECALHO_ARQUIVO.size:
+            self._arquivo.close()
+            raise ValueError(f"Arquivo colunar inválido: {caminho}")
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        assinatura, versao, _ = _CABECALHO_ARQUIVO.unpack_from(self._mapa, 0)
+        if assinatura != ASSINATURA_ARQUIVO or versao != VERSAO:
+            self.fecha()
+            raise ValueError(f"Arquivo colunar inválido: {caminho}")
+
+    def _descomprime(self, inicio: int, tamanho: int) -> bytes:
+        with memoryview(self._mapa)[inicio:inicio + tamanho] as trecho:
+            return zlib.decompress(trecho)
+
+    def blocos(self):
+        """
+        Percorre os blocos do arquivo. Um bloco final incompleto (gravação interrompida) é ignorado.
+
+        Retorna
+        -------
+            Iterator[Bloco]: Os blocos, em ordem.
+        """
+        dicionarios = ([], [], [], [])
+        posicao = _CABECALHO_ARQUIVO.size
+        tamanhoArquivo = len(self._mapa)
+        while posicao + _CABECALHO_BLOCO.size <= tamanhoArquivo:
+            assinatura, linhas, tamanhoDicionario, *tamanhos = _CABECALHO_BLOCO.unpack_from(self._mapa, posicao)
+            posicao += _CABECALHO_BLOCO.size
+            if assinatura != ASSINATURA_BLOCO or posicao + tamanhoDicionario + sum(tamanhos) > tamanhoArquivo:
+                return
+            for dicionario, novos in zip(dicionarios, json.loads(self._descomprime(posicao, tamanhoDicionario))):
+                dicionario.extend(novos)
+            posicao += tamanhoDicionario
+            colunas = []
+            for (_, typecode), tamanho in zip(COLUNAS, tamanhos):
+                coluna = array(typecode)
+                coluna.frombytes(self._descomprime(posicao, tamanho))
+                colunas.append(coluna)
+                posicao += tamanho
+            yield Bloco(*colunas, dicionarios)
+
+    def fecha(self) -> None:
+        self._mapa.close()
+        self._arquivo.close()
+
+    def __enter__(self) -> "LeitorColunar":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fecha()
+
+
+def arquivosGravados(diretorio: str, prefixo: str = "leituras") -> list:
+    """
+    Lista, em ordem, os arquivos colunares de um diretório gravados com um prefixo.
+    """
+    return sorted(os.path.join(diretorio, nome) for nome in os.listdir(diretorio)
+                  if nome.startswith(prefixo + "-") and nome.endswith(EXTENSAO))
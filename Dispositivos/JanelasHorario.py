@@ -0,0 +1,123 @@
+from datetime import datetime, time, timedelta
+
+_UM_DIA = timedelta(days=1)
+
+
+def _nanossegundos(horario: datetime) -> int:
+    # Horário local (sem fuso) -> ns desde a época, com precisão de microssegundos.
+    return round(horario.timestamp() * 1_000_000) * 1000
+
+
+class JanelasHorario():
+    """
+    Janelas de horário diárias (no fuso local) em que algo está ativo, como a detecção de movimento.
+
+    Cada janela tem um início e uma duração e pode atravessar a meia-noite (ex.: das 22:00 às 02:00).
+    O trecho atual (ativo ou não) e o instante da próxima transição são calculados uma vez e
+    guardados, então ativa() é uma comparação de inteiros até a próxima transição.
+
+    Atributos
+    ---------
+        - janelas (list): Pares (início: datetime.time, duração: timedelta).
+    """
+
+    def __init__(self, janelas: list) -> None:
+        """
+        Inicializa as janelas.
+
+        Parâmetros
+        ----------
+            - janelas (list): Pares (início, fim) com início datetime.time e fim datetime.time
+                (se for anterior ao início, a janela termina no dia seguinte) ou timedelta (a duração).
+        """
+        self.janelas = []
+        for inicio, fim in janelas:
+            if not isinstance(fim, timedelta):
+                fim = (datetime.combine(datetime.min, fim) - datetime.combine(datetime.min, inicio)) % _UM_DIA
+            self.janelas.append((inicio, fim))
+        # (início, fim, ativa) do trecho atual; vazio até a primeira consulta.
+        self._trecho = (0, 0, False)
+
+    def trecho(self, instante: int) -> tuple:
+        """
+        Calcula o trecho (dentro ou fora das janelas) que contém um instante.
+
+        Parâmetros
+        ----------
+            - instante (int): O instante, em ns desde a época.
+
+        Retorna
+        -------
+            tuple: (início, fim, ativa), com início e fim do trecho em ns desde a época (fim exclusivo).
+        """
+        dia = datetime.fromtimestamp(instante / 1e9).date()
+        intervalos = sorted(
+            (_nanossegundos(comeco), _nanossegundos(comeco + duracao))
+            for d in (dia - _UM_DIA, dia, dia + _UM_DIA)
+            for inicio, duracao in self.janelas if duracao
+            for comeco in (datetime.combine(d, inicio),))
+        # Janelas sobrepostas (ou longas, de um dia para o outro) viram um único trecho ativo.
+        unidos = []
+        for comeco, fim in intervalos:
+            if unidos and comeco <= unidos[-1][1]:
+                unidos[-1][1] = max(unidos[-1][1], fim)
+            else:
+                unidos.append([comeco, fim])
+        anterior = _nanossegundos(datetime.combine(dia - _UM_DIA, time()))
+        for comeco, fim in unidos:
+            if instante < comeco:
+                return anterior, comeco, False
+            if instante < fim:
+                return comeco, fim, True
+            anterior = fim
+        return anterior, _nanossegundos(datetime.combine(dia + 2 * _UM_DIA, time())), False
+
+    def ativa(self, instante: int) -> bool:
+        """
+        Verifica se um instante está dentro de alguma janela.
+
+        Parâmetros
+        ----------
+            - instante (int): O instante, em ns desde a época.
+
+        Retorna
+        -------
+            bool: True se estiver dentro de uma janela, False caso contrário.
+        """
+        inicio, fim, ativa = self._trecho
+        if inicio <= instante < fim:
+            return ativa
+        self._trecho = self.trecho(instante)
+        return self._trecho[2]
+
+    def ativaEm(self, instantes):
+        """
+        Verifica vários instantes de uma vez (requer NumPy), com um cálculo por transição no intervalo.
+
+        Parâmetros
+        ----------
+            - instantes (numpy.ndarray): Os instantes, em ns desde a época (int64).
+
+        Retorna
+        -------
+            numpy.ndarray: True nos instantes dentro de alguma janela.
+        """
+        import numpy as np
+        instantes = np.asarray(instantes, dtype=np.int64)
+        if len(instantes) == 0:
+            return np.zeros(0, dtype=bool)
+        menor, maior = int(instantes.min()), int(instantes.max())
+        ativa = self.ativa(menor)
+        fim = self._trecho[1]
+        if maior < fim:
+            return np.full(len(instantes), ativa)
+        fins, estados = [fim], [ativa]
+        while fim <= maior:
+            _, fim, ativa = self.trecho(fim)
+            fins.append(fim)
+            estados.append(ativa)
+        return np.asarray(estados)[np.searchsorted(fins, instantes, side="right")]
+
+    def __repr__(self) -> str:
+        return "JanelasHorario([%s])" % ", ".join(
+            f"({inicio.isoformat()}, {duracao})" for inicio, duracao in self.janelas)
@@ -0,0 +1,176 @@
+import json
+from collections.abc import Mapping
+from Dispositivos.Tempo import formataDados, formataHorario
+
+CAMPOS = ("variable", "value", "unit", "time")
+
+_CAMPOS = frozenset(CAMPOS)
+
+# Acima disso, os fragmentos guardados pelo serializador são descartados (ex.: textos sempre diferentes).
+_LIMITE_FRAGMENTOS = 1024
+
+
+class Leitura(Mapping):
+    """
+    Uma leitura no formato do TagoIO, mais compacta que um dicionário (__slots__, sem tabela de chaves).
+
+    Pode ser lida como um dicionário (leitura['value'], leitura.get('unit'), dict(leitura)) e é igual
+    ao dicionário com os mesmos campos. 'unit' e 'time' em None são tratados como ausentes.
+
+    Atributos
+    ---------
+        - variable (str): O nome da variável.
+        - value: O valor medido.
+        - unit (str): A unidade, ou None.
+        - time (int): O timestamp em nanossegundos desde a época, ou None.
+    """
+
+    __slots__ = CAMPOS
+
+    def __init__(self, variable: str, value, unit: str = None, time: int = None) -> None:
+        self.variable = variable
+        self.value = value
+        self.unit = unit
+        self.time = time
+
+    def __getitem__(self, chave: str):
+        if chave == "variable":
+            return self.variable
+        if chave == "value":
+            return self.value
+        if chave == "unit" or chave == "time":
+            valor = getattr(self, chave)
+            if valor is not None:
+                return valor
+        raise KeyError(chave)
+
+    def __setitem__(self, chave: str, valor) -> None:
+        if chave not in _CAMPOS:
+            raise KeyError(chave)
+        setattr(self, chave, valor)
+
+    def get(self, chave: str, padrao=None):
+        try:
+            return self[chave]
+        except KeyError:
+            return padrao
+
+    def __iter__(self):
+        yield "variable"
+        yield "value"
+        if self.unit is not None:
+            yield "unit"
+        if self.time is not None:
+            yield "time"
+
+    def __len__(self) -> int:
+        return 2 + (self.unit is not None) + (self.time is not None)
+
+    def __repr__(self) -> str:
+        return f"Leitura({self.variable!r}, {self.value!r}, unit={self.unit!r}, time={self.time!r})"
+
+
+class SerializadorTagoIO():
+    """
+    Serializa registros para o corpo JSON do endpoint /data do TagoIO, com o mesmo resultado de
+    json.dumps(formataDados(dados)) (os campos saem sempre na ordem variable, value, unit, time).
+
+    O corpo é escrito em um bytearray reaproveitado entre chamadas. Os fragmentos constantes de
+    cada registro são codificados uma vez e guardados: o início ('{"variable": ..., "value": ')
+    por variável e o fim (', "unit": ..., "time": ...}') por unidade e segundo; por registro, só o
+    valor é codificado. Registros em outros formatos (campos extras, tipos não usuais) passam pelo json.dumps.
+
+    Um serializador por conexão: as constantes guardadas são as do dispositivo, e o corpo
+    retornado só é válido até a próxima chamada.
+    """
+
+    def __init__(self) -> None:
+        """
+        Inicializa o serializador, sem fragmentos guardados.
+        """
+        self._corpo = bytearray()
+        self._inicios = {}
+        self._fins = {}
+        self._textos = {}
+
+    @staticmethod
+    def _guarda(fragmentos: dict, chave, fragmento: str) -> bytes:
+        if len(fragmentos) >= _LIMITE_FRAGMENTOS:
+            fragmentos.clear()
+        fragmentos[chave] = fragmento = fragmento.encode()
+        return fragmento
+
+    def _fim(self, unidade: str, segundo: int) -> bytes:
+        fim = "" if unidade is None else ', "unit": ' + json.dumps(unidade)
+        if segundo is not None:
+            fim += ', "time": ' + json.dumps(formataHorario(segundo * 1_000_000_000))
+        return self._guarda(self._fins, (unidade, segundo), fim + "}, ")
+
+    @staticmethod
+    def _escreveGenerico(corpo: bytearray, registro) -> None:
+        # Formato não usual (campos extras, 'time' em texto, 'unit' nulo): json.dumps.
+        corpo += json.dumps(formataDados(registro)).encode()
+        corpo += b", "
+
+    def serializa(self, dados) -> bytearray:
+        """
+        Serializa um registro ou uma lista de registros.
+
+        Parâmetros
+        ----------
+            - dados (Leitura | dict | list): Um registro ou uma lista de registros no formato do TagoIO.
+                Timestamps inteiros (ns) no campo 'time' são formatados em texto.
+
+        Retorna
+        -------
+            bytearray: O corpo JSON, reaproveitado (e sobrescrito) na próxima chamada.
+        """
+        corpo = self._corpo
+        corpo.clear()
+        unico = isinstance(dados, Mapping)
+        if unico:
+            dados = (dados,)
+        else:
+            corpo += b"["
+        inicios, fins, textos = self._inicios, self._fins, self._textos
+        for registro in dados:
+            if registro.__class__ is Leitura:
+                variavel, valor, unidade, instante = registro.variable, registro.value, registro.unit, registro.time
+            elif (registro.__class__ is dict and registro.keys() <= _CAMPOS and "variable" in registro
+                  and "value" in registro and registro.get("unit", "") is not None):
+                variavel, valor = registro["variable"], registro["value"]
+                unidade, instante = registro.get("unit"), registro.get("time")
+            else:
+                self._escreveGenerico(corpo, registro)
+                continue
+            if instante is not None and instante.__class__ is not int:
+                self._escreveGenerico(corpo, registro)
+                continue
+            try:
+                corpo += inicios[variavel]
+            except KeyError:
+                corpo += self._guarda(inicios, variavel, '{"variable": %s, "value": ' % json.dumps(variavel))
+            tipo = valor.__class__
+            if tipo is float and valor - valor == 0.0:
+                # Finito: float.__repr__, como o json (NaN e infinitos ficam com o json.dumps abaixo).
+                corpo += b"%r" % valor
+            elif tipo is int:
+                corpo += b"%d" % valor
+            elif tipo is str:
+                try:
+                    corpo += textos[valor]
+                except KeyError:
+                    corpo += self._guarda(textos, valor, json.dumps(valor))
+            else:
+                corpo += json.dumps(valor).encode()
+            segundo = None if instante is None else instante // 1_000_000_000
+            try:
+                corpo += fins[unidade, segundo]
+            except KeyError:
+                corpo += self._fim(unidade, segundo)
+        # Tira o ", " depois do último registro.
+        if len(corpo) > 1:
+            del corpo[-2:]
+        if not unico:
+            corpo += b"]"
+        return corpo
@@ -0,0 +1,182 @@
+import threading
+import time
+
+
+class BaldeFichas():
+    """
+    Balde de fichas: guarda até capacidade fichas, repostas a taxa fichas por segundo; cada envio gasta uma.
+
+    Um envio sem ficha disponível a reserva mesmo assim (o saldo fica negativo) e recebe a espera
+    até ela ser reposta; os envios seguintes esperam depois dele, na ordem em que reservaram.
+    Com retira, um envio sem ficha é recusado sem gastá-la (como um servidor que responde HTTP 429,
+    ver ServidorSimulado).
+
+    Atributos
+    ---------
+        - taxa (float): As fichas repostas por segundo (o limite sustentado de envios/s).
+        - capacidade (float): A quantidade máxima de fichas (a rajada permitida).
+        - fichas (float): O saldo de fichas na última atualização (negativo com reservas pendentes).
+        - instante (float): O instante (time.monotonic) da última atualização, ou o fim de um bloqueio.
+    """
+
+    __slots__ = ("taxa", "capacidade", "fichas", "instante")
+
+    def __init__(self, taxa: float, capacidade: float, instante: float) -> None:
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.fichas = capacidade
+        self.instante = instante
+
+    def _repoe(self, instante: float) -> float:
+        # Repõe as fichas até o instante e retorna a espera até a próxima ficha (0 se houver uma).
+        if instante > self.instante:
+            self.fichas = min(self.capacidade, self.fichas + (instante - self.instante) * self.taxa)
+            self.instante = instante
+        espera = self.instante - instante
+        if self.fichas < 1:
+            espera += (1 - self.fichas) / self.taxa
+        return espera
+
+    def reserva(self, instante: float) -> float:
+        """
+        Gasta uma ficha e retorna os segundos até ela estar disponível (0 se já estiver).
+        """
+        espera = self._repoe(instante)
+        self.fichas -= 1
+        return espera
+
+    def retira(self, instante: float) -> float:
+        """
+        Gasta uma ficha se houver uma disponível; senão, não gasta e retorna os segundos até a próxima.
+
+        Retorna
+        -------
+            float: 0 se a ficha foi gasta, ou a espera em segundos.
+        """
+        espera = self._repoe(instante)
+        if espera <= 0:
+            self.fichas -= 1
+        return espera
+
+    def esvazia(self, ate: float) -> None:
+        """
+        Zera as fichas e só volta a repô-las a partir de um instante (ex.: o fim de um Retry-After).
+        """
+        self.fichas = 0.0
+        self.instante = max(self.instante, ate)
+
+
+class LimitadorEnvio():
+    """
+    Limita a taxa de envios ao TagoIO com um balde de fichas por token de dispositivo e um global.
+
+    Um único limitador é compartilhado pelos dispositivos (parâmetro limitador de Dispositivo):
+    antes de cada requisição o dispositivo reserva uma ficha do seu token e uma do balde global.
+    Sem fichas disponíveis, o envio não falha: ele espera a vez reservada, as leituras continuam
+    na fila do dispositivo e saem juntas, em uma única requisição, nessa vez. As vezes seguem a
+    ordem das reservas, então nenhum dispositivo fica sem enviar quando o limite global aperta, e
+    a vazão fica no limite permitido em vez de gerar respostas HTTP 429. Um HTTP 429 recebido mesmo assim esvazia o balde do token até o
+    fim do Retry-After (ver penaliza).
+
+    Os baldes são protegidos por uma trava, então o limitador pode ser usado por várias threads
+    (ver ExecutorEnvio). Em EscalonadorParalelo cada processo recebe uma cópia, com os baldes
+    cheios: divida taxaGlobal pela quantidade de processos.
+
+    Atributos
+    ---------
+        - taxaPorToken (float): Envios/s permitidos a cada token, ou None (sem limite por token).
+        - rajadaPorToken (float): Os envios seguidos permitidos a um token antes do limite.
+        - taxaGlobal (float): Envios/s permitidos a todos os tokens juntos, ou None (sem limite global).
+        - rajadaGlobal (float): Os envios seguidos permitidos a todos antes do limite global.
+    """
+
+    def __init__(self, taxaPorToken: float = None, rajadaPorToken: float = None, taxaGlobal: float = None,
+                 rajadaGlobal: float = None) -> None:
+        """
+        Inicializa o limitador.
+
+        Parâmetros
+        ----------
+            - taxaPorToken (float): Envios/s permitidos a cada token.
+                Padrão = None (sem limite por token).
+            - rajadaPorToken (float): Os envios seguidos permitidos a um token antes do limite.
+                Padrão = None (um segundo de envios, no mínimo 1).
+            - taxaGlobal (float): Envios/s permitidos a todos os tokens juntos.
+                Padrão = None (sem limite global).
+            - rajadaGlobal (float): Os envios seguidos permitidos a todos antes do limite global.
+                Padrão = None (um segundo de envios, no mínimo 1).
+
+        Lança
+        -----
+            ValueError: Se alguma taxa não for positiva.
+        """
+        for taxa in (taxaPorToken, taxaGlobal):
+            if taxa is not None and taxa <= 0:
+                raise ValueError(f"Taxa de envios inválida: {taxa}")
+        self.taxaPorToken = taxaPorToken
+        self.rajadaPorToken = rajadaPorToken or max(1.0, taxaPorToken or 1.0)
+        self.taxaGlobal = taxaGlobal
+        self.rajadaGlobal = rajadaGlobal or max(1.0, taxaGlobal or 1.0)
+        self._trava = threading.Lock()
+        self._iniciaBaldes()
+
+    def _iniciaBaldes(self) -> None:
+        self._baldes = {}
+        self._global = None if self.taxaGlobal is None else BaldeFichas(self.taxaGlobal, self.rajadaGlobal, time.monotonic())
+
+    def __getstate__(self) -> dict:
+        # A trava não passa entre processos; a cópia recomeça com os baldes cheios.
+        estado = self.__dict__.copy()
+        del estado["_trava"], estado["_baldes"], estado["_global"]
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        self.__dict__.update(estado)
+        self._trava = threading.Lock()
+        self._iniciaBaldes()
+
+    def _balde(self, token: str, instante: float) -> BaldeFichas:
+        balde = self._baldes.get(token)
+        if balde is None:
+            balde = self._baldes[token] = BaldeFichas(self.taxaPorToken, self.rajadaPorToken, instante)
+        return balde
+
+    def reserva(self, token: str) -> float:
+        """
+        Reserva a vez de uma requisição do token (uma ficha do token e uma global).
+
+        Parâmetros
+        ----------
+            - token (str): O token do dispositivo.
+
+        Retorna
+        -------
+            float: Os segundos até a vez reservada; 0 se a requisição pode sair agora.
+        """
+        with self._trava:
+            instante = time.monotonic()
+            espera = 0.0
+            if self.taxaPorToken is not None:
+                espera = self._balde(token, instante).reserva(instante)
+            if self._global is not None:
+                espera = max(espera, self._global.reserva(instante))
+            return espera
+
+    def penaliza(self, token: str, segundos: float) -> None:
+        """
+        Registra um HTTP 429 do token: o balde dele fica vazio até o fim do Retry-After
+        (as reservas seguintes do token começam depois dele).
+
+        Parâmetros
+        ----------
+            - token (str): O token do dispositivo.
+            - segundos (float): O Retry-After recebido, em segundos.
+        """
+        if self.taxaPorToken is None:
+            return
+        with self._trava:
+            instante = time.monotonic()
+            self._balde(token, instante).esvazia(instante + segundos)
+
+    def __repr__(self) -> str:
+        return f"LimitadorEnvio(taxaPorToken={self.taxaPorToken}, taxaGlobal={self.taxaGlobal})"
@@ -0,0 +1,355 @@
+"""
+Geração vetorizada (NumPy) de leituras simuladas dos sensores.
+
+Reproduz em arrays a mesma lógica de geraDados/criaOutlier/outlier de cada sensor:
+passeio aleatório, injeção de outliers e as regras de descarte/reinício de cada classe
+(as regras do tipo, avaliadas com RegrasOutlier.verificaArray; ver Dispositivos.Outliers).
+Regras com janela só podem ser usadas em FrotaSensores, que guarda o estado de cada sensor.
+Dois modos são oferecidos:
+
+    - geraLote: n leituras consecutivas de um único dispositivo;
+    - geraLoteFrota: uma leitura de cada um de M dispositivos em um único passo.
+
+Com a mesma semente, os resultados são idênticos bit a bit.
+
+O passeio de um único dispositivo é sequencial (cada leitura parte do último valor aceito),
+então geraLote calcula de forma vetorizada uma janela de leituras supondo o desfecho
+típico de cada passo (leitura normal aceita, outlier descartado ou reiniciado), confere a
+suposição aplicando as regras reais do sensor a toda a janela de uma vez e só recalcula a
+partir do primeiro passo em que a suposição falhou.
+"""
+from typing import Callable, NamedTuple
+import numpy as np
+from Dispositivos.Outliers import ACEITO, MANTIDO, REINICIADO, regrasDoTipo
+from Dispositivos.Tempo import agora
+
+
+class Lote(NamedTuple):
+    """
+    Leituras geradas de forma vetorizada.
+
+    Atributos
+    ---------
+        - valores (numpy.ndarray): Os valores medidos, arredondados como em geraDados.
+            Nas leituras descartadas, contém o valor que o sensor passou a ter.
+        - aceitos (numpy.ndarray): True nas leituras que geraDados retornaria, False nas que lançariam Outlier.
+        - timestamps (numpy.ndarray): O instante de cada leitura, em nanossegundos desde a época (int64).
+    """
+    valores: np.ndarray
+    aceitos: np.ndarray
+    timestamps: np.ndarray
+
+
+class _Modelo(NamedTuple):
+    variavel: str
+    atributoValor: str
+    atributoTimestamp: str
+    suposicaoOutlier: int
+    casas: int
+    parametros: tuple
+    inicial: Callable
+    sorteia: Callable
+    passo: Callable
+    # Valor enviado no lugar do número (o número vira só o estado do sensor).
+    texto: str = None
+    # Monta, a partir dos parâmetros do sensor, os que valem para o grupo inteiro (não um por sensor).
+    compartilhados: Callable = None
+
+
+def _sorteioUniforme(amplitude: float, chanceMaxima: int, pico: float, reinicio: tuple) -> Callable:
+    def sorteia(rng: np.random.Generator, n: int, p: dict) -> tuple:
+        diferenca = rng.uniform(-amplitude, amplitude, n)
+        picos = rng.integers(0, chanceMaxima + 1, n) <= p["chanceOutlier"]
+        valoresReinicio = rng.uniform(reinicio[0], reinicio[1], n) if reinicio else np.zeros(n)
+        return diferenca, np.where(picos, pico, 0.0), picos, valoresReinicio
+    return sorteia
+
+
+def _passoRegras(tipo: str) -> Callable:
+    # Aplica as regras de outlier do tipo (ou as do grupo da frota, com o estado das janelas).
+    def passo(atual, tsAtual, medido, ts, reinicio, p):
+        regras = p.get("regrasOutlier") or regrasDoTipo(tipo)
+        estado = p.get("estadoOutlier")
+        codigo = regras.verificaArray(medido, ts, atual, tsAtual, p, estado)
+        mantido = codigo == MANTIDO
+        novo = np.where(mantido, atual, np.where(codigo == REINICIADO, reinicio, medido))
+        if estado is not None:
+            regras.aceitaArray(medido, codigo == ACEITO, estado)
+        return novo, np.where(mantido, tsAtual, ts), codigo
+    return passo
+
+
+def _sorteiaAgua(rng: np.random.Generator, n: int, p: dict) -> tuple:
+    diferenca = rng.integers(-5, 6, n)
+    picos = rng.integers(0, 101, n) <= p["chanceOutlier"]
+    return diferenca, np.where(picos, p["nivelMaximo"] + 1, 0), picos, np.broadcast_to(p["nivelMaximo"] // 2, (n,))
+
+
+def _sorteiaMovimento(rng: np.random.Generator, n: int, p: dict) -> tuple:
+    # O valor é a contagem de movimentações: diferença 1 quando o sorteio detecta movimento.
+    movimento = rng.integers(0, 101, n) <= p["chanceMovimento"]
+    zeros = np.zeros(n)
+    return movimento.astype(np.float64), zeros, ~movimento, zeros
+
+
+def _passoMovimento(atual, tsAtual, medido, ts, reinicio, p):
+    janelas = p["janelas"]
+    if isinstance(janelas, np.ndarray):
+        # Um JanelasHorario por sensor (geraLoteFrota): calculado por objeto distinto.
+        ativas = np.zeros(len(janelas), dtype=bool)
+        for objeto in {id(j): j for j in janelas.tolist()}.values():
+            membros = janelas == objeto
+            ativas[membros] = objeto.ativaEm(ts[membros])
+    else:
+        ativas = janelas.ativaEm(ts)
+    detectado = (medido > atual) & ativas
+    return (np.where(detectado, medido, atual), np.where(detectado, ts, tsAtual),
+            np.where(detectado, ACEITO, MANTIDO).astype(np.int8))
+
+
+def _janelasMovimento(p: dict) -> dict:
+    from Dispositivos.SensorMovimento import janelasMovimento
+    return {"janelas": janelasMovimento(p.get("janelas"), p["horarioInicial"], p["diferencaTempoFinal"])}
+
+
+def _inicialUniforme(minimo: float, maximo: float) -> Callable:
+    return lambda rng, n, p: rng.uniform(minimo, maximo, n)
+
+
+def _inicialTermometro(rng: np.random.Generator, n: int, p: dict) -> np.ndarray:
+    if p.get("escala") == "F":
+        return rng.uniform(64, 75, n)
+    return rng.uniform(18.0, 24.0, n)
+
+
+_MODELOS = {
+    "Termometro": _Modelo(
+        "Temperatura", "temperaturaAtual", "timestampTemperaturaAtual", MANTIDO, 2,
+        ("chanceOutlier", "temperaturaLimite"),
+        _inicialTermometro, _sorteioUniforme(1, 100, 100.0, None), _passoRegras("Termometro")),
+    "SensorAgua": _Modelo(
+        "NivelAgua", "nivelAtual", "timestampNivelAtual", MANTIDO, None,
+        ("chanceOutlier", "nivelMaximo"),
+        lambda rng, n, p: rng.integers(0, p["nivelMaximo"] + 1, n), _sorteiaAgua, _passoRegras("SensorAgua")),
+    "SensorUmidade": _Modelo(
+        "Umidade", "umidadeAtual", "timestampUmidadeAtual", REINICIADO, 2,
+        ("chanceOutlier",),
+        _inicialUniforme(10, 90), _sorteioUniforme(2, 100, 100.0, (10, 90)), _passoRegras("SensorUmidade")),
+    "SensorLuminosidade": _Modelo(
+        "luminosidade", "luminosidadeAtual", "timestampLuminosidadeAtual", ACEITO, 2,
+        ("chanceOutlier",),
+        _inicialUniforme(10, 90), _sorteioUniforme(2, 100000, 100.0, (10, 99990)), _passoRegras("SensorLuminosidade")),
+    "SensorSom": _Modelo(
+        "som", "somAtual", "timestampSomAtual", REINICIADO, 2,
+        ("chanceOutlier",),
+        _inicialUniforme(10, 90), _sorteioUniforme(2, 80, 100.0, (10, 80)), _passoRegras("SensorSom")),
+    "SensorPressao": _Modelo(
+        "pressao", "pressaoAtual", "timestampPressaoAtual", REINICIADO, 2,
+        ("chanceOutlier",),
+        _inicialUniforme(10, 40), _sorteioUniforme(2, 40, 100.0, (10, 40)), _passoRegras("SensorPressao")),
+    "SensorMovimento": _Modelo(
+        "Movimento", "movimentos", "timestampUltimoMovimento", MANTIDO, None,
+        ("chanceMovimento",),
+        lambda rng, n, p: np.zeros(n), _sorteiaMovimento, _passoMovimento,
+        texto="Movimentação", compartilhados=_janelasMovimento),
+}
+
+
+def modeloDaClasse(classe: type) -> _Modelo:
+    """
+    Retorna o modelo vetorizado de uma classe de sensor (ou de uma classe derivada dela).
+
+    Lança
+    -----
+        TypeError: Se a classe não suportar geração vetorizada.
+    """
+    for base in classe.__mro__:
+        if base.__name__ in _MODELOS:
+            return _MODELOS[base.__name__]
+    raise TypeError(f"{classe.__name__} não suporta geração vetorizada")
+
+
+def _modelo(dispositivo) -> _Modelo:
+    return modeloDaClasse(type(dispositivo))
+
+
+def passoVetorizado(modelo: _Modelo, rng: np.random.Generator, atual: np.ndarray, tsAtual: np.ndarray,
+                    ts: np.ndarray, parametros: dict) -> tuple:
+    """
+    Calcula uma leitura de cada sensor de um grupo da mesma classe.
+
+    Parâmetros
+    ----------
+        - modelo: O modelo da classe (ver modeloDaClasse).
+        - rng (numpy.random.Generator): O gerador de números aleatórios.
+        - atual (numpy.ndarray): O valor atual de cada sensor.
+        - tsAtual (numpy.ndarray): O timestamp (ns) da última medição de cada sensor.
+        - ts (numpy.ndarray): O timestamp (ns) das novas leituras.
+        - parametros (dict): Os parâmetros do modelo, escalares ou um array por sensor.
+
+    Retorna
+    -------
+        tuple: (novo valor, novo timestamp, código do desfecho: ACEITO, MANTIDO ou REINICIADO).
+    """
+    m = len(atual)
+    diferenca, adicional, picos, reinicio = modelo.sorteia(rng, m, parametros)
+    novo, tsNovo, codigo = modelo.passo(atual, tsAtual, atual + diferenca + adicional, ts, reinicio, parametros)
+    return novo, np.broadcast_to(tsNovo, (m,)), codigo
+
+
+def _parametros(modelo: _Modelo, dispositivo) -> dict:
+    parametros = {nome: getattr(dispositivo, nome) for nome in modelo.parametros}
+    if modelo.compartilhados is not None:
+        parametros.update(modelo.compartilhados(vars(dispositivo)))
+    return parametros
+
+
+def _geradorAleatorio(semente) -> np.random.Generator:
+    if isinstance(semente, np.random.Generator):
+        return semente
+    return np.random.default_rng(semente)
+
+
+def _arredonda(valores: np.ndarray, casas: int) -> np.ndarray:
+    return valores if casas is None else np.round(valores, casas)
+
+
+def _suposicao(modelo: _Modelo, atual, tsAtual, diferenca, adicional, picos, reinicio, ts) -> tuple:
+    n = len(diferenca)
+    indices = np.arange(n)
+    if modelo.suposicaoOutlier == ACEITO:
+        estados = np.cumsum(np.concatenate(([atual], diferenca + adicional)))[1:]
+        tsEstados = ts
+    elif modelo.suposicaoOutlier == MANTIDO:
+        estados = np.cumsum(np.concatenate(([atual], np.where(picos, 0, diferenca))))[1:]
+        ultimoAceito = np.maximum.accumulate(np.where(picos, -1, indices))
+        tsEstados = np.where(ultimoAceito >= 0, ts[np.maximum(ultimoAceito, 0)], tsAtual)
+    else:
+        acumulado = np.cumsum(np.where(picos, 0, diferenca))
+        ultimoPico = np.maximum.accumulate(np.where(picos, indices, -1))
+        base = np.where(ultimoPico >= 0,
+                        reinicio[np.maximum(ultimoPico, 0)] - acumulado[np.maximum(ultimoPico, 0)],
+                        atual)
+        estados = base + acumulado
+        tsEstados = ts
+    codigos = np.where(picos, modelo.suposicaoOutlier, ACEITO).astype(np.int8)
+    return estados, tsEstados, codigos
+
+
+def geraLote(dispositivo, n: int, intervalo: float = 30, inicio: int = None, semente=None) -> Lote:
+    """
+    Gera n leituras consecutivas de um dispositivo de forma vetorizada.
+
+    Equivale a chamar geraDados n vezes com as leituras espaçadas de intervalo segundos,
+    e ao final o estado do dispositivo (valor e timestamp atuais) é atualizado da mesma forma.
+
+    Parâmetros
+    ----------
+        - dispositivo (Dispositivo): O sensor a ser simulado.
+        - n (int): A quantidade de leituras.
+        - intervalo (float): O intervalo em segundos entre leituras.
+            Padrão = 30.
+        - inicio (int): O instante de referência, em ns desde a época; a primeira leitura ocorre um intervalo depois.
+            Padrão = None (timestamp da última medição do dispositivo).
+        - semente (int | numpy.random.Generator): A semente (ou gerador) dos números aleatórios.
+            Padrão = None (semente tirada do fluxo aleatório do dispositivo, reproduzível com a semente da frota).
+
+    Retorna
+    -------
+        Lote: Os valores, a indicação de leituras aceitas e os timestamps.
+
+    Lança
+    -----
+        TypeError: Se o dispositivo não suportar geração vetorizada.
+    """
+    modelo = _modelo(dispositivo)
+    rng = _geradorAleatorio(dispositivo.aleatorio.inteiro64() if semente is None else semente)
+    parametros = _parametros(modelo, dispositivo)
+    diferenca, adicional, picos, reinicio = modelo.sorteia(rng, n, parametros)
+    atual = getattr(dispositivo, modelo.atributoValor)
+    tsAtual = getattr(dispositivo, modelo.atributoTimestamp)
+    referencia = tsAtual if inicio is None else inicio
+    ts = referencia + np.arange(1, n + 1, dtype=np.int64) * round(intervalo * 1e9)
+
+    estados = np.empty(n, dtype=np.result_type(diferenca, adicional, reinicio))
+    tsEstados = np.empty(n, dtype=np.int64)
+    codigos = np.empty(n, dtype=np.int8)
+    inicioJanela = 0
+    janela = 1024
+    while inicioJanela < n:
+        fim = min(n, inicioJanela + janela)
+        trecho = slice(inicioJanela, fim)
+        suposto, tsSuposto, codigoSuposto = _suposicao(
+            modelo, atual, tsAtual, diferenca[trecho], adicional[trecho], picos[trecho], reinicio[trecho], ts[trecho])
+        anterior = np.concatenate(([atual], suposto[:-1]))
+        tsAnterior = np.concatenate(([tsAtual], tsSuposto[:-1]))
+        real, tsReal, codigoReal = modelo.passo(
+            anterior, tsAnterior, anterior + diferenca[trecho] + adicional[trecho], ts[trecho], reinicio[trecho], parametros)
+        divergencias = np.flatnonzero(codigoReal != codigoSuposto)
+        if len(divergencias) == 0:
+            estados[trecho], tsEstados[trecho], codigos[trecho] = suposto, tsSuposto, codigoSuposto
+            janela = min(janela * 2, 1 << 16)
+            inicioJanela = fim
+        else:
+            k = divergencias[0]
+            fimConfirmado = inicioJanela + k
+            estados[inicioJanela:fimConfirmado] = suposto[:k]
+            tsEstados[inicioJanela:fimConfirmado] = tsSuposto[:k]
+            codigos[inicioJanela:fimConfirmado] = codigoSuposto[:k]
+            estados[fimConfirmado], tsEstados[fimConfirmado], codigos[fimConfirmado] = real[k], tsReal[k], codigoReal[k]
+            janela = max(64, janela // 2)
+            inicioJanela = fimConfirmado + 1
+        atual, tsAtual = estados[inicioJanela - 1], tsEstados[inicioJanela - 1]
+
+    if n:
+        setattr(dispositivo, modelo.atributoValor, estados[-1].item())
+        setattr(dispositivo, modelo.atributoTimestamp, int(tsEstados[-1]))
+    return Lote(_arredonda(estados, modelo.casas), codigos == ACEITO, ts)
+
+
+def geraLoteFrota(dispositivos: list, instante: int = None, semente=None) -> Lote:
+    """
+    Gera uma leitura para cada dispositivo de uma lista em um único passo vetorizado.
+
+    Os dispositivos são agrupados por classe e cada grupo é calculado de uma vez, com os
+    parâmetros (chanceOutlier, limites) de cada dispositivo. O estado de cada dispositivo
+    é atualizado como em geraDados.
+
+    Parâmetros
+    ----------
+        - dispositivos (list): Os sensores a serem simulados (de qualquer classe suportada).
+        - instante (int): O instante das leituras, em ns desde a época.
+            Padrão = None (agora).
+        - semente (int | numpy.random.Generator): A semente (ou gerador) dos números aleatórios.
+            Padrão = None (semente aleatória).
+
+    Retorna
+    -------
+        Lote: Uma leitura por dispositivo, na mesma ordem da lista.
+
+    Lança
+    -----
+        TypeError: Se algum dispositivo não suportar geração vetorizada.
+    """
+    rng = _geradorAleatorio(semente)
+    ts = agora() if instante is None else instante
+    grupos = {}
+    for indice, dispositivo in enumerate(dispositivos):
+        grupos.setdefault(_modelo(dispositivo), []).append(indice)
+
+    valores = np.empty(len(dispositivos), dtype=np.float64)
+    codigos = np.empty(len(dispositivos), dtype=np.int8)
+    for modelo, indices in grupos.items():
+        membros = [dispositivos[i] for i in indices]
+        m = len(membros)
+        listas = [_parametros(modelo, d) for d in membros]
+        parametros = {chave: np.array([p[chave] for p in listas]) for chave in listas[0]}
+        atual = np.array([getattr(d, modelo.atributoValor) for d in membros])
+        tsAtual = np.array([getattr(d, modelo.atributoTimestamp) for d in membros], dtype=np.int64)
+        novo, tsNovo, codigo = passoVetorizado(modelo, rng, atual, tsAtual, np.full(m, ts, dtype=np.int64), parametros)
+        for d, valor, t in zip(membros, novo.tolist(), tsNovo.tolist()):
+            setattr(d, modelo.atributoValor, valor)
+            setattr(d, modelo.atributoTimestamp, t)
+        valores[indices] = _arredonda(novo, modelo.casas)
+        codigos[indices] = codigo
+    return Lote(valores, codigos == ACEITO, np.full(len(dispositivos), ts, dtype=np.int64))
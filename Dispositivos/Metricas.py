@@ -0,0 +1,280 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+LIMITES_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histograma():
+    """
+    Histograma de latências com faixas fixas (em segundos).
+
+    Atributos
+    ---------
+        - limites (tuple): O limite superior de cada faixa; a última faixa (+Inf) é implícita.
+        - contagens (list): A quantidade de amostras em cada faixa.
+        - soma (float): A soma de todas as amostras.
+        - total (int): A quantidade de amostras.
+    """
+
+    def __init__(self, limites: tuple = LIMITES_LATENCIA) -> None:
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def registra(self, valor: float) -> None:
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+    def percentil(self, p: float) -> float:
+        """
+        Estima um percentil por interpolação linear dentro da faixa que o contém.
+
+        Parâmetros
+        ----------
+            - p (float): O percentil entre 0 e 1 (ex.: 0.99).
+
+        Retorna
+        -------
+            float: A latência estimada em segundos, ou None se não houver amostras.
+        """
+        if self.total == 0:
+            return None
+        alvo = p * self.total
+        acumulado = 0
+        for i, contagem in enumerate(self.contagens):
+            if contagem and acumulado + contagem >= alvo:
+                inferior = self.limites[i - 1] if i > 0 else 0.0
+                if i == len(self.limites):
+                    return inferior
+                return inferior + (self.limites[i] - inferior) * (alvo - acumulado) / contagem
+            acumulado += contagem
+        return self.limites[-1]
+
+
+class RegistroMetricas():
+    """
+    Registro em memória de contadores, medidores e histogramas de latência por tipo de dispositivo.
+
+    No caminho crítico, registrar uma métrica custa apenas um incremento sob uma trava;
+    a formatação (Prometheus ou JSON) só acontece quando um ExportadorMetricas lê o registro.
+
+    Métricas usadas pelo projeto (rótulo "tipo" = nome da classe do dispositivo):
+        - leituras: leituras geradas; outliers: leituras descartadas por outlier;
+        - erros: leituras que falharam com outro erro (ver Dispositivo.coleta);
+        - envios_sucesso / envios_falha: requisições ao TagoIO;
+        - fila_profundidade: itens aguardando envio (fila + reenvio);
+        - latencia_envio: duração das requisições, em segundos.
+    """
+
+    def __init__(self) -> None:
+        self._trava = threading.Lock()
+        self.contadores = {}
+        self.medidores = {}
+        self.histogramas = {}
+
+    def incrementa(self, nome: str, tipo: str, quantidade: int = 1) -> None:
+        """
+        Soma uma quantidade a um contador.
+        """
+        chave = (nome, tipo)
+        with self._trava:
+            self.contadores[chave] = self.contadores.get(chave, 0) + quantidade
+
+    def define(self, nome: str, tipo: str, valor: float) -> None:
+        """
+        Define o valor atual de um medidor (ex.: profundidade da fila).
+        """
+        with self._trava:
+            self.medidores[(nome, tipo)] = valor
+
+    def ajusta(self, nome: str, tipo: str, variacao: float) -> None:
+        """
+        Soma uma variação (positiva ou negativa) a um medidor compartilhado por vários dispositivos.
+        """
+        chave = (nome, tipo)
+        with self._trava:
+            self.medidores[chave] = self.medidores.get(chave, 0) + variacao
+
+    def registraLatencia(self, nome: str, tipo: str, segundos: float) -> None:
+        """
+        Registra uma amostra de latência, em segundos, no histograma correspondente.
+        """
+        chave = (nome, tipo)
+        with self._trava:
+            histograma = self.histogramas.get(chave)
+            if histograma is None:
+                histograma = self.histogramas[chave] = Histograma()
+            histograma.registra(segundos)
+
+    def instantaneo(self) -> dict:
+        """
+        Retorna uma cópia consistente de todas as métricas.
+
+        Retorna
+        -------
+            dict: {tipo: {métrica: valor}}, com p50/p99, total e soma para cada histograma.
+        """
+        with self._trava:
+            resultado = {}
+            for (nome, tipo), valor in list(self.contadores.items()) + list(self.medidores.items()):
+                resultado.setdefault(tipo, {})[nome] = valor
+            for (nome, tipo), histograma in self.histogramas.items():
+                resultado.setdefault(tipo, {})[nome] = {
+                    "p50": histograma.percentil(0.5),
+                    "p99": histograma.percentil(0.99),
+                    "total": histograma.total,
+                    "soma": histograma.soma,
+                }
+            return resultado
+
+    def paraPrometheus(self, prefixo: str = "iot") -> str:
+        """
+        Formata as métricas no formato de texto do Prometheus.
+
+        Parâmetros
+        ----------
+            - prefixo (str): O prefixo dos nomes das métricas.
+                Padrão = "iot".
+
+        Retorna
+        -------
+            str: O texto no formato de exposição do Prometheus.
+        """
+        with self._trava:
+            contadores = sorted(self.contadores.items())
+            medidores = sorted(self.medidores.items())
+            histogramas = [(chave, list(h.contagens), h.soma, h.total, h.limites, h.percentil(0.5), h.percentil(0.99))
+                           for chave, h in sorted(self.histogramas.items())]
+        linhas = []
+        quantis = []
+        tipos = set()
+        for (nome, tipo), valor in contadores:
+            metrica = f"{prefixo}_{nome}_total"
+            if metrica not in tipos:
+                tipos.add(metrica)
+                linhas.append(f"# TYPE {metrica} counter")
+            linhas.append(f'{metrica}{{tipo="{tipo}"}} {valor}')
+        for (nome, tipo), valor in medidores:
+            metrica = f"{prefixo}_{nome}"
+            if metrica not in tipos:
+                tipos.add(metrica)
+                linhas.append(f"# TYPE {metrica} gauge")
+            linhas.append(f'{metrica}{{tipo="{tipo}"}} {valor}')
+        for (nome, tipo), contagens, soma, total, limites, p50, p99 in histogramas:
+            metrica = f"{prefixo}_{nome}_segundos"
+            if metrica not in tipos:
+                tipos.add(metrica)
+                linhas.append(f"# TYPE {metrica} histogram")
+            acumulado = 0
+            for limite, contagem in zip(limites, contagens):
+                acumulado += contagem
+                linhas.append(f'{metrica}_bucket{{tipo="{tipo}",le="{limite}"}} {acumulado}')
+            linhas.append(f'{metrica}_bucket{{tipo="{tipo}",le="+Inf"}} {total}')
+            linhas.append(f'{metrica}_sum{{tipo="{tipo}"}} {soma}')
+            linhas.append(f'{metrica}_count{{tipo="{tipo}"}} {total}')
+            # Os percentis não fazem parte do histograma: vão em uma família gauge à parte, depois de todos eles.
+            quantil = f"{metrica}_quantil"
+            for q, valor in (("0.5", p50), ("0.99", p99)):
+                if valor is None:
+                    continue
+                if quantil not in tipos:
+                    tipos.add(quantil)
+                    quantis.append(f"# TYPE {quantil} gauge")
+                quantis.append(f'{quantil}{{tipo="{tipo}",quantil="{q}"}} {valor}')
+        return "\n".join(linhas + quantis) + "\n"
+
+    def paraJson(self) -> str:
+        """
+        Formata as métricas como uma linha JSON, com o instante da coleta.
+
+        Retorna
+        -------
+            str: Um objeto JSON {"instante": ..., "metricas": {...}} em uma única linha.
+        """
+        return json.dumps({"instante": time.time(), "metricas": self.instantaneo()}, ensure_ascii=False)
+
+
+registro = RegistroMetricas()
+
+
+class ExportadorMetricas():
+    """
+    Grava periodicamente o conteúdo de um RegistroMetricas em arquivo, em uma thread própria.
+
+    No formato "prometheus" o arquivo é substituído a cada gravação (compatível com o
+    textfile collector do node_exporter); no formato "jsonl" uma linha é acrescentada por gravação.
+
+    Atributos
+    ---------
+        - registro (RegistroMetricas): O registro exportado.
+        - caminho (str): O arquivo de destino.
+        - formato (str): "prometheus" ou "jsonl".
+        - intervalo (float): O intervalo em segundos entre gravações.
+    """
+
+    def __init__(self, caminho: str, formato: str = "prometheus", intervalo: float = 10,
+                 registro: RegistroMetricas = registro) -> None:
+        """
+        Inicializa o exportador (a thread só começa em inicia()).
+
+        Parâmetros
+        ----------
+            - caminho (str): O arquivo de destino.
+            - formato (str): "prometheus" ou "jsonl".
+                Padrão = "prometheus".
+            - intervalo (float): O intervalo em segundos entre gravações.
+                Padrão = 10.
+            - registro (RegistroMetricas): O registro exportado.
+                Padrão = o registro global do módulo.
+
+        Lança
+        -----
+            ValueError: Se o formato não for suportado.
+        """
+        if formato not in ("prometheus", "jsonl"):
+            raise ValueError(f"Formato de métricas desconhecido: {formato}")
+        self.caminho = caminho
+        self.formato = formato
+        self.intervalo = intervalo
+        self.registro = registro
+        self._parar = threading.Event()
+        self._thread = None
+
+    def grava(self) -> None:
+        """
+        Grava imediatamente as métricas no arquivo de destino.
+        """
+        if self.formato == "prometheus":
+            temporario = self.caminho + ".tmp"
+            with open(temporario, "w") as arquivo:
+                arquivo.write(self.registro.paraPrometheus())
+            os.replace(temporario, self.caminho)
+        else:
+            with open(self.caminho, "a") as arquivo:
+                arquivo.write(self.registro.paraJson() + "\n")
+
+    def _executa(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            self.grava()
+
+    def inicia(self) -> "ExportadorMetricas":
+        """
+        Inicia a thread de gravação periódica.
+        """
+        self._thread = threading.Thread(target=self._executa, name="ExportadorMetricas", daemon=True)
+        self._thread.start()
+        return self
+
+    def para(self) -> None:
+        """
+        Para a thread e faz uma última gravação.
+        """
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.grava()
@@ -0,0 +1,451 @@
+"""
+Regras de detecção de outliers compartilhadas pelos sensores.
+
+Cada tipo de sensor tem um conjunto de regras (RegrasOutlier), avaliadas em ordem; a primeira
+que considerar a leitura um outlier decide o que acontece com o sensor:
+
+    - MANTIDO: a leitura é descartada e o sensor mantém o valor anterior;
+    - REINICIADO: a leitura é descartada e o sensor volta a um valor de reinício.
+
+As mesmas regras avaliam uma leitura (verifica, com números) ou uma leitura de cada um de
+vários sensores de uma vez (verificaArray, com arrays NumPy, usado em Dispositivos.Lote e
+Dispositivos.Frota). Os parâmetros das regras podem ser números ou nomes de parâmetros do
+sensor (ex.: "temperaturaLimite"), lidos do dispositivo ou dos arrays da frota.
+
+Regras com janela (ZScoreMovel, Hampel) guardam as últimas leituras aceitas em um buffer
+circular por sensor, criado com novoEstado.
+"""
+import math
+from bisect import insort
+
+ACEITO = 0
+MANTIDO = 1
+REINICIADO = 2
+
+# A cada quantas atualizações as somas das janelas são recalculadas (evita acúmulo de erro de arredondamento).
+_RECALCULO_SOMAS = 4096
+
+
+def _parametro(valor, parametros):
+    if valor.__class__ is str:
+        return parametros[valor] if isinstance(parametros, dict) else getattr(parametros, valor)
+    return valor
+
+
+class _Anel():
+    """
+    Buffer circular das últimas leituras aceitas de um sensor, com soma e soma dos quadrados.
+    """
+    __slots__ = ("tamanho", "valores", "posicao", "soma", "somaQuadrados", "atualizacoes")
+
+    def __init__(self, tamanho: int) -> None:
+        self.tamanho = tamanho
+        self.valores = []
+        self.posicao = 0
+        self.soma = 0.0
+        self.somaQuadrados = 0.0
+        self.atualizacoes = 0
+
+    def adiciona(self, valor: float) -> None:
+        if len(self.valores) < self.tamanho:
+            self.valores.append(valor)
+        else:
+            antigo = self.valores[self.posicao]
+            self.soma -= antigo
+            self.somaQuadrados -= antigo * antigo
+            self.valores[self.posicao] = valor
+            self.posicao = (self.posicao + 1) % self.tamanho
+        self.soma += valor
+        self.somaQuadrados += valor * valor
+        self.atualizacoes += 1
+        if self.atualizacoes % _RECALCULO_SOMAS == 0:
+            self.soma = math.fsum(self.valores)
+            self.somaQuadrados = math.fsum(v * v for v in self.valores)
+
+
+class _AnelArray():
+    """
+    Buffers circulares de n sensores em um array (n, tamanho); posições vazias são NaN.
+    """
+
+    def __init__(self, n: int, tamanho: int) -> None:
+        import numpy as np
+        self.tamanho = tamanho
+        self.valores = np.full((n, tamanho), np.nan)
+        self.posicao = np.zeros(n, dtype=np.int64)
+        self.quantidade = np.zeros(n, dtype=np.int64)
+        self.soma = np.zeros(n)
+        self.somaQuadrados = np.zeros(n)
+        self.atualizacoes = 0
+
+    def adiciona(self, valores, aceitos) -> None:
+        import numpy as np
+        linhas = np.flatnonzero(aceitos)
+        if len(linhas) == 0:
+            return
+        novos = np.asarray(valores, dtype=np.float64)[linhas]
+        colunas = self.posicao[linhas]
+        antigos = np.nan_to_num(self.valores[linhas, colunas])
+        self.soma[linhas] += novos - antigos
+        self.somaQuadrados[linhas] += novos * novos - antigos * antigos
+        self.valores[linhas, colunas] = novos
+        self.posicao[linhas] = (colunas + 1) % self.tamanho
+        self.quantidade[linhas] = np.minimum(self.quantidade[linhas] + 1, self.tamanho)
+        self.atualizacoes += 1
+        if self.atualizacoes % _RECALCULO_SOMAS == 0:
+            self.soma = np.nansum(self.valores, axis=1)
+            self.somaQuadrados = np.nansum(self.valores * self.valores, axis=1)
+
+
+class Regra():
+    """
+    Base das regras de outlier.
+
+    Atributos
+    ---------
+        - acao (int): O que acontece com o sensor em um outlier: MANTIDO ou REINICIADO.
+        - temEstado (bool): Se a regra guarda as leituras anteriores (precisa de novoEstado).
+    """
+    temEstado = False
+
+    def __init__(self, acao: int = MANTIDO) -> None:
+        self.acao = acao
+
+    def novoEstado(self, n: int = None):
+        """
+        Cria o estado da regra para um sensor (n = None) ou para n sensores (arrays).
+        """
+        return None
+
+    def verifica(self, valor, instante, anterior, instanteAnterior, parametros, estado) -> bool:
+        """
+        Verifica se leituras são outliers. Aceita números (um sensor) ou arrays (um valor por sensor).
+
+        Parâmetros
+        ----------
+            - valor (float | numpy.ndarray): O valor medido.
+            - instante (int | numpy.ndarray): O timestamp da medição, em ns desde a época.
+            - anterior (float | numpy.ndarray): O último valor aceito.
+            - instanteAnterior (int | numpy.ndarray): O timestamp do último valor aceito.
+            - parametros: O dispositivo (atributos) ou um dict de parâmetros (escalares ou arrays).
+            - estado: O estado criado por novoEstado (None se a regra não tiver estado).
+
+        Retorna
+        -------
+            bool | numpy.ndarray: True nas leituras que são outliers.
+        """
+        raise NotImplementedError
+
+    def aceita(self, valor, estado) -> None:
+        """
+        Registra um valor aceito de um sensor no estado da regra.
+        """
+
+    def aceitaArray(self, valores, aceitos, estado) -> None:
+        """
+        Registra os valores aceitos (máscara aceitos) de n sensores no estado da regra.
+        """
+
+
+class Limite(Regra):
+    """
+    Outlier quando o valor fica abaixo de minimo ou acima de maximo (limites não inclusos).
+
+    Atributos
+    ---------
+        - minimo (float | str): O valor mínimo, o nome de um parâmetro do sensor ou None.
+        - maximo (float | str): O valor máximo, o nome de um parâmetro do sensor ou None.
+    """
+
+    def __init__(self, minimo=None, maximo=None, acao: int = MANTIDO) -> None:
+        super().__init__(acao)
+        self.minimo = minimo
+        self.maximo = maximo
+
+    def verifica(self, valor, instante, anterior, instanteAnterior, parametros, estado):
+        minimo, maximo = self.minimo, self.maximo
+        if minimo is None:
+            return False if maximo is None else valor > _parametro(maximo, parametros)
+        fora = valor < _parametro(minimo, parametros)
+        return fora if maximo is None else fora | (valor > _parametro(maximo, parametros))
+
+
+class TaxaVariacao(Regra):
+    """
+    Outlier quando o valor varia mais que maxima a cada intervalo segundos desde o último valor aceito.
+
+    Atributos
+    ---------
+        - maxima (float | str): A variação máxima, ou o nome de um parâmetro do sensor.
+        - intervalo (float): O período, em segundos, ao qual a variação máxima se refere.
+            None compara a variação por leitura, sem considerar o tempo.
+        - somenteAumento (bool): Se só aumentos são verificados (quedas são aceitas).
+    """
+
+    def __init__(self, maxima, intervalo: float = 1.0, somenteAumento: bool = False, acao: int = MANTIDO) -> None:
+        super().__init__(acao)
+        self.maxima = maxima
+        self.intervalo = intervalo
+        self.somenteAumento = somenteAumento
+
+    def verifica(self, valor, instante, anterior, instanteAnterior, parametros, estado):
+        variacao = valor - anterior if self.somenteAumento else abs(anterior - valor)
+        limite = _parametro(self.maxima, parametros)
+        if self.intervalo is not None:
+            limite = (instante - instanteAnterior) / 1e9 / self.intervalo * limite
+        return variacao > limite
+
+
+class ZScoreMovel(Regra):
+    """
+    Outlier quando o valor está a mais de limite desvios-padrão da média das últimas janela leituras aceitas.
+
+    Média e desvio vêm de somas mantidas no buffer circular: O(1) por leitura.
+
+    Atributos
+    ---------
+        - janela (int): A quantidade de leituras aceitas consideradas.
+        - limite (float): A distância máxima da média, em desvios-padrão.
+        - minimo (int): A quantidade de leituras necessária antes de a regra atuar.
+    """
+    temEstado = True
+
+    def __init__(self, janela: int = 30, limite: float = 3.0, minimo: int = None, acao: int = MANTIDO) -> None:
+        super().__init__(acao)
+        self.janela = janela
+        self.limite = limite
+        self.minimo = janela if minimo is None else minimo
+
+    def novoEstado(self, n: int = None):
+        return _Anel(self.janela) if n is None else _AnelArray(n, self.janela)
+
+    def verifica(self, valor, instante, anterior, instanteAnterior, parametros, estado):
+        if isinstance(estado, _AnelArray):
+            import numpy as np
+            quantidade = np.maximum(estado.quantidade, 1)
+            media = estado.soma / quantidade
+            variancia = np.maximum(estado.somaQuadrados / quantidade - media * media, 0.0)
+            return ((estado.quantidade >= self.minimo) & (variancia > 0)
+                    & (np.abs(valor - media) > self.limite * np.sqrt(variancia)))
+        quantidade = len(estado.valores)
+        if quantidade < self.minimo or quantidade == 0:
+            return False
+        media = estado.soma / quantidade
+        variancia = estado.somaQuadrados / quantidade - media * media
+        return variancia > 0 and abs(valor - media) > self.limite * math.sqrt(variancia)
+
+    def aceita(self, valor, estado) -> None:
+        estado.adiciona(valor)
+
+    def aceitaArray(self, valores, aceitos, estado) -> None:
+        estado.adiciona(valores, aceitos)
+
+
+class Hampel(Regra):
+    """
+    Filtro de Hampel: outlier quando o valor está a mais de limite desvios robustos (1,4826 * MAD)
+    da mediana das últimas janela leituras aceitas.
+
+    As leituras ficam em um buffer circular (O(1) por leitura); mediana e MAD custam O(janela),
+    então a janela deve ser pequena (tipicamente de 5 a 15).
+
+    Atributos
+    ---------
+        - janela (int): A quantidade de leituras aceitas consideradas.
+        - limite (float): A distância máxima da mediana, em desvios robustos.
+        - minimo (int): A quantidade de leituras necessária antes de a regra atuar.
+    """
+    temEstado = True
+    _ESCALA_MAD = 1.4826
+
+    def __init__(self, janela: int = 7, limite: float = 3.0, minimo: int = None, acao: int = MANTIDO) -> None:
+        super().__init__(acao)
+        self.janela = janela
+        self.limite = limite
+        self.minimo = janela if minimo is None else minimo
+
+    def novoEstado(self, n: int = None):
+        return _Anel(self.janela) if n is None else _AnelArray(n, self.janela)
+
+    def verifica(self, valor, instante, anterior, instanteAnterior, parametros, estado):
+        if isinstance(estado, _AnelArray):
+            import numpy as np
+            prontos = estado.quantidade >= max(self.minimo, 1)
+            resultado = np.zeros(len(estado.quantidade), dtype=bool)
+            if not prontos.any():
+                return resultado
+            valor = np.asarray(valor)
+            # Janelas cheias (o caso comum) usam np.median, bem mais rápido que np.nanmedian.
+            cheios = estado.quantidade == estado.tamanho
+            for linhas, mediana in ((prontos & cheios, np.median), (prontos & ~cheios, np.nanmedian)):
+                if linhas.any():
+                    janelas = estado.valores[linhas]
+                    centro = mediana(janelas, axis=1)
+                    mad = self._ESCALA_MAD * mediana(np.abs(janelas - centro[:, None]), axis=1)
+                    resultado[linhas] = (mad > 0) & (np.abs(valor[linhas] - centro) > self.limite * mad)
+            return resultado
+        quantidade = len(estado.valores)
+        if quantidade < self.minimo or quantidade == 0:
+            return False
+        ordenados = sorted(estado.valores)
+        mediana = _mediana(ordenados)
+        desvios = []
+        for v in ordenados:
+            insort(desvios, abs(v - mediana))
+        mad = self._ESCALA_MAD * _mediana(desvios)
+        return mad > 0 and abs(valor - mediana) > self.limite * mad
+
+    def aceita(self, valor, estado) -> None:
+        estado.adiciona(valor)
+
+    def aceitaArray(self, valores, aceitos, estado) -> None:
+        estado.adiciona(valores, aceitos)
+
+
+def _mediana(ordenados: list) -> float:
+    meio = len(ordenados) // 2
+    if len(ordenados) % 2:
+        return ordenados[meio]
+    return (ordenados[meio - 1] + ordenados[meio]) / 2
+
+
+class RegrasOutlier():
+    """
+    Conjunto ordenado de regras de um tipo de sensor; a primeira regra violada decide a ação.
+
+    O conjunto não guarda estado: o estado das regras com janela é criado por novoEstado e
+    guardado por quem avalia (o sensor, ou o grupo da frota), então um conjunto pode ser
+    compartilhado por todos os sensores de um tipo.
+
+    Atributos
+    ---------
+        - regras (list): As regras (Regra), em ordem de prioridade.
+        - temEstado (bool): Se alguma regra guarda as leituras anteriores.
+    """
+
+    def __init__(self, regras: list) -> None:
+        self.regras = list(regras)
+        self.temEstado = any(regra.temEstado for regra in self.regras)
+
+    def novoEstado(self, n: int = None):
+        """
+        Cria o estado das regras para um sensor (n = None) ou para n sensores.
+
+        Retorna
+        -------
+            list: O estado de cada regra, ou None se nenhuma regra tiver estado.
+        """
+        if not self.temEstado:
+            return None
+        return [regra.novoEstado(n) for regra in self.regras]
+
+    def verifica(self, valor, instante, anterior, instanteAnterior, parametros, estado=None) -> Regra:
+        """
+        Verifica uma leitura de um sensor (ver Regra.verifica para os parâmetros).
+
+        Retorna
+        -------
+            Regra: A primeira regra que considera a leitura um outlier, ou None se ela for aceita.
+        """
+        if estado is None:
+            for regra in self.regras:
+                if regra.verifica(valor, instante, anterior, instanteAnterior, parametros, None):
+                    return regra
+            return None
+        for regra, estadoRegra in zip(self.regras, estado):
+            if regra.verifica(valor, instante, anterior, instanteAnterior, parametros, estadoRegra):
+                return regra
+        return None
+
+    def aceita(self, valor, estado) -> None:
+        """
+        Registra um valor aceito nas regras com janela.
+        """
+        if estado:
+            for regra, estadoRegra in zip(self.regras, estado):
+                regra.aceita(valor, estadoRegra)
+
+    def verificaArray(self, valores, instantes, anteriores, instantesAnteriores, parametros, estado=None):
+        """
+        Verifica uma leitura de cada um de n sensores de uma vez (requer NumPy).
+
+        Parâmetros
+        ----------
+            - valores, instantes, anteriores, instantesAnteriores (numpy.ndarray): Um valor por sensor.
+            - parametros (dict): Os parâmetros dos sensores, escalares ou um array por parâmetro.
+            - estado (list): O estado criado por novoEstado(n); obrigatório se alguma regra tiver janela.
+
+        Retorna
+        -------
+            numpy.ndarray: A ação de cada leitura (int8): ACEITO, MANTIDO ou REINICIADO.
+
+        Lança
+        -----
+            ValueError: Se alguma regra tiver janela e o estado não for informado.
+        """
+        import numpy as np
+        if self.temEstado and estado is None:
+            raise ValueError("Regras com janela precisam do estado dos sensores (novoEstado(n))")
+        codigos = np.zeros(len(valores), dtype=np.int8)
+        # Da última para a primeira regra, para que a primeira violada prevaleça.
+        for i in reversed(range(len(self.regras))):
+            regra = self.regras[i]
+            violada = regra.verifica(valores, instantes, anteriores, instantesAnteriores, parametros,
+                                     estado[i] if estado else None)
+            codigos = np.where(violada, np.int8(regra.acao), codigos)
+        return codigos
+
+    def aceitaArray(self, valores, aceitos, estado) -> None:
+        """
+        Registra nas regras com janela os valores aceitos (máscara aceitos) de n sensores.
+        """
+        if estado:
+            for regra, estadoRegra in zip(self.regras, estado):
+                regra.aceitaArray(valores, aceitos, estadoRegra)
+
+
+REGRAS = {
+    "Termometro": RegrasOutlier([
+        Limite(maximo="temperaturaLimite"),
+        TaxaVariacao(1, intervalo=6),
+    ]),
+    "SensorAgua": RegrasOutlier([
+        TaxaVariacao("nivelMaximo", intervalo=None, somenteAumento=True),
+        Limite(0, "nivelMaximo", acao=REINICIADO),
+    ]),
+    "SensorUmidade": RegrasOutlier([Limite(0, 100, acao=REINICIADO)]),
+    "SensorLuminosidade": RegrasOutlier([Limite(0, 100000, acao=REINICIADO)]),
+    "SensorSom": RegrasOutlier([Limite(0, 90, acao=REINICIADO)]),
+    "SensorPressao": RegrasOutlier([Limite(0, 50, acao=REINICIADO)]),
+}
+
+
+def registraRegras(tipo: str, regras: list) -> None:
+    """
+    Define as regras de outlier de um tipo de sensor, usadas pelos sensores criados depois.
+
+    Parâmetros
+    ----------
+        - tipo (str): O nome da classe do sensor (ex.: "Termometro").
+        - regras (list | RegrasOutlier): As regras, em ordem de prioridade.
+    """
+    REGRAS[tipo] = regras if isinstance(regras, RegrasOutlier) else RegrasOutlier(regras)
+
+
+def regrasDoTipo(classe) -> RegrasOutlier:
+    """
+    Retorna as regras de outlier de uma classe de sensor (ou da classe base mais próxima que tenha regras).
+
+    Parâmetros
+    ----------
+        - classe (type | str): A classe do sensor, ou o nome do tipo.
+
+    Retorna
+    -------
+        RegrasOutlier: As regras; um conjunto vazio se o tipo não tiver regras.
+    """
+    nomes = (classe,) if isinstance(classe, str) else (base.__name__ for base in classe.__mro__)
+    for nome in nomes:
+        if nome in REGRAS:
+            return REGRAS[nome]
+    return RegrasOutlier([])
@@ -0,0 +1,223 @@
+import zlib
+
+# Codificações do corpo (cabeçalho Content-Encoding) -> wbits do zlib ("deflate" em HTTP é o formato zlib).
+COMPRESSOES = {
+    "gzip": 31,
+    "deflate": 15,
+}
+
+# Peso de cada envio na taxa de erros (média móvel exponencial).
+_PESO_TAXA_ERROS = 0.1
+
+
+class PoliticaEnvio():
+    """
+    Política de envio de um dispositivo: compressão do corpo das requisições e tamanho de lote adaptativo.
+
+    Com compressão, corpos a partir de compressaoMinima bytes são comprimidos (gzip ou deflate) e
+    enviados com o cabeçalho Content-Encoding; lotes em JSON repetem nomes, unidades e horários e
+    costumam encolher mais de 10 vezes.
+
+    Com adaptativo, o tamanho do lote começa em tamanhoLote e muda a cada rodada de envios completos
+    conforme a vazão medida (leituras/s por requisição): começa crescendo (em aumento, uma fração do
+    tamanho atual) e segue na mesma direção enquanto a vazão melhora mais que a tolerância, inverte
+    a direção quando ela piora e fica onde está quando ela não muda. Timeouts, envios mais lentos que
+    latenciaMaxima e uma taxa de erros acima de limiteErros multiplicam o tamanho por reducao, e o
+    lote volta a crescer a partir dali.
+
+    O estado adaptativo é de cada dispositivo: Dispositivo usa uma cópia da política recebida (ver copia).
+
+    Atributos
+    ---------
+        - compressao (str): A codificação do corpo ("gzip" ou "deflate"), ou None.
+        - nivelCompressao (int): O nível de compressão do zlib (1 a 9).
+        - compressaoMinima (int): O tamanho mínimo, em bytes, de um corpo comprimido.
+        - adaptativo (bool): Se o tamanho do lote se ajusta às medições.
+        - tamanhoMinimo (int): O menor tamanho de lote.
+        - tamanhoMaximo (int): O maior tamanho de lote.
+        - vazao (float): A vazão da última rodada de envios completos, em leituras/s, ou None.
+        - taxaErros (float): A fração recente de envios com falha (média móvel).
+    """
+
+    def __init__(self, compressao: str = None, nivelCompressao: int = 6, compressaoMinima: int = 1024,
+                 adaptativo: bool = False, tamanhoLote: int = None, tamanhoMinimo: int = 1,
+                 tamanhoMaximo: int = 1000, aumento: float = 0.25, reducao: float = 0.5,
+                 tolerancia: float = 0.05, amostras: int = 3, latenciaMaxima: float = None,
+                 limiteErros: float = 0.2) -> None:
+        """
+        Inicializa a política.
+
+        Parâmetros
+        ----------
+            - compressao (str): "gzip", "deflate" ou None (sem compressão).
+                Padrão = None.
+            - nivelCompressao (int): O nível de compressão do zlib (1 a 9).
+                Padrão = 6.
+            - compressaoMinima (int): O tamanho mínimo, em bytes, de um corpo comprimido.
+                Padrão = 1024.
+            - adaptativo (bool): Se o tamanho do lote se ajusta à vazão, aos timeouts e aos erros.
+                Padrão = False (mantém o tamanhoLote do dispositivo).
+            - tamanhoLote (int): O tamanho inicial do lote.
+                Padrão = None (o tamanhoLote do dispositivo).
+            - tamanhoMinimo (int): O menor tamanho de lote.
+                Padrão = 1.
+            - tamanhoMaximo (int): O maior tamanho de lote.
+                Padrão = 1000.
+            - aumento (float): O crescimento do lote a cada passo, como fração do tamanho atual (no mínimo 1).
+                Padrão = 0.25.
+            - reducao (float): O fator aplicado ao tamanho do lote em timeouts e excesso de erros.
+                Padrão = 0.5.
+            - tolerancia (float): A variação relativa da vazão considerada ruído.
+                Padrão = 0.05.
+            - amostras (int): A quantidade de envios completos medidos antes de cada decisão.
+                Padrão = 3.
+            - latenciaMaxima (float): A duração máxima, em segundos, de um envio; acima dela o lote
+                diminui como em um timeout.
+                Padrão = None (sem limite).
+            - limiteErros (float): A taxa de erros (exceto timeouts) a partir da qual o lote diminui.
+                Padrão = 0.2.
+
+        Lança
+        -----
+            ValueError: Se a compressão não for conhecida ou os limites do lote forem inválidos.
+        """
+        if compressao is not None and compressao not in COMPRESSOES:
+            raise ValueError(f"Compressão desconhecida: {compressao}")
+        if not 1 <= tamanhoMinimo <= tamanhoMaximo:
+            raise ValueError(f"Limites de lote inválidos: {tamanhoMinimo} a {tamanhoMaximo}")
+        if not 0 < reducao < 1:
+            raise ValueError(f"Redução inválida: {reducao}")
+        self.compressao = compressao
+        self.nivelCompressao = nivelCompressao
+        self.compressaoMinima = compressaoMinima
+        self.adaptativo = adaptativo
+        self.tamanhoMinimo = tamanhoMinimo
+        self.tamanhoMaximo = tamanhoMaximo
+        self.aumento = aumento
+        self.reducao = reducao
+        self.tolerancia = tolerancia
+        self.amostras = amostras
+        self.latenciaMaxima = latenciaMaxima
+        self.limiteErros = limiteErros
+        self._tamanhoInicial = tamanhoLote
+        self._tamanho = None if tamanhoLote is None else float(min(max(tamanhoLote, tamanhoMinimo), tamanhoMaximo))
+        self.vazao = None
+        self.taxaErros = 0.0
+        self._cresce = True
+        self._reiniciaRodada()
+
+    def _reiniciaRodada(self) -> None:
+        self._leituras = 0
+        self._segundos = 0.0
+        self._envios = 0
+
+    def copia(self) -> "PoliticaEnvio":
+        """
+        Cria uma política com a mesma configuração e o estado adaptativo inicial.
+
+        Retorna
+        -------
+            PoliticaEnvio: A nova política.
+        """
+        return PoliticaEnvio(
+            compressao=self.compressao, nivelCompressao=self.nivelCompressao, compressaoMinima=self.compressaoMinima,
+            adaptativo=self.adaptativo, tamanhoLote=self._tamanhoInicial, tamanhoMinimo=self.tamanhoMinimo,
+            tamanhoMaximo=self.tamanhoMaximo, aumento=self.aumento, reducao=self.reducao,
+            tolerancia=self.tolerancia, amostras=self.amostras, latenciaMaxima=self.latenciaMaxima,
+            limiteErros=self.limiteErros)
+
+    def tamanhoLote(self, atual: int) -> int:
+        """
+        Retorna o tamanho de lote que o dispositivo deve usar.
+
+        Parâmetros
+        ----------
+            - atual (int): O tamanho de lote atual do dispositivo, usado como inicial se tamanhoLote
+                não foi informado na política.
+
+        Retorna
+        -------
+            int: O tamanho do lote.
+        """
+        if self._tamanho is None:
+            if not self.adaptativo:
+                return atual
+            self._tamanho = float(min(max(atual, self.tamanhoMinimo), self.tamanhoMaximo))
+        return int(self._tamanho)
+
+    def comprime(self, corpo) -> tuple:
+        """
+        Comprime o corpo de uma requisição, se a política tiver compressão e o corpo for grande o bastante.
+
+        Parâmetros
+        ----------
+            - corpo (bytes | bytearray): O corpo serializado.
+
+        Retorna
+        -------
+            tuple: (corpo, codificação), com a codificação None se o corpo não foi comprimido.
+        """
+        if self.compressao is None or len(corpo) < self.compressaoMinima:
+            return corpo, None
+        return zlib.compress(corpo, self.nivelCompressao, COMPRESSOES[self.compressao]), self.compressao
+
+    def registraEnvio(self, quantidade: int, segundos: float) -> None:
+        """
+        Registra um envio bem-sucedido e, no fim de cada rodada de envios completos, ajusta o tamanho do lote.
+
+        Parâmetros
+        ----------
+            - quantidade (int): A quantidade de leituras enviadas.
+            - segundos (float): A duração do envio.
+        """
+        self.taxaErros -= _PESO_TAXA_ERROS * self.taxaErros
+        if not self.adaptativo or self._tamanho is None:
+            return
+        if self.latenciaMaxima is not None and segundos > self.latenciaMaxima:
+            self._reduz()
+            return
+        if quantidade < int(self._tamanho):
+            # Lote incompleto (vencido pela idade): não diz nada sobre o tamanho atual.
+            return
+        self._leituras += quantidade
+        self._segundos += segundos
+        self._envios += 1
+        if self._envios < self.amostras:
+            return
+        vazao = self._leituras / self._segundos if self._segundos > 0 else float("inf")
+        self._reiniciaRodada()
+        anterior, self.vazao = self.vazao, vazao
+        if anterior is not None and vazao < anterior * (1 - self.tolerancia):
+            # O último passo piorou a vazão: volta na direção contrária.
+            self._cresce = not self._cresce
+        elif anterior is not None and vazao <= anterior * (1 + self.tolerancia):
+            return
+        if self._cresce:
+            self._tamanho = min(self._tamanho + max(1.0, self._tamanho * self.aumento), float(self.tamanhoMaximo))
+        else:
+            self._tamanho = max(self._tamanho / (1 + self.aumento), float(self.tamanhoMinimo))
+
+    def registraFalha(self, erro: Exception) -> None:
+        """
+        Registra um envio com falha; timeouts e o excesso de erros diminuem o lote.
+
+        Parâmetros
+        ----------
+            - erro (Exception): O erro do envio.
+        """
+        self.taxaErros += _PESO_TAXA_ERROS * (1 - self.taxaErros)
+        if not self.adaptativo or self._tamanho is None:
+            return
+        if isinstance(erro, TimeoutError) or self.taxaErros >= self.limiteErros:
+            self._reduz()
+
+    def _reduz(self) -> None:
+        self._tamanho = max(self._tamanho * self.reducao, float(self.tamanhoMinimo))
+        # A vazão medida com o tamanho anterior não vale mais como referência.
+        self.vazao = None
+        self._cresce = True
+        self._reiniciaRodada()
+
+    def __repr__(self) -> str:
+        return (f"PoliticaEnvio(compressao={self.compressao!r}, adaptativo={self.adaptativo}, "
+                f"tamanhoLote={None if self._tamanho is None else int(self._tamanho)})")
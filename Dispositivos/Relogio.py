@@ -0,0 +1,126 @@
+"""
+Relógios da simulação: o real e um virtual, que só avança quando o escalonador pede.
+
+O relógio do processo (atual, trocado com define) é o que Tempo.agora() consulta: os
+timestamps das leituras, as regras de outlier por taxa de variação e as janelas de movimento
+seguem esse relógio, e o Escalonador agenda as execuções nele. Com um RelogioVirtual, o
+Escalonador salta direto para o próximo prazo em vez de dormir, e uma semana de leituras é
+gerada tão rápido quanto a CPU permite, com os mesmos timestamps que teria em tempo real.
+A idade dos lotes (Dispositivo.idadeMaximaLote) também segue esse relógio, para que os lotes
+tenham as mesmas leituras que teriam em tempo real.
+
+Os tempos de rede (espera do reenvio, LimitadorEnvio, Retry-After) continuam no tempo real,
+pois dependem do servidor e não da simulação.
+"""
+import time
+
+
+class RelogioReal():
+    """
+    O relógio do sistema.
+    """
+
+    virtual = False
+
+    def agora(self) -> int:
+        """
+        Retorna o instante atual em nanossegundos desde a época.
+        """
+        return time.time_ns()
+
+    def monotonico(self) -> float:
+        """
+        Retorna o instante atual do relógio monotônico, em segundos (usado nos prazos do Escalonador).
+        """
+        return time.monotonic()
+
+    def __repr__(self) -> str:
+        return "RelogioReal()"
+
+
+class RelogioVirtual():
+    """
+    Relógio simulado: parado até que avance (ver avancaAte), sem esperar o tempo passar.
+
+    Atributos
+    ---------
+        - inicio (int): O instante do início da simulação, em nanossegundos desde a época.
+        - segundos (float): O tempo simulado desde o início (o valor de monotonico()).
+    """
+
+    virtual = True
+
+    def __init__(self, inicio: int = None) -> None:
+        """
+        Inicializa o relógio parado no início da simulação.
+
+        Parâmetros
+        ----------
+            - inicio (int): O instante do início, em nanossegundos desde a época.
+                Padrão = None (o instante atual).
+        """
+        self.inicio = time.time_ns() if inicio is None else inicio
+        self.segundos = 0.0
+        self._instante = self.inicio
+
+    def agora(self) -> int:
+        """
+        Retorna o instante simulado em nanossegundos desde a época.
+        """
+        return self._instante
+
+    def monotonico(self) -> float:
+        """
+        Retorna o tempo simulado desde o início, em segundos.
+        """
+        return self.segundos
+
+    def avancaAte(self, segundos: float) -> None:
+        """
+        Avança o relógio até um instante de monotonico() (nunca volta).
+
+        Parâmetros
+        ----------
+            - segundos (float): O instante, em segundos desde o início da simulação.
+        """
+        if segundos > self.segundos:
+            self.segundos = segundos
+            self._instante = self.inicio + round(segundos * 1_000_000_000)
+
+    def avanca(self, segundos: float) -> None:
+        """
+        Avança o relógio alguns segundos.
+
+        Parâmetros
+        ----------
+            - segundos (float): Os segundos a avançar.
+        """
+        self.avancaAte(self.segundos + segundos)
+
+    def __repr__(self) -> str:
+        return f"RelogioVirtual(inicio={self.inicio}, segundos={self.segundos})"
+
+
+# O relógio do processo (ver define).
+atual = RelogioReal()
+
+
+def define(relogio) -> object:
+    """
+    Troca o relógio do processo.
+
+    Defina o relógio antes de criar os dispositivos: o instante da criação é o da primeira
+    medição de cada sensor.
+
+    Parâmetros
+    ----------
+        - relogio (RelogioReal | RelogioVirtual): O novo relógio, ou None para voltar ao real.
+
+    Retorna
+    -------
+        O relógio anterior.
+    """
+    global atual
+    anterior = atual
+    atual = RelogioReal() if relogio is None else relogio
+    return anterior
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from typing import Callable
+from Dispositivos.Dispositivo import Dispositivo
+from Dispositivos.Gravacao import LeitorColunar, arquivosGravados
+from Dispositivos.Tempo import agora
+from Dispositivos.Transporte import URL_TAGOIO
+
+MAXIMO = "maximo"
+
+# Atraso em segundos abaixo do qual a reprodução não dorme (evita dormir a cada leitura).
+_ESPERA_MINIMA = 0.001
+
+
+class DispositivoGravado(Dispositivo):
+    """
+    Dispositivo que só envia leituras já gravadas (usado pela Reproducao): não gera leituras próprias.
+    """
+
+    def geraDados(self):
+        return None
+
+
+class Reproducao():
+    """
+    Reproduz leituras gravadas em arquivos colunares (ver Dispositivos.Gravacao) pelo mesmo
+    caminho de envio dos simuladores: cada token vira um DispositivoGravado, com lotes, reenvio e métricas.
+
+    Os arquivos são lidos por mmap, um bloco descomprimido por vez, então gravações de vários GB
+    não são carregadas na memória. A velocidade segue os instantes gravados: 1 reproduz no tempo
+    real, N reproduz N vezes mais rápido e "maximo" envia o mais rápido possível (rajadas para
+    testes de carga).
+
+    Atributos
+    ---------
+        - arquivos (list): Os caminhos dos arquivos reproduzidos, em ordem.
+        - velocidade (float | str): O fator de velocidade, ou "maximo".
+        - atualizaInstantes (bool): Se os instantes são deslocados para que a reprodução pareça atual.
+        - dispositivos (dict): Os dispositivos criados, indexados pelo token.
+        - leituras (int): A quantidade de leituras reproduzidas.
+        - maiorAtraso (float): O maior atraso, em segundos, em relação ao horário previsto pela velocidade.
+    """
+
+    def __init__(self, arquivos, velocidade=1.0, transporte: str = "http", url: str = URL_TAGOIO,
+                 tamanhoLote: int = 100, idadeMaximaLote: float = 1000, fabrica: Callable[[str], Dispositivo] = None,
+                 executor=None, atualizaInstantes: bool = False, prefixo: str = "leituras") -> None:
+        """
+        Inicializa a reprodução (nada é lido antes de executa()).
+
+        Parâmetros
+        ----------
+            - arquivos (str | list): Um diretório de gravação, um arquivo ou uma lista de arquivos.
+            - velocidade (float | str): O fator de velocidade (1 = tempo real) ou "maximo".
+                Padrão = 1.0.
+            - transporte (str): O transporte dos dispositivos (ver Dispositivos.Transporte).
+                Padrão = "http".
+            - url (str): A URL base da API do TagoIO.
+                Padrão = "https://api.tago.io".
+            - tamanhoLote (int): Quantidade de leituras de um token enviadas em uma requisição.
+                Padrão = 100.
+            - idadeMaximaLote (float): Idade máxima, em milissegundos, de um lote incompleto.
+                Padrão = 1000.
+            - fabrica (Callable): Função fabrica(token) que cria o dispositivo de um token;
+                substitui transporte, url, tamanhoLote e idadeMaximaLote.
+                Padrão = None.
+            - executor (ExecutorEnvio): Executor das threads de envio. Sem executor, os envios
+                são feitos na thread da reprodução.
+                Padrão = None.
+            - atualizaInstantes (bool): Se os instantes gravados são deslocados para que a
+                primeira leitura tenha o horário do início da reprodução.
+                Padrão = False.
+            - prefixo (str): O prefixo dos arquivos, quando arquivos é um diretório.
+                Padrão = "leituras".
+
+        Lança
+        -----
+            ValueError: Se a velocidade não for positiva nem "maximo".
+        """
+        if velocidade != MAXIMO and not (isinstance(velocidade, (int, float)) and velocidade > 0):
+            raise ValueError(f"Velocidade inválida: {velocidade}")
+        if isinstance(arquivos, str):
+            arquivos = arquivosGravados(arquivos, prefixo) if os.path.isdir(arquivos) else [arquivos]
+        self.arquivos = list(arquivos)
+        self.velocidade = velocidade
+        self.atualizaInstantes = atualizaInstantes
+        self.dispositivos = {}
+        self.leituras = 0
+        self.maiorAtraso = 0.0
+        self._fabrica = fabrica or (lambda token: DispositivoGravado(
+            token=token, url=url, tamanhoLote=tamanhoLote, idadeMaximaLote=idadeMaximaLote, transporte=transporte))
+        self._idadeMaximaLote = idadeMaximaLote
+        self._executor = executor
+        self._parar = threading.Event()
+        self._proximaVerificacao = 0.0
+
+    def _dispositivo(self, token: str) -> Dispositivo:
+        dispositivo = self.dispositivos.get(token)
+        if dispositivo is None:
+            dispositivo = self.dispositivos[token] = self._fabrica(token)
+        return dispositivo
+
+    def _descarregaVencidos(self) -> None:
+        # Envia os lotes incompletos que passaram da idade máxima (tokens com poucas leituras),
+        # no máximo uma vez a cada idadeMaximaLote.
+        if self._idadeMaximaLote is None or time.monotonic() < self._proximaVerificacao:
+            return
+        self._proximaVerificacao = time.monotonic() + self._idadeMaximaLote / 1000
+        for dispositivo in self.dispositivos.values():
+            if dispositivo.envioPendente():
+                if self._executor is not None:
+                    self._executor.agendaDescarga(dispositivo)
+                else:
+                    dispositivo.descarregaSeVencido()
+
+    def _espera(self, segundos: float) -> None:
+        self._descarregaVencidos()
+        self._parar.wait(segundos)
+
+    def para(self) -> None:
+        """
+        Interrompe a reprodução (pode ser chamado de outra thread); executa() envia o que já foi lido e retorna.
+        """
+        self._parar.set()
+
+    def executa(self) -> dict:
+        """
+        Reproduz todos os arquivos, em ordem, e envia o que restar nos lotes.
+
+        Retorna
+        -------
+            dict: leituras, dispositivos, segundos (duração) e maiorAtraso (em segundos).
+        """
+        inicio = time.monotonic()
+        try:
+            self._reproduz(inicio)
+        finally:
+            if self._executor is not None:
+                self._executor.aguarda()
+            for dispositivo in self.dispositivos.values():
+                dispositivo.encerra()
+        return {
+            "leituras": self.leituras,
+            "dispositivos": len(self.dispositivos),
+            "segundos": time.monotonic() - inicio,
+            "maiorAtraso": self.maiorAtraso,
+        }
+
+    def _reproduz(self, inicio: float) -> None:
+        maximo = self.velocidade == MAXIMO
+        escala = 0 if maximo else 1 / (self.velocidade * 1_000_000_000)
+        executor = self._executor
+        primeiro = None
+        deslocamento = 0
+        for caminho in self.arquivos:
+            with LeitorColunar(caminho) as leitor:
+                for bloco in leitor.blocos():
+                    for token, dados in bloco.leituras():
+                        if self._parar.is_set():
+                            return
+                        instante = dados['time']
+                        if primeiro is None:
+                            primeiro = instante
+                            deslocamento = agora() - instante if self.atualizaInstantes else 0
+                        if not maximo:
+                            espera = inicio + (instante - primeiro) * escala - time.monotonic()
+                            if espera > _ESPERA_MINIMA:
+                                self._espera(espera)
+                            elif -espera > self.maiorAtraso:
+                                self.maiorAtraso = -espera
+                        if deslocamento:
+                            dados['time'] = instante + deslocamento
+                        dispositivo = self._dispositivo(token)
+                        if executor is not None:
+                            executor.submete(dispositivo, dados)
+                        else:
+                            dispositivo.enviaDados(dados)
+                        self.leituras += 1
+                    self._descarregaVencidos()
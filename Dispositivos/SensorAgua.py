@@ -1,6 +1,7 @@
-from datetime import datetime
-from Dispositivos.Dispositivo import Dispositivo
-from random import randint
+from Dispositivos.Tempo import agora
+from Dispositivos.Dispositivo import Dispositivo, Outlier
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Outliers import REINICIADO, regrasDoTipo
 
 class SensorAgua(Dispositivo):
     """
@@ -18,10 +19,12 @@ class SensorAgua(Dispositivo):
         - nivelMaximo (int): O nível máximo de água que o sensor pode medir.
             Padrão = 100.
         - nivelAtual (int): Último nível de água medido pelo sensor.
-        - timestampNivelAtual (datetime): O timestamp da última medição de nível de água.
+        - timestampNivelAtual (int): O timestamp da última medição de nível de água, em nanossegundos desde a época.
+        - regrasOutlier (RegrasOutlier): As regras de outlier (por padrão, as do tipo; ver Dispositivos.Outliers).
+        - estadoOutlier: O estado das regras com janela (None se não houver).
     """
 
-    def __init__(self, token: str, escala: str = "L", chanceOutlier: int = 5, nivelMaximo: int = 100) -> None:
+    def __init__(self, token: str, escala: str = "L", chanceOutlier: int = 5, nivelMaximo: int = 100, **kwargs) -> None:
         """
         Inicializador da classe do sensor de água.
 
@@ -34,41 +37,40 @@ class SensorAgua(Dispositivo):
                 Padrão = 5%.
             - nivelMaximo (int): O nível máximo de água que o sensor pode medir.
                 Padrão = 100.
+            - **kwargs: Parâmetros repassados para Dispositivo (ex.: url, tamanhoLote).
         """
+        super().__init__(token=token, **kwargs)
         self.nivelMaximo = nivelMaximo
         self.chanceOutlier = chanceOutlier
         self.escala = escala
-        self.nivelAtual = randint(0, nivelMaximo)
-        self.timestampNivelAtual = datetime.now()
-        super().__init__(token=token)
+        self.nivelAtual = self.aleatorio.randint(0, nivelMaximo)
+        self.timestampNivelAtual = agora()
+        self.regrasOutlier = regrasDoTipo(type(self))
+        self.estadoOutlier = self.regrasOutlier.novoEstado()
     
-    def geraDados(self) -> dict:
+    def geraDados(self) -> Leitura:
         """
         Gera dados de nível de água simulados.
 
         Retorna
         -------
-            dict: Um dicionário contendo informações sobre o nível de água gerado, incluindo
+            Leitura: Uma leitura com informações sobre o nível de água gerado, incluindo
                 'variable', 'value', 'unit' e 'time'.
+                O 'time' é um timestamp em nanossegundos, formatado em texto apenas no envio.
         
         Lança
         -----
-            Exception: Se ocorrer um erro ao medir o nível de água (quando há algum outlier).
+            Outlier: Se ocorrer um erro ao medir o nível de água (quando há algum outlier).
         """
-        diferenca = randint(-5, 5) + self.criaOutlier()
+        diferenca = self.aleatorio.randint(-5, 5) + self.criaOutlier()
         nivelMedido = self.nivelAtual + diferenca
-        timestampNivelMedido = datetime.now()
-        if not self.outlier(nivelMedido=nivelMedido):
+        timestampNivelMedido = agora()
+        if not self.outlier(nivelMedido=nivelMedido, timestampNivelMedido=timestampNivelMedido):
             self.nivelAtual = nivelMedido
             self.timestampNivelAtual = timestampNivelMedido
-            return {
-                'variable': 'NivelAgua',
-                'value': self.nivelAtual, 
-                'unit': self.escala, 
-                'time': self.timestampNivelAtual.strftime("%Y-%m-%d, %H:%M:%S")
-            }
+            return Leitura('NivelAgua', self.nivelAtual, self.escala, self.timestampNivelAtual)
         else:
-            raise Exception("Erro ao medir nível!")
+            raise Outlier("Erro ao medir nível!")
     
     def criaOutlier(self) -> int:
         """
@@ -78,34 +80,36 @@ class SensorAgua(Dispositivo):
         -------
             int: Um valor de outlier (maior que o nível máximo) ou 0, dependendo da chance definida pelo sensor de água.
         """
-        chance = randint(0, 100)
+        chance = self.aleatorio.randint(0, 100)
         if chance <= self.chanceOutlier:
             return self.nivelMaximo + 1
         else:
             return 0
         
-    def outlier(self, nivelMedido: int) -> bool:
+    def outlier(self, nivelMedido: int, timestampNivelMedido: int = None) -> bool:
         """
-        Verifica se o nível de água medido é um outlier. 
+        Verifica se o nível de água medido é um outlier com as regras do sensor de água (ver Dispositivos.Outliers).
 
         Parâmetros
         ----------
             - nivelMedido (int): O nível de água medido a ser verificado.
+            - timestampNivelMedido (int): O timestamp da medição, em nanossegundos desde a época.
+                Padrão = None (agora).
 
         Retorna
         -------
             bool: True se for um outlier, False caso contrário.
-                É considerado outlier quando a diferença entre o nível medido com o atual é maior que o nível máximo ou o valor medido é menor que 0.
+                Por padrão, é considerado outlier quando a diferença entre o nível medido com o atual é maior que o nível máximo ou o valor medido é menor que 0.
         """
-        if nivelMedido - self.nivelAtual > self.nivelMaximo:
-            return True
-        if nivelMedido < 0:
-            self.nivelAtual = self.nivelMaximo//2
-            self.timestampNivelAtual = datetime.now()
-            return True
-        if nivelMedido > self.nivelMaximo:
-            self.nivelAtual = self.nivelMaximo//2
-            self.timestampNivelAtual = datetime.now()
-            return True
-        else:
+        if timestampNivelMedido is None:
+            timestampNivelMedido = agora()
+        regra = self.regrasOutlier.verifica(nivelMedido, timestampNivelMedido, self.nivelAtual,
+                                            self.timestampNivelAtual, self, self.estadoOutlier)
+        if regra is None:
+            if self.estadoOutlier is not None:
+                self.regrasOutlier.aceita(nivelMedido, self.estadoOutlier)
             return False
+        if regra.acao == REINICIADO:
+            self.nivelAtual = self.nivelMaximo//2
+            self.timestampNivelAtual = timestampNivelMedido
+        return True
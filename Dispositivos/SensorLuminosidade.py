@@ -1,6 +1,7 @@
-from datetime import datetime
-from Dispositivos.Dispositivo import Dispositivo
-from random import randint, uniform
+from Dispositivos.Tempo import agora
+from Dispositivos.Dispositivo import Dispositivo, Outlier
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Outliers import REINICIADO, regrasDoTipo
 
 
 class SensorLuminosidade(Dispositivo):
@@ -15,10 +16,12 @@ class SensorLuminosidade(Dispositivo):
         - chanceOutlier (int): A probabilidade de gerar um outlier.
             Padrão = 5%.
         - luminosidadeAtual (float): Última luminosidade medida pelo sensor.
-        - timestampluminosidadeAtual (datetime): O timestamp da última medição de luminosidade.
+        - timestampLuminosidadeAtual (int): O timestamp da última medição de luminosidade, em nanossegundos desde a época.
+        - regrasOutlier (RegrasOutlier): As regras de outlier (por padrão, as do tipo; ver Dispositivos.Outliers).
+        - estadoOutlier: O estado das regras com janela (None se não houver).
     """
 
-    def __init__(self, token: str, chanceOutlier: int = 5) -> None:
+    def __init__(self, token: str, chanceOutlier: int = 5, **kwargs) -> None:
         """
         Inicializador da classe do sensor de luminosidade.
 
@@ -27,38 +30,38 @@ class SensorLuminosidade(Dispositivo):
             - token (str): Token do dispositivo no TagoIO.
             - chanceOutlier (int): A probabilidade de gerar um outlier.
                 Padrão = 5%.
+            - **kwargs: Parâmetros repassados para Dispositivo (ex.: url, tamanhoLote).
         """
+        super().__init__(token=token, **kwargs)
         self.chanceOutlier = chanceOutlier
-        self.luminosidadeAtual = uniform(10, 90)
-        self.timestampluminosidadeAtual = datetime.now()
-        super().__init__(token=token)
+        self.luminosidadeAtual = self.aleatorio.uniform(10, 90)
+        self.timestampLuminosidadeAtual = agora()
+        self.regrasOutlier = regrasDoTipo(type(self))
+        self.estadoOutlier = self.regrasOutlier.novoEstado()
 
-    def geraDados(self) -> dict:
+    def geraDados(self) -> Leitura:
         """
         Gera dados de luminosidade simulados.
 
         Retorna
         -------
-            dict: Um dicionário contendo informações sobre a luminosidade gerada, incluindo
+            Leitura: Uma leitura com informações sobre a luminosidade gerada, incluindo
                 'variable', 'value' e 'time'.
+                O 'time' é um timestamp em nanossegundos, formatado em texto apenas no envio.
 
         Lança
         -----
-            Exception: Se ocorrer um erro ao medir a luminosidade (quando há algum outlier).
+            Outlier: Se ocorrer um erro ao medir a luminosidade (quando há algum outlier).
         """
-        diferenca = uniform(-2, 2) + self.criaOutlier()
+        diferenca = self.aleatorio.uniform(-2, 2) + self.criaOutlier()
         luminosidadeMedida = self.luminosidadeAtual + diferenca
-        timestampLuminosidadeMedida = datetime.now()
-        if not self.outlier(luminosidadeMedida=luminosidadeMedida):
+        timestampLuminosidadeMedida = agora()
+        if not self.outlier(luminosidadeMedida=luminosidadeMedida, timestampLuminosidadeMedida=timestampLuminosidadeMedida):
             self.luminosidadeAtual = luminosidadeMedida
             self.timestampLuminosidadeAtual = timestampLuminosidadeMedida
-            return {
-                'variable': 'luminosidade',
-                'value': round(self.luminosidadeAtual, 2),
-                'time': self.timestampLuminosidadeAtual.strftime("%Y-%m-%d, %H:%M:%S")
-            }
+            return Leitura('luminosidade', round(self.luminosidadeAtual, 2), time=self.timestampLuminosidadeAtual)
         else:
-            raise Exception("Erro ao medir luminosidade!")
+            raise Outlier("Erro ao medir luminosidade!")
 
     def criaOutlier(self) -> int:
         """
@@ -68,28 +71,36 @@ class SensorLuminosidade(Dispositivo):
         -------
             int: Um valor de outlier (100000) ou 0, dependendo da chance definida pelo sensor de luminosidade.
         """
-        chance = randint(0, 100000)
+        chance = self.aleatorio.randint(0, 100000)
         if chance <= self.chanceOutlier:
             return 100
         else:
             return 0
 
-    def outlier(self, luminosidadeMedida: float) -> bool:
+    def outlier(self, luminosidadeMedida: float, timestampLuminosidadeMedida: int = None) -> bool:
         """
-        Verifica se a luminosidade medida é um outlier.
+        Verifica se a luminosidade medida é um outlier com as regras do sensor de luminosidade (ver Dispositivos.Outliers).
 
         Parâmetros
         ----------
             - luminosidadeMedida (float): A luminosidade medida a ser verificada.
+            - timestampLuminosidadeMedida (int): O timestamp da medição, em nanossegundos desde a época.
+                Padrão = None (agora).
 
         Retorna
         -------
             bool: True se for um outlier, False caso contrário.
-                É considerado outlier quando a luminosidade medida é menor que 0 ou maior que 100000.
+                Por padrão, é considerado outlier quando a luminosidade medida é menor que 0 ou maior que 100000.
         """
-        if luminosidadeMedida < 0 or luminosidadeMedida > 100000:
-            self.luminosidadeAtual = uniform(10, 99990)
-            self.timestampLuminosidadeAtual = datetime.now()
-            return True
-        else:
+        if timestampLuminosidadeMedida is None:
+            timestampLuminosidadeMedida = agora()
+        regra = self.regrasOutlier.verifica(luminosidadeMedida, timestampLuminosidadeMedida, self.luminosidadeAtual,
+                                            self.timestampLuminosidadeAtual, self, self.estadoOutlier)
+        if regra is None:
+            if self.estadoOutlier is not None:
+                self.regrasOutlier.aceita(luminosidadeMedida, self.estadoOutlier)
             return False
+        if regra.acao == REINICIADO:
+            self.luminosidadeAtual = self.aleatorio.uniform(10, 99990)
+            self.timestampLuminosidadeAtual = timestampLuminosidadeMedida
+        return True
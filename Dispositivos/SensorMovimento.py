@@ -1,6 +1,32 @@
 from datetime import datetime, time, timedelta
 from Dispositivos.Dispositivo import Dispositivo
-from random import randint
+from Dispositivos.Leitura import Leitura
+from Dispositivos.JanelasHorario import JanelasHorario
+from Dispositivos.Tempo import agora
+
+
+def janelasMovimento(janelas: list = None, horarioInicial: datetime.time = time(19, 00),
+                     diferencaTempoFinal: timedelta = timedelta(hours=2)) -> JanelasHorario:
+    """
+    Monta as janelas de detecção de um sensor de movimento a partir dos seus parâmetros.
+
+    Parâmetros
+    ----------
+        - janelas (list | JanelasHorario): As janelas (ver JanelasHorario), ou None para usar
+            uma única janela de horarioInicial com duração diferencaTempoFinal.
+        - horarioInicial (datetime.time): O início da janela única.
+        - diferencaTempoFinal (timedelta): A duração da janela única.
+
+    Retorna
+    -------
+        JanelasHorario: As janelas de detecção.
+    """
+    if isinstance(janelas, JanelasHorario):
+        return janelas
+    if janelas is None:
+        janelas = [(horarioInicial, diferencaTempoFinal)]
+    return JanelasHorario(janelas)
+
 
 class SensorMovimento(Dispositivo):
     """
@@ -17,9 +43,13 @@ class SensorMovimento(Dispositivo):
             Padrão = 2 horas.
         - chanceMovimento (int): A probabilidade de detectar movimento.
             Padrão = 5%.
+        - janelas (JanelasHorario): As janelas diárias em que o movimento é possível.
+        - movimentos (int): A quantidade de movimentações detectadas.
+        - timestampUltimoMovimento (int): O timestamp da última movimentação detectada (ou da criação),
+            em nanossegundos desde a época.
     """
 
-    def __init__(self, token: str, horarioInicial: datetime.time = time(19, 00), diferencaTempoFinal: timedelta = timedelta(hours=2), chanceMovimento: int = 5) -> None:
+    def __init__(self, token: str, horarioInicial: datetime.time = time(19, 00), diferencaTempoFinal: timedelta = timedelta(hours=2), chanceMovimento: int = 5, janelas: list = None, **kwargs) -> None:
         """
         Inicializador da classe do sensor de movimento.
 
@@ -32,43 +62,50 @@ class SensorMovimento(Dispositivo):
                 Padrão = 2 horas.
             - chanceMovimento (int): A probabilidade de detectar movimento.
                 Padrão = 5%.
+            - janelas (list): Várias janelas diárias, como pares (início, fim) de datetime.time
+                (fim anterior ao início atravessa a meia-noite) ou (início, timedelta).
+                Substituem horarioInicial e diferencaTempoFinal.
+                Padrão = None (uma janela de horarioInicial com duração diferencaTempoFinal).
+            - **kwargs: Parâmetros repassados para Dispositivo (ex.: url, tamanhoLote).
         """
+        super().__init__(token=token, **kwargs)
         self.horarioInicial = horarioInicial
         self.diferencaTempoFinal = diferencaTempoFinal
         self.chanceMovimento = chanceMovimento
-        super().__init__(token=token)
+        self.janelas = janelasMovimento(janelas, horarioInicial, diferencaTempoFinal)
+        self.movimentos = 0
+        self.timestampUltimoMovimento = agora()
     
-    def geraDados(self) -> dict:
+    def geraDados(self) -> Leitura:
         """
         Gera dados simulados de movimento.
 
         Retorna
         -------
-            dict: Um dicionário contendo informações sobre a detecção de movimento, incluindo
-                'variable', 'value' e 'time'. Retorna None se não houver movimento detectado.
+            Leitura: Uma leitura com informações sobre a detecção de movimento, incluindo
+                'variable', 'value' e 'time'.
+                O 'time' é um timestamp em nanossegundos, formatado em texto apenas no envio. Retorna None se não houver movimento detectado.
         """
-        chance = randint(0, 100)
-        if chance <= self.chanceMovimento and self.validaHorario():
-            return {
-                'variable': 'Movimento',
-                'value': 'Movimentação',
-                'time': datetime.now().strftime("%Y-%m-%d, %H:%M:%S")
-            }
-        else:
-            return None
-    
-    def validaHorario(self) -> bool:
+        chance = self.aleatorio.randint(0, 100)
+        if chance <= self.chanceMovimento:
+            instante = agora()
+            if self.janelas.ativa(instante):
+                self.movimentos += 1
+                self.timestampUltimoMovimento = instante
+                return Leitura('Movimento', 'Movimentação', time=instante)
+        return None
+
+    def validaHorario(self, instante: int = None) -> bool:
         """
-        Verifica se o horário atual está dentro do intervalo de tempo definido para detectar movimento.
+        Verifica se o horário está dentro de alguma janela definida para detectar movimento.
+
+        Parâmetros
+        ----------
+            - instante (int): O instante verificado, em ns desde a época.
+                Padrão = None (agora).
 
         Retorna
         -------
             bool: True se estiver dentro do horário definido, False caso contrário.
         """
-        horarioAgora = datetime.now()
-        horarioInicialHoje = datetime.combine(horarioAgora.date(), self.horarioInicial)
-        horarioFinalHoje = horarioInicialHoje + self.diferencaTempoFinal
-        if horarioAgora < horarioFinalHoje and horarioAgora > horarioInicialHoje:
-            return True
-        else: 
-            return False
\ No newline at end of file
+        return self.janelas.ativa(agora() if instante is None else instante)
@@ -1,6 +1,7 @@
-from datetime import datetime
-from Dispositivos.Dispositivo import Dispositivo
-from random import randint, uniform
+from Dispositivos.Tempo import agora
+from Dispositivos.Dispositivo import Dispositivo, Outlier
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Outliers import REINICIADO, regrasDoTipo
 
 
 class SensorPressao(Dispositivo):
@@ -15,10 +16,12 @@ class SensorPressao(Dispositivo):
         - chanceOutlier (int): A probabilidade de gerar um outlier.
             Padrão = 5%.
         - pressaoAtual (float): Último pressao medido pelo sensor.
-        - timestamppressaoAtual (datetime): O timestamp da última medição de pressao.
+        - timestampPressaoAtual (int): O timestamp da última medição de pressao, em nanossegundos desde a época.
+        - regrasOutlier (RegrasOutlier): As regras de outlier (por padrão, as do tipo; ver Dispositivos.Outliers).
+        - estadoOutlier: O estado das regras com janela (None se não houver).
     """
 
-    def __init__(self, token: str,  escala: str = "psi",chanceOutlier: int = 5) -> None:
+    def __init__(self, token: str,  escala: str = "psi",chanceOutlier: int = 5, **kwargs) -> None:
         """
         Inicializador da classe do sensor de pressao.
 
@@ -27,40 +30,39 @@ class SensorPressao(Dispositivo):
             - token (str): Token do dispositivo no TagoIO.
             - chanceOutlier (int): A probabilidade de gerar um outlier.
                 Padrão = 5%.
+            - **kwargs: Parâmetros repassados para Dispositivo (ex.: url, tamanhoLote).
         """
+        super().__init__(token=token, **kwargs)
         self.chanceOutlier = chanceOutlier
-        self.pressaoAtual = uniform(10, 40)
+        self.pressaoAtual = self.aleatorio.uniform(10, 40)
         self.escala = escala
-        self.timestamppressaoAtual = datetime.now()
-        super().__init__(token=token)
+        self.timestampPressaoAtual = agora()
+        self.regrasOutlier = regrasDoTipo(type(self))
+        self.estadoOutlier = self.regrasOutlier.novoEstado()
 
-    def geraDados(self) -> dict:
+    def geraDados(self) -> Leitura:
         """
         Gera dados de pressao simulados.
 
         Retorna
         -------
-            dict: Um dicionário contendo informações sobre o pressao gerado, incluindo
+            Leitura: Uma leitura com informações sobre o pressao gerado, incluindo
                 'variable', 'value' e 'time'.
+                O 'time' é um timestamp em nanossegundos, formatado em texto apenas no envio.
 
         Lança
         -----
-            Exception: Se ocorrer um erro ao medir o pressao (quando há algum outlier).
+            Outlier: Se ocorrer um erro ao medir o pressao (quando há algum outlier).
         """
-        diferenca = uniform(-2, 2) + self.criaOutlier()
+        diferenca = self.aleatorio.uniform(-2, 2) + self.criaOutlier()
         pressaoMedida = self.pressaoAtual + diferenca
-        timestampPressaoMedida = datetime.now()
-        if not self.outlier(pressaoMedida=pressaoMedida):
+        timestampPressaoMedida = agora()
+        if not self.outlier(pressaoMedida=pressaoMedida, timestampPressaoMedida=timestampPressaoMedida):
             self.pressaoAtual = pressaoMedida
             self.timestampPressaoAtual = timestampPressaoMedida
-            return {
-                'variable': 'pressao',
-                'value': round(self.pressaoAtual, 2),
-                'unit': self.escala, 
-                'time': self.timestampPressaoAtual.strftime("%Y-%m-%d, %H:%M:%S")
-            }
+            return Leitura('pressao', round(self.pressaoAtual, 2), self.escala, self.timestampPressaoAtual)
         else:
-            raise Exception("Erro ao medir pressao!")
+            raise Outlier("Erro ao medir pressao!")
 
     def criaOutlier(self) -> int:
         """
@@ -70,28 +72,36 @@ class SensorPressao(Dispositivo):
         -------
             int: Um valor de outlier (40) ou 0, dependendo da chance definida pelo sensor de pressao.
         """
-        chance = randint(0, 40)
+        chance = self.aleatorio.randint(0, 40)
         if chance <= self.chanceOutlier:
             return 100
         else:
             return 0
 
-    def outlier(self, pressaoMedida: float) -> bool:
+    def outlier(self, pressaoMedida: float, timestampPressaoMedida: int = None) -> bool:
         """
-        Verifica se a pressao medida é um outlier.
+        Verifica se a pressao medida é um outlier com as regras do sensor de pressao (ver Dispositivos.Outliers).
 
         Parâmetros
         ----------
             - pressaoMedida (float): A pressao medida a ser verificada.
+            - timestampPressaoMedida (int): O timestamp da medição, em nanossegundos desde a época.
+                Padrão = None (agora).
 
         Retorna
         -------
             bool: True se for um outlier, False caso contrário.
-                É considerado outlier quando o pressao medido é menor que 0 ou maior que 50 psi.
+                Por padrão, é considerado outlier quando o pressao medido é menor que 0 ou maior que 50 psi.
         """
-        if pressaoMedida < 0 or pressaoMedida > 50:
-            self.pressaoAtual = uniform(10, 40)
-            self.timestampPressaoAtual = datetime.now()
-            return True
-        else:
+        if timestampPressaoMedida is None:
+            timestampPressaoMedida = agora()
+        regra = self.regrasOutlier.verifica(pressaoMedida, timestampPressaoMedida, self.pressaoAtual,
+                                            self.timestampPressaoAtual, self, self.estadoOutlier)
+        if regra is None:
+            if self.estadoOutlier is not None:
+                self.regrasOutlier.aceita(pressaoMedida, self.estadoOutlier)
             return False
+        if regra.acao == REINICIADO:
+            self.pressaoAtual = self.aleatorio.uniform(10, 40)
+            self.timestampPressaoAtual = timestampPressaoMedida
+        return True
@@ -1,6 +1,7 @@
-from datetime import datetime
-from Dispositivos.Dispositivo import Dispositivo
-from random import randint, uniform
+from Dispositivos.Tempo import agora
+from Dispositivos.Dispositivo import Dispositivo, Outlier
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Outliers import REINICIADO, regrasDoTipo
 
 
 class SensorSom(Dispositivo):
@@ -15,10 +16,12 @@ class SensorSom(Dispositivo):
         - chanceOutlier (int): A probabilidade de gerar um outlier.
             Padrão = 5%.
         - somAtual (float): Último som medido pelo sensor.
-        - timestampsomAtual (datetime): O timestamp da última medição de som.
+        - timestampSomAtual (int): O timestamp da última medição de som, em nanossegundos desde a época.
+        - regrasOutlier (RegrasOutlier): As regras de outlier (por padrão, as do tipo; ver Dispositivos.Outliers).
+        - estadoOutlier: O estado das regras com janela (None se não houver).
     """
 
-    def __init__(self, token: str,  escala: str = "d",chanceOutlier: int = 5) -> None:
+    def __init__(self, token: str,  escala: str = "d",chanceOutlier: int = 5, **kwargs) -> None:
         """
         Inicializador da classe do sensor de som.
 
@@ -27,40 +30,39 @@ class SensorSom(Dispositivo):
             - token (str): Token do dispositivo no TagoIO.
             - chanceOutlier (int): A probabilidade de gerar um outlier.
                 Padrão = 5%.
+            - **kwargs: Parâmetros repassados para Dispositivo (ex.: url, tamanhoLote).
         """
+        super().__init__(token=token, **kwargs)
         self.chanceOutlier = chanceOutlier
-        self.somAtual = uniform(10, 90)
+        self.somAtual = self.aleatorio.uniform(10, 90)
         self.escala = escala
-        self.timestampsomAtual = datetime.now()
-        super().__init__(token=token)
+        self.timestampSomAtual = agora()
+        self.regrasOutlier = regrasDoTipo(type(self))
+        self.estadoOutlier = self.regrasOutlier.novoEstado()
 
-    def geraDados(self) -> dict:
+    def geraDados(self) -> Leitura:
         """
         Gera dados de som simulados.
 
         Retorna
         -------
-            dict: Um dicionário contendo informações sobre o som gerado, incluindo
+            Leitura: Uma leitura com informações sobre o som gerado, incluindo
                 'variable', 'value' e 'time'.
+                O 'time' é um timestamp em nanossegundos, formatado em texto apenas no envio.
 
         Lança
         -----
-            Exception: Se ocorrer um erro ao medir o som (quando há algum outlier).
+            Outlier: Se ocorrer um erro ao medir o som (quando há algum outlier).
         """
-        diferenca = uniform(-2, 2) + self.criaOutlier()
+        diferenca = self.aleatorio.uniform(-2, 2) + self.criaOutlier()
         somMedida = self.somAtual + diferenca
-        timestampSomMedida = datetime.now()
-        if not self.outlier(somMedida=somMedida):
+        timestampSomMedida = agora()
+        if not self.outlier(somMedida=somMedida, timestampSomMedida=timestampSomMedida):
             self.somAtual = somMedida
             self.timestampSomAtual = timestampSomMedida
-            return {
-                'variable': 'som',
-                'value': round(self.somAtual, 2),
-                'unit': self.escala, 
-                'time': self.timestampSomAtual.strftime("%Y-%m-%d, %H:%M:%S")
-            }
+            return Leitura('som', round(self.somAtual, 2), self.escala, self.timestampSomAtual)
         else:
-            raise Exception("Erro ao medir som!")
+            raise Outlier("Erro ao medir som!")
 
     def criaOutlier(self) -> int:
         """
@@ -70,28 +72,36 @@ class SensorSom(Dispositivo):
         -------
             int: Um valor de outlier (80) ou 0, dependendo da chance definida pelo sensor de som.
         """
-        chance = randint(0, 80)
+        chance = self.aleatorio.randint(0, 80)
         if chance <= self.chanceOutlier:
             return 100
         else:
             return 0
 
-    def outlier(self, somMedida: float) -> bool:
+    def outlier(self, somMedida: float, timestampSomMedida: int = None) -> bool:
         """
-        Verifica se a som medida é um outlier.
+        Verifica se o som medido é um outlier com as regras do sensor de som (ver Dispositivos.Outliers).
 
         Parâmetros
         ----------
             - somMedida (float): O som medido a ser verificado.
+            - timestampSomMedida (int): O timestamp da medição, em nanossegundos desde a época.
+                Padrão = None (agora).
 
         Retorna
         -------
             bool: True se for um outlier, False caso contrário.
-                É considerado outlier quando o som medido é menor que 0 ou maior que 90 decibéis.
+                Por padrão, é considerado outlier quando o som medido é menor que 0 ou maior que 90 decibéis.
         """
-        if somMedida < 0 or somMedida > 90:
-            self.somAtual = uniform(10, 80)
-            self.timestampSomAtual = datetime.now()
-            return True
-        else:
+        if timestampSomMedida is None:
+            timestampSomMedida = agora()
+        regra = self.regrasOutlier.verifica(somMedida, timestampSomMedida, self.somAtual,
+                                            self.timestampSomAtual, self, self.estadoOutlier)
+        if regra is None:
+            if self.estadoOutlier is not None:
+                self.regrasOutlier.aceita(somMedida, self.estadoOutlier)
             return False
+        if regra.acao == REINICIADO:
+            self.somAtual = self.aleatorio.uniform(10, 80)
+            self.timestampSomAtual = timestampSomMedida
+        return True
@@ -1,6 +1,7 @@
-from datetime import datetime
-from Dispositivos.Dispositivo import Dispositivo
-from random import randint, uniform
+from Dispositivos.Tempo import agora
+from Dispositivos.Dispositivo import Dispositivo, Outlier
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Outliers import REINICIADO, regrasDoTipo
 
 class SensorUmidade(Dispositivo):
     """
@@ -14,10 +15,12 @@ class SensorUmidade(Dispositivo):
         - chanceOutlier (int): A probabilidade de gerar um outlier.
             Padrão = 5%.
         - umidadeAtual (float): Última umidade medida pelo sensor.
-        - timestampUmidadeAtual (datetime): O timestamp da última medição de umidade.
+        - timestampUmidadeAtual (int): O timestamp da última medição de umidade, em nanossegundos desde a época.
+        - regrasOutlier (RegrasOutlier): As regras de outlier (por padrão, as do tipo; ver Dispositivos.Outliers).
+        - estadoOutlier: O estado das regras com janela (None se não houver).
     """
 
-    def __init__(self, token: str, chanceOutlier: int = 5) -> None:
+    def __init__(self, token: str, chanceOutlier: int = 5, **kwargs) -> None:
         """
         Inicializador da classe do sensor de umidade.
 
@@ -26,38 +29,38 @@ class SensorUmidade(Dispositivo):
             - token (str): Token do dispositivo no TagoIO.
             - chanceOutlier (int): A probabilidade de gerar um outlier.
                 Padrão = 5%.
+            - **kwargs: Parâmetros repassados para Dispositivo (ex.: url, tamanhoLote).
         """
+        super().__init__(token=token, **kwargs)
         self.chanceOutlier = chanceOutlier
-        self.umidadeAtual = uniform(10, 90)
-        self.timestampUmidadeAtual = datetime.now()
-        super().__init__(token=token)
+        self.umidadeAtual = self.aleatorio.uniform(10, 90)
+        self.timestampUmidadeAtual = agora()
+        self.regrasOutlier = regrasDoTipo(type(self))
+        self.estadoOutlier = self.regrasOutlier.novoEstado()
     
-    def geraDados(self) -> dict:
+    def geraDados(self) -> Leitura:
         """
         Gera dados de umidade simulados.
 
         Retorna
         -------
-            dict: Um dicionário contendo informações sobre a umidade gerada, incluindo
+            Leitura: Uma leitura com informações sobre a umidade gerada, incluindo
                 'variable', 'value' e 'time'.
+                O 'time' é um timestamp em nanossegundos, formatado em texto apenas no envio.
         
         Lança
         -----
-            Exception: Se ocorrer um erro ao medir a umidade (quando há algum outlier).
+            Outlier: Se ocorrer um erro ao medir a umidade (quando há algum outlier).
         """
-        diferenca = uniform(-2, 2) + self.criaOutlier()
+        diferenca = self.aleatorio.uniform(-2, 2) + self.criaOutlier()
         umidadeMedida = self.umidadeAtual + diferenca
-        timestampUmidadeMedida = datetime.now()
-        if not self.outlier(umidadeMedida=umidadeMedida):
+        timestampUmidadeMedida = agora()
+        if not self.outlier(umidadeMedida=umidadeMedida, timestampUmidadeMedida=timestampUmidadeMedida):
             self.umidadeAtual = umidadeMedida
             self.timestampUmidadeAtual = timestampUmidadeMedida
-            return {
-                'variable': 'Umidade',
-                'value': round(self.umidadeAtual, 2), 
-                'time': self.timestampUmidadeAtual.strftime("%Y-%m-%d, %H:%M:%S")
-            }
+            return Leitura('Umidade', round(self.umidadeAtual, 2), time=self.timestampUmidadeAtual)
         else:
-            raise Exception("Erro ao medir umidade!")
+            raise Outlier("Erro ao medir umidade!")
     
     def criaOutlier(self) -> int:
         """
@@ -67,28 +70,36 @@ class SensorUmidade(Dispositivo):
         -------
             int: Um valor de outlier (100) ou 0, dependendo da chance definida pelo sensor de umidade.
         """
-        chance = randint(0, 100)
+        chance = self.aleatorio.randint(0, 100)
         if chance <= self.chanceOutlier:
             return 100
         else:
             return 0
         
-    def outlier(self, umidadeMedida: float) -> bool:
+    def outlier(self, umidadeMedida: float, timestampUmidadeMedida: int = None) -> bool:
         """
-        Verifica se a umidade medida é um outlier. 
+        Verifica se a umidade medida é um outlier com as regras do sensor de umidade (ver Dispositivos.Outliers).
 
         Parâmetros
         ----------
             - umidadeMedida (float): A umidade medida a ser verificada.
+            - timestampUmidadeMedida (int): O timestamp da medição, em nanossegundos desde a época.
+                Padrão = None (agora).
 
         Retorna
         -------
             bool: True se for um outlier, False caso contrário.
-                É considerado outlier quando a umidade medida é menor que 0 ou maior que 100.
+                Por padrão, é considerado outlier quando a umidade medida é menor que 0 ou maior que 100.
         """
-        if umidadeMedida < 0 or umidadeMedida > 100:
-            self.umidadeAtual = uniform(10, 90)
-            self.timestampUmidadeAtual = datetime.now()
-            return True
-        else:
+        if timestampUmidadeMedida is None:
+            timestampUmidadeMedida = agora()
+        regra = self.regrasOutlier.verifica(umidadeMedida, timestampUmidadeMedida, self.umidadeAtual,
+                                            self.timestampUmidadeAtual, self, self.estadoOutlier)
+        if regra is None:
+            if self.estadoOutlier is not None:
+                self.regrasOutlier.aceita(umidadeMedida, self.estadoOutlier)
             return False
+        if regra.acao == REINICIADO:
+            self.umidadeAtual = self.aleatorio.uniform(10, 90)
+            self.timestampUmidadeAtual = timestampUmidadeMedida
+        return True
@@ -0,0 +1,442 @@
+"""
+Servidor local que simula o endpoint de envio de dados do TagoIO (POST /data, usado por
+tagoio_sdk.Device.sendData e por ConexaoTagoIO), para testes de carga sem a nuvem.
+
+Uso pela linha de comando (Ctrl+C encerra e mostra as estatísticas):
+
+    python -m Dispositivos.ServidorSimulado --porta 8000 --latencia exponencial:0.02 --taxa-erros 0.01
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Callable
+from Dispositivos.LimitadorEnvio import BaldeFichas
+
+# Codificações aceitas no cabeçalho Content-Encoding -> wbits do zlib.
+_DESCOMPRESSAO = {
+    "gzip": 31,
+    "deflate": 15,
+}
+
+# Só os cabeçalhos usados pelo servidor são lidos (um findall por requisição).
+_CABECALHOS = re.compile(
+    rb"^(content-length|device-token|token|authorization|content-encoding|connection)[ \t]*:[ \t]*(.*?)[ \t]*\r?$",
+    re.IGNORECASE | re.MULTILINE)
+
+_MOTIVOS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+# Distribuições de latência: nome -> fábrica(rng, *parâmetros) de uma função sem argumentos que sorteia segundos.
+DISTRIBUICOES = {
+    "fixa": lambda rng, segundos: (lambda: segundos),
+    "uniforme": lambda rng, minimo, maximo: (lambda: rng.uniform(minimo, maximo)),
+    "exponencial": lambda rng, media: (lambda: rng.expovariate(1 / media)),
+    "normal": lambda rng, media, desvio: (lambda: max(0.0, rng.gauss(media, desvio))),
+    "lognormal": lambda rng, mediana, sigma: (lambda: rng.lognormvariate(math.log(mediana), sigma)),
+}
+
+
+def distribuicaoLatencia(especificacao, rng: random.Random = None) -> Callable[[], float]:
+    """
+    Converte a especificação de uma latência em uma função que sorteia a latência em segundos.
+
+    Parâmetros
+    ----------
+        - especificacao (float | str | Callable): Um número de segundos (latência fixa), uma função
+            sem argumentos, ou um texto "nome:parâmetros" com um nome de DISTRIBUICOES
+            (ex.: "exponencial:0.02", "uniforme:0.01,0.05", "lognormal:0.02,0.5").
+        - rng (random.Random): O gerador dos sorteios.
+            Padrão = None (um gerador novo).
+
+    Retorna
+    -------
+        Callable: A função que sorteia a latência, ou None se não houver latência.
+
+    Lança
+    -----
+        ValueError: Se a distribuição não for conhecida.
+    """
+    if especificacao is None or callable(especificacao):
+        return especificacao
+    if isinstance(especificacao, (int, float)):
+        return (lambda: especificacao) if especificacao > 0 else None
+    nome, _, parametros = especificacao.partition(":")
+    if nome not in DISTRIBUICOES:
+        try:
+            return distribuicaoLatencia(float(especificacao), rng)
+        except ValueError:
+            raise ValueError(f"Distribuição de latência desconhecida: {nome}") from None
+    valores = [float(valor) for valor in parametros.split(",") if valor.strip()]
+    return DISTRIBUICOES[nome](rng or random.Random(), *valores)
+
+
+def _resposta(status: int, conteudo: dict, cabecalhos: tuple = ()) -> bytes:
+    corpo = json.dumps(conteudo).encode()
+    linhas = [f"HTTP/1.1 {status} {_MOTIVOS[status]}", "Content-Type: application/json",
+              f"Content-Length: {len(corpo)}", *cabecalhos]
+    return ("\r\n".join(linhas) + "\r\n\r\n").encode() + corpo
+
+
+_NAO_AUTORIZADO = _resposta(401, {"status": False, "message": "Authorization denied"})
+_NAO_ENCONTRADO = _resposta(404, {"status": False, "message": "Not found"})
+_JSON_INVALIDO = _resposta(400, {"status": False, "message": "Invalid JSON"})
+_ERRO_INTERNO = _resposta(500, {"status": False, "message": "Internal server error"})
+
+
+class _ProtocoloHTTP(asyncio.Protocol):
+    # Uma conexão HTTP/1.1 persistente; as respostas saem na ordem das requisições.
+
+    def __init__(self, servidor: "ServidorSimulado") -> None:
+        self.servidor = servidor
+        self.transporte = None
+        self.buffer = bytearray()
+        self.ultimaResposta = 0.0
+
+    def connection_made(self, transporte) -> None:
+        self.transporte = transporte
+        self.servidor.conexoes += 1
+        self.servidor._abertas.add(transporte)
+
+    def connection_lost(self, erro) -> None:
+        self.servidor._abertas.discard(self.transporte)
+
+    def data_received(self, dados: bytes) -> None:
+        buffer = self.buffer
+        buffer += dados
+        while True:
+            fim = buffer.find(b"\r\n\r\n")
+            if fim < 0:
+                return
+            cabecalho = bytes(buffer[:fim])
+            campos = {nome.lower(): valor for nome, valor in _CABECALHOS.findall(cabecalho)}
+            tamanho = int(campos.get(b"content-length", 0))
+            if len(buffer) < fim + 4 + tamanho:
+                return
+            corpo = bytes(buffer[fim + 4:fim + 4 + tamanho])
+            del buffer[:fim + 4 + tamanho]
+            metodo, caminho, _ = cabecalho[:cabecalho.find(b"\r\n")].split(b" ", 2)
+            resposta, atraso = self.servidor._atende(metodo, caminho, campos, corpo)
+            if resposta is None:
+                # Falha de conexão simulada: fecha sem responder.
+                self.transporte.close()
+                return
+            fecha = campos.get(b"connection", b"").lower() == b"close"
+            if not atraso and self.ultimaResposta <= 0:
+                self._escreve(resposta, fecha)
+            else:
+                self._responde(resposta, atraso, fecha)
+
+    def _responde(self, resposta: bytes, atraso: float, fecha: bool) -> None:
+        agora = self.servidor._loop.time()
+        instante = max(agora + atraso, self.ultimaResposta)
+        if instante <= agora:
+            self.ultimaResposta = 0.0
+            self._escreve(resposta, fecha)
+        else:
+            self.ultimaResposta = instante
+            self.servidor._loop.call_at(instante, self._escreve, resposta, fecha)
+
+    def _escreve(self, resposta: bytes, fecha: bool) -> None:
+        if self.transporte.is_closing():
+            return
+        self.transporte.write(resposta)
+        if fecha:
+            self.transporte.close()
+
+
+class ServidorSimulado():
+    """
+    Servidor HTTP assíncrono (asyncio) que responde como o endpoint /data do TagoIO.
+
+    Aceita POST /data com o token no cabeçalho Device-Token (ou token), um registro ou uma lista
+    de registros em JSON, opcionalmente comprimidos (Content-Encoding gzip ou deflate), e responde
+    {"status": true, "result": "N Data Added"}. Conexões persistentes e requisições em sequência
+    (pipelining) são atendidas sem uma tarefa por requisição, e o loop do uvloop é usado se estiver instalado.
+
+    Para testes de carga, simula:
+        - latência: fixa ou sorteada de uma distribuição (ver distribuicaoLatencia), mais um custo por leitura;
+        - erros: uma fração das requisições responde HTTP 500 e outra fecha a conexão sem resposta;
+        - limite de requisições: baldes de fichas por token e global; acima deles responde HTTP 429
+            com Retry-After (em segundos inteiros, como no HTTP);
+        - drenagem lenta: o servidor processa no máximo vazaoMaxima leituras/s e as respostas esperam a fila andar.
+
+    Os dados recebidos são contados (requisições, leituras, bytes, respostas por status e leituras
+    por token) e, com registra, guardados em recebidos para conferência.
+
+    Atributos
+    ---------
+        - url (str): A URL base do servidor, depois de iniciado.
+        - requisicoes (int): A quantidade de requisições recebidas.
+        - leituras (int): A quantidade de leituras aceitas (respostas 200).
+        - bytes (int): O total de bytes dos corpos recebidos (antes da descompressão).
+        - conexoes (int): A quantidade de conexões abertas pelos clientes.
+        - respostas (Counter): A quantidade de respostas por status HTTP.
+        - porToken (Counter): A quantidade de leituras aceitas por token.
+        - recebidos (list): Pares (token, registros) aceitos, se registra for True.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", porta: int = 0, latencia=None, latenciaPorLeitura: float = 0.0,
+                 taxaErros: float = 0.0, taxaDesconexoes: float = 0.0, limitePorToken: float = None,
+                 limiteGlobal: float = None, rajada: float = None, vazaoMaxima: float = None,
+                 registra: bool = True, semente: int = None) -> None:
+        """
+        Configura o servidor (nada é aberto antes de inicia() ou abre()).
+
+        Parâmetros
+        ----------
+            - host (str): O endereço de escuta.
+                Padrão = "127.0.0.1".
+            - porta (int): A porta de escuta; 0 escolhe uma porta livre.
+                Padrão = 0.
+            - latencia (float | str | Callable): A latência de cada resposta (ver distribuicaoLatencia).
+                Padrão = None (sem latência).
+            - latenciaPorLeitura (float): Segundos somados à latência por leitura da requisição.
+                Padrão = 0.0.
+            - taxaErros (float): A fração das requisições respondidas com HTTP 500.
+                Padrão = 0.0.
+            - taxaDesconexoes (float): A fração das requisições em que a conexão é fechada sem resposta.
+                Padrão = 0.0.
+            - limitePorToken (float): Requisições/s aceitas de cada token; acima disso, HTTP 429.
+                Padrão = None (sem limite).
+            - limiteGlobal (float): Requisições/s aceitas de todos os tokens juntos; acima disso, HTTP 429.
+                Padrão = None (sem limite).
+            - rajada (float): A capacidade dos baldes (requisições aceitas de uma vez antes do limite).
+                Padrão = None (um segundo de requisições no limite).
+            - vazaoMaxima (float): Leituras/s processadas pelo servidor; acima disso as respostas atrasam.
+                Padrão = None (sem limite).
+            - registra (bool): Se os registros aceitos são guardados em recebidos.
+                Padrão = True.
+            - semente (int): A semente dos sorteios (latência, erros e desconexões).
+                Padrão = None.
+        """
+        self.host = host
+        self.porta = porta
+        self._rng = random.Random(semente)
+        self.latencia = distribuicaoLatencia(latencia, self._rng)
+        self.latenciaPorLeitura = latenciaPorLeitura
+        self.taxaErros = taxaErros
+        self.taxaDesconexoes = taxaDesconexoes
+        self.limitePorToken = limitePorToken
+        self.limiteGlobal = limiteGlobal
+        self.rajada = rajada
+        self.vazaoMaxima = vazaoMaxima
+        self.registra = registra
+        self.url = None
+        self._loop = None
+        self._servidor = None
+        self._thread = None
+        self._respostasOk = {}
+        self._abertas = set()
+        self.zera()
+
+    def zera(self) -> None:
+        """
+        Zera as estatísticas, os registros guardados, os baldes de fichas e a fila de drenagem.
+        """
+        self.requisicoes = 0
+        self.leituras = 0
+        self.bytes = 0
+        self.conexoes = 0
+        self.respostas = Counter()
+        self.porToken = Counter()
+        self.recebidos = []
+        self._baldes = {}
+        self._baldeGlobal = None
+        self._drenagem = 0.0
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna as estatísticas do servidor.
+
+        Retorna
+        -------
+            dict: requisicoes, leituras, bytes, conexoes, respostas (por status) e tokens (quantidade de tokens).
+        """
+        return {
+            "requisicoes": self.requisicoes,
+            "leituras": self.leituras,
+            "bytes": self.bytes,
+            "conexoes": self.conexoes,
+            "respostas": dict(self.respostas),
+            "tokens": len(self.porToken),
+        }
+
+    def _balde(self, token: str, agora: float) -> BaldeFichas:
+        balde = self._baldes.get(token)
+        if balde is None:
+            balde = self._baldes[token] = BaldeFichas(self.limitePorToken, self.rajada or self.limitePorToken, agora)
+        return balde
+
+    def _limitada(self, token: str, agora: float) -> bytes:
+        espera = 0.0
+        if self.limitePorToken is not None:
+            espera = self._balde(token, agora).retira(agora)
+        if not espera and self.limiteGlobal is not None:
+            if self._baldeGlobal is None:
+                self._baldeGlobal = BaldeFichas(self.limiteGlobal, self.rajada or self.limiteGlobal, agora)
+            espera = self._baldeGlobal.retira(agora)
+        if not espera:
+            return None
+        return _resposta(429, {"status": False, "message": "Rate limit exceeded"},
+                         (f"Retry-After: {max(1, math.ceil(espera))}",))
+
+    def _atende(self, metodo: bytes, caminho: bytes, campos: dict, corpo: bytes) -> tuple:
+        # Retorna (resposta, atraso em segundos); resposta None fecha a conexão sem responder.
+        self.requisicoes += 1
+        self.bytes += len(corpo)
+        if metodo != b"POST" or caminho.split(b"?", 1)[0].rstrip(b"/") != b"/data":
+            return self._conta(404, _NAO_ENCONTRADO), 0.0
+        token = campos.get(b"device-token") or campos.get(b"token") or campos.get(b"authorization")
+        if not token:
+            return self._conta(401, _NAO_AUTORIZADO), 0.0
+        token = token.decode("latin-1")
+        if self.taxaDesconexoes and self._rng.random() < self.taxaDesconexoes:
+            self.respostas["desconexao"] += 1
+            return None, 0.0
+        if self.limitePorToken is not None or self.limiteGlobal is not None:
+            limitada = self._limitada(token, self._loop.time())
+            if limitada is not None:
+                return self._conta(429, limitada), 0.0
+        atraso = self.latencia() if self.latencia is not None else 0.0
+        if self.taxaErros and self._rng.random() < self.taxaErros:
+            return self._conta(500, _ERRO_INTERNO), atraso
+        try:
+            codificacao = campos.get(b"content-encoding")
+            if codificacao is not None:
+                corpo = zlib.decompress(corpo, _DESCOMPRESSAO[codificacao.decode("latin-1").lower()])
+            registros = json.loads(corpo.decode())
+        except (ValueError, KeyError, zlib.error):
+            return self._conta(400, _JSON_INVALIDO), atraso
+        if not isinstance(registros, list):
+            registros = [registros]
+        quantidade = len(registros)
+        atraso += quantidade * self.latenciaPorLeitura
+        if self.vazaoMaxima is not None:
+            # Fila de processamento: a requisição espera as anteriores e ocupa quantidade / vazaoMaxima segundos.
+            agora = self._loop.time()
+            self._drenagem = max(self._drenagem, agora) + quantidade / self.vazaoMaxima
+            atraso = max(atraso, self._drenagem - agora)
+        self.leituras += quantidade
+        self.porToken[token] += quantidade
+        if self.registra:
+            self.recebidos.append((token, registros))
+        resposta = self._respostasOk.get(quantidade)
+        if resposta is None:
+            resposta = self._respostasOk[quantidade] = _resposta(200, {"status": True, "result": f"{quantidade} Data Added"})
+        self.respostas[200] += 1
+        return resposta, atraso
+
+    def _conta(self, status: int, resposta: bytes) -> bytes:
+        self.respostas[status] += 1
+        return resposta
+
+    async def abre(self) -> str:
+        """
+        Abre o servidor no loop asyncio em execução.
+
+        Retorna
+        -------
+            str: A URL base do servidor (ex.: "http://127.0.0.1:8000").
+        """
+        self._loop = asyncio.get_running_loop()
+        self._servidor = await self._loop.create_server(lambda: _ProtocoloHTTP(self), self.host, self.porta, backlog=4096)
+        porta = self._servidor.sockets[0].getsockname()[1]
+        self.url = f"http://{self.host}:{porta}"
+        return self.url
+
+    async def fecha(self) -> None:
+        """
+        Fecha o servidor aberto com abre() e as conexões abertas pelos clientes.
+        """
+        if self._servidor is not None:
+            self._servidor.close()
+            # Conexões persistentes não são fechadas por close(): o cliente veria o servidor mudo.
+            for transporte in list(self._abertas):
+                transporte.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+
+    def inicia(self) -> str:
+        """
+        Inicia o servidor em uma thread própria, com o seu loop asyncio.
+
+        Retorna
+        -------
+            str: A URL base do servidor.
+        """
+        try:
+            import uvloop
+            loop = uvloop.new_event_loop()
+        except ImportError:
+            loop = asyncio.new_event_loop()
+        aberto = threading.Event()
+
+        def executa():
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.abre())
+            aberto.set()
+            loop.run_forever()
+            loop.run_until_complete(self.fecha())
+            loop.close()
+
+        self._thread = threading.Thread(target=executa, name="ServidorSimulado", daemon=True)
+        self._thread.start()
+        aberto.wait()
+        return self.url
+
+    def para(self) -> None:
+        """
+        Para o servidor iniciado com inicia().
+        """
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ServidorSimulado":
+        self.inicia()
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.para()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor local que simula o endpoint /data do TagoIO")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--latencia", help='latência: segundos ou "distribuição:parâmetros" (ex.: exponencial:0.02)')
+    parser.add_argument("--latencia-por-leitura", type=float, default=0.0)
+    parser.add_argument("--taxa-erros", type=float, default=0.0, help="fração de respostas HTTP 500")
+    parser.add_argument("--taxa-desconexoes", type=float, default=0.0, help="fração de conexões fechadas sem resposta")
+    parser.add_argument("--limite-por-token", type=float, help="requisições/s por token (acima: HTTP 429)")
+    parser.add_argument("--limite-global", type=float, help="requisições/s de todos os tokens (acima: HTTP 429)")
+    parser.add_argument("--vazao-maxima", type=float, help="leituras/s processadas (drenagem lenta)")
+    argumentos = parser.parse_args()
+
+    servidor = ServidorSimulado(
+        host=argumentos.host, porta=argumentos.porta, latencia=argumentos.latencia,
+        latenciaPorLeitura=argumentos.latencia_por_leitura, taxaErros=argumentos.taxa_erros,
+        taxaDesconexoes=argumentos.taxa_desconexoes, limitePorToken=argumentos.limite_por_token,
+        limiteGlobal=argumentos.limite_global, vazaoMaxima=argumentos.vazao_maxima, registra=False)
+    print(f"Servidor em {servidor.inicia()}/data")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    servidor.para()
+    print(json.dumps(servidor.estatisticas(), indent=2))
@@ -0,0 +1,62 @@
+import time
+from collections.abc import Mapping
+from functools import lru_cache
+from Dispositivos import Relogio
+
+FORMATO_HORARIO = "%Y-%m-%d, %H:%M:%S"
+
+
+def agora() -> int:
+    """
+    Retorna o instante atual do relógio do processo em nanossegundos desde a época.
+
+    É o formato de timestamp usado internamente pelos sensores; o texto enviado ao TagoIO
+    só é gerado na serialização (ver formataHorario). Com um RelogioVirtual (ver
+    Dispositivos.Relogio), é o instante simulado.
+    """
+    return Relogio.atual.agora()
+
+
+@lru_cache(maxsize=1024)
+def _formataSegundo(segundo: int) -> str:
+    return time.strftime(FORMATO_HORARIO, time.localtime(segundo))
+
+
+def formataHorario(instante: int) -> str:
+    """
+    Formata um timestamp em nanossegundos no formato enviado ao TagoIO ("%Y-%m-%d, %H:%M:%S").
+
+    O texto é calculado uma vez por segundo e compartilhado por todos os dispositivos.
+
+    Parâmetros
+    ----------
+        - instante (int): O timestamp em nanossegundos desde a época.
+
+    Retorna
+    -------
+        str: O horário formatado no fuso local.
+    """
+    return _formataSegundo(instante // 1_000_000_000)
+
+
+def formataDados(dados):
+    """
+    Prepara dados para serialização, trocando os timestamps inteiros do campo 'time' pelo texto formatado.
+
+    Os dicionários originais não são alterados; só os que têm 'time' inteiro são copiados.
+    Registros que não são dicionários (ex.: Leitura) viram dicionários.
+
+    Parâmetros
+    ----------
+        - dados (dict | Leitura | list): Um registro ou uma lista de registros no formato do TagoIO.
+
+    Retorna
+    -------
+        dict | list: Os registros com o campo 'time' em texto.
+    """
+    if isinstance(dados, Mapping):
+        horario = dados.get('time')
+        if isinstance(horario, int):
+            return {**dados, 'time': formataHorario(horario)}
+        return dados if isinstance(dados, dict) else dict(dados)
+    return [formataDados(item) for item in dados]
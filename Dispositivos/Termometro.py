@@ -1,6 +1,7 @@
-from datetime import datetime
-from Dispositivos.Dispositivo import Dispositivo
-from random import uniform, randint
+from Dispositivos.Tempo import agora
+from Dispositivos.Dispositivo import Dispositivo, Outlier
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Outliers import REINICIADO, regrasDoTipo
 
 class Termometro(Dispositivo):
     """
@@ -18,10 +19,12 @@ class Termometro(Dispositivo):
         - temperaturaLimite (int): A temperatura limite para considerar um outlier
             Padrão = 50.
         - temperaturaAtual (float): Última temperatura marcada pelo termômetro.
-        - timestampTemperaturaAtual (datetime): O timestamp da última medição de temperatura.
+        - timestampTemperaturaAtual (int): O timestamp da última medição de temperatura, em nanossegundos desde a época.
+        - regrasOutlier (RegrasOutlier): As regras de outlier (por padrão, as do tipo; ver Dispositivos.Outliers).
+        - estadoOutlier: O estado das regras com janela (None se não houver).
     """
 
-    def __init__(self, token : str, escala: str = "C", chanceOutlier: int = 5, temperaturaLimite: int = 50) -> None:
+    def __init__(self, token : str, escala: str = "C", chanceOutlier: int = 5, temperaturaLimite: int = 50, **kwargs) -> None:
         """
         Inicializador da classe de termômetro.
 
@@ -34,46 +37,45 @@ class Termometro(Dispositivo):
                 Padrão = 5%.
             - temperaturaLimite (int): A temperatura limite para considerar um outlier
                 Padrão = 50.
+            - **kwargs: Parâmetros repassados para Dispositivo (ex.: url, tamanhoLote).
         """
+        super().__init__(token=token, **kwargs)
         self.temperaturaLimite = temperaturaLimite
         self.chanceOutlier = chanceOutlier
         self.escala = escala 
         if escala == "C":
-            self.temperaturaAtual = uniform(18.0, 24.0)
+            self.temperaturaAtual = self.aleatorio.uniform(18.0, 24.0)
         elif escala == "F":
-            self.temperaturaAtual = uniform(64, 75)
+            self.temperaturaAtual = self.aleatorio.uniform(64, 75)
         else:
-            self.temperaturaAtual = uniform(18.0, 24.0)
-        self.timestampTemperaturaAtual = datetime.now()
-        super().__init__(token=token)
+            self.temperaturaAtual = self.aleatorio.uniform(18.0, 24.0)
+        self.timestampTemperaturaAtual = agora()
+        self.regrasOutlier = regrasDoTipo(type(self))
+        self.estadoOutlier = self.regrasOutlier.novoEstado()
     
-    def geraDados(self) -> dict:
+    def geraDados(self) -> Leitura:
         """
         Gera dados de temperatura simulados.
 
         Retorna
         -------
-            dict: Um dicionário contendo informações sobre a temperatura gerada, incluindo
+            Leitura: Uma leitura com informações sobre a temperatura gerada, incluindo
                 'variable', 'value', 'unit' e 'time'.
+                O 'time' é um timestamp em nanossegundos, formatado em texto apenas no envio.
         
         Lança
         -----
-            Exception: Se ocorrer um erro ao medir a temperatura (quando há algum outlier).
+            Outlier: Se ocorrer um erro ao medir a temperatura (quando há algum outlier).
         """
-        diferenca = uniform(-1, 1) + self.criaOutlier()
+        diferenca = self.aleatorio.uniform(-1, 1) + self.criaOutlier()
         temperaturaMedida = self.temperaturaAtual + diferenca
-        timestampTemperaturaMedida = datetime.now()
+        timestampTemperaturaMedida = agora()
         if not self.outlier(temperaturaMedida=temperaturaMedida, timestampTemperaturaMedida=timestampTemperaturaMedida):
             self.temperaturaAtual = temperaturaMedida
             self.timestampTemperaturaAtual = timestampTemperaturaMedida
-            return {
-                'variable': 'Temperatura',
-                'value': round(self.temperaturaAtual, 2), 
-                'unit': self.escala, 
-                'time': self.timestampTemperaturaAtual.strftime("%Y-%m-%d, %H:%M:%S")
-            }
+            return Leitura('Temperatura', round(self.temperaturaAtual, 2), self.escala, self.timestampTemperaturaAtual)
         else:
-            raise Exception("Erro ao medir temperatura!")
+            raise Outlier("Erro ao medir temperatura!")
     
     def criaOutlier(self) -> float:
         """
@@ -83,33 +85,34 @@ class Termometro(Dispositivo):
         -------
             float: Um valor de outlier (100) ou 0, dependendo da chance definida pelo termômetro.
         """
-        chance = randint(0, 100)
+        chance = self.aleatorio.randint(0, 100)
         if chance <= self.chanceOutlier:
             return 100
         else:
             return 0
         
-    def outlier(self, temperaturaMedida: float, timestampTemperaturaMedida: datetime) -> bool:
+    def outlier(self, temperaturaMedida: float, timestampTemperaturaMedida: int) -> bool:
         """
-        Verifica se a temperatura medida é um outlier. 
-        A verificação é baseada na temperaturaLimite e diferença entre a última temperatura medida.
+        Verifica se a temperatura medida é um outlier com as regras do termômetro (ver Dispositivos.Outliers).
 
         Parâmetros
         ----------
             - temperaturaMedida (float): A temperatura medida a ser verificada.
-            - timestampTemperaturaMedida (datetime): O timestamp da medição de temperatura.
+            - timestampTemperaturaMedida (int): O timestamp da medição de temperatura, em nanossegundos desde a época.
 
         Retorna
         -------
             bool: True se for um outlier, False caso contrário.
-                É considerado outlier quando a temperatura medida é maior que a temperatura limite do termômetro
+                Por padrão, é considerado outlier quando a temperatura medida é maior que a temperatura limite do termômetro
                 ou quando a diferença de temperatura entre a medição atual e anterior é maior que a (diferença de tempo em segundos)/6.
         """
-        if temperaturaMedida > self.temperaturaLimite:
-            return True
-        diferencaTemperatura = abs(self.temperaturaAtual - temperaturaMedida)
-        diferencaTempo = (timestampTemperaturaMedida - self.timestampTemperaturaAtual).total_seconds() / 6
-        if diferencaTemperatura > diferencaTempo:
-            return True
-        else:
-            return False
\ No newline at end of file
+        regra = self.regrasOutlier.verifica(temperaturaMedida, timestampTemperaturaMedida, self.temperaturaAtual,
+                                            self.timestampTemperaturaAtual, self, self.estadoOutlier)
+        if regra is None:
+            if self.estadoOutlier is not None:
+                self.regrasOutlier.aceita(temperaturaMedida, self.estadoOutlier)
+            return False
+        if regra.acao == REINICIADO:
+            self.temperaturaAtual = self.aleatorio.uniform(64, 75) if self.escala == "F" else self.aleatorio.uniform(18.0, 24.0)
+            self.timestampTemperaturaAtual = agora()
+        return True
@@ -0,0 +1,140 @@
+import time
+from typing import Callable
+
+URL_TAGOIO = "https://api.tago.io"
+
+# Espera usada quando um HTTP 429 não traz um Retry-After válido, em segundos.
+ESPERA_LIMITE_PADRAO = 1.0
+
+
+class LimiteRequisicoes(Exception):
+    """
+    A API recusou o envio por excesso de requisições (HTTP 429). Os dados não foram aceitos e
+    podem ser reenviados depois de espera segundos, sem contar como falha do envio.
+
+    Atributos
+    ---------
+        - espera (float): Os segundos a esperar antes do próximo envio (cabeçalho Retry-After).
+    """
+
+    def __init__(self, mensagem: str, espera: float = ESPERA_LIMITE_PADRAO) -> None:
+        super().__init__(mensagem)
+        self.espera = espera
+
+    @staticmethod
+    def esperaRetryAfter(valor: str) -> float:
+        """
+        Converte um cabeçalho Retry-After (segundos ou data HTTP) na espera em segundos.
+
+        Parâmetros
+        ----------
+            - valor (str): O valor do cabeçalho, ou None.
+
+        Retorna
+        -------
+            float: A espera em segundos (ESPERA_LIMITE_PADRAO se o valor faltar ou for inválido).
+        """
+        if not valor:
+            return ESPERA_LIMITE_PADRAO
+        try:
+            return max(0.0, float(valor))
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+        try:
+            return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return ESPERA_LIMITE_PADRAO
+
+
+class TransporteNulo():
+    """
+    Transporte que descarta os dados, para geração offline e benchmarks (uma política de compressão é ignorada).
+    """
+
+    def __init__(self, token: str, url: str = URL_TAGOIO, politica=None) -> None:
+        self.token = token
+        self.url = url
+
+    def sendData(self, dados) -> str:
+        return f"{len(dados) if isinstance(dados, list) else 1} Data Added"
+
+    def fecha(self) -> None:
+        pass
+
+
+class TransporteSDK():
+    """
+    Transporte pelo SDK oficial (tagoio_sdk.Device), importado só na criação do primeiro transporte.
+
+    O SDK envia os dados sem compressão: uma política de compressão é ignorada.
+
+    Atributos
+    ---------
+        - token (str): O token de autenticação do dispositivo.
+        - dispositivo (tagoio_sdk.Device): O dispositivo do SDK.
+    """
+
+    def __init__(self, token: str, url: str = URL_TAGOIO, politica=None) -> None:
+        from tagoio_sdk import Device
+        self.token = token
+        self.dispositivo = Device({"token": token})
+
+    def sendData(self, dados) -> str:
+        from Dispositivos.Tempo import formataDados
+        return self.dispositivo.sendData(formataDados(dados))
+
+    def fecha(self) -> None:
+        pass
+
+
+def _criaConexaoHTTP(token: str, url: str = URL_TAGOIO, politica=None):
+    from Dispositivos.Conexao import ConexaoTagoIO
+    return ConexaoTagoIO(token=token, url=url, politica=politica)
+
+
+TRANSPORTES = {
+    "http": _criaConexaoHTTP,
+    "sdk": TransporteSDK,
+    "nulo": TransporteNulo,
+}
+
+
+def registraTransporte(nome: str, fabrica: Callable) -> None:
+    """
+    Registra um transporte, disponível para os dispositivos pelo nome.
+
+    Parâmetros
+    ----------
+        - nome (str): O nome usado no parâmetro transporte de Dispositivo.
+        - fabrica (Callable): Função fabrica(token=..., url=...) que retorna um objeto
+            com os métodos sendData(dados) e fecha(). Se o dispositivo tiver uma política
+            com compressão, a fábrica também recebe politica=....
+    """
+    TRANSPORTES[nome] = fabrica
+
+
+def criaTransporte(nome: str, token: str, url: str = URL_TAGOIO, **opcoes):
+    """
+    Cria o transporte de um dispositivo. Os módulos do transporte só são importados aqui.
+
+    Parâmetros
+    ----------
+        - nome (str): O nome do transporte ("http", "sdk", "nulo" ou um registrado).
+        - token (str): O token de autenticação do dispositivo.
+        - url (str): A URL base da API.
+            Padrão = "https://api.tago.io".
+        - opcoes: Opções repassadas à fábrica do transporte (ex.: politica, com a compressão
+            do transporte "http").
+
+    Retorna
+    -------
+        O transporte, com os métodos sendData(dados) e fecha().
+
+    Lança
+    -----
+        ValueError: Se o transporte não for conhecido.
+    """
+    if nome not in TRANSPORTES:
+        raise ValueError(f"Transporte desconhecido: {nome}")
+    return TRANSPORTES[nome](token=token, url=url, **opcoes)
@@ -0,0 +1,31 @@
+"""
+Simuladores de dispositivos IoT que enviam dados ao TagoIO.
+
+Os módulos do pacote são carregados sob demanda (PEP 562): "import Dispositivos" não
+importa nenhum deles, e Dispositivos.Termometro só importa o módulo do termômetro (e o
+que ele usa) no primeiro acesso. Como no import explícito, o atributo é o módulo:
+a classe é Dispositivos.Termometro.Termometro.
+
+O transporte HTTP e o tagoio_sdk só são importados no primeiro envio (ver Dispositivos.Transporte).
+"""
+import importlib
+
+_MODULOS = (
+    "Dispositivo", "Termometro", "SensorAgua", "SensorUmidade", "SensorLuminosidade", "SensorSom",
+    "SensorPressao", "SensorMovimento", "Escalonador", "EscalonadorParalelo", "ExecutorEnvio",
+    "FilaReenvio", "Aleatorio", "Leitura", "Conexao", "PoliticaEnvio", "LimitadorEnvio", "ServidorSimulado",
+    "Transporte", "Gravacao", "Reproducao", "ConfiguracaoFrota", "Frota", "JanelasHorario", "Outliers",
+    "Lote", "Metricas", "Relogio", "Tempo",
+)
+
+__all__ = list(_MODULOS)
+
+
+def __getattr__(nome: str):
+    if nome not in _MODULOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    return importlib.import_module(f"{__name__}.{nome}")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
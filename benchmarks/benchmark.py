@@ -0,0 +1,590 @@
+"""
+Benchmarks dos caminhos críticos do pacote Dispositivos.
+
+Mede:
+    - geraDados: leituras/s de cada classe de sensor;
+    - outlier: verificações/s de cada classe;
+    - aleatorio: sorteios/s do fluxo aleatório de um dispositivo (FluxoAleatorio) e do módulo random;
+    - payload: montagem dos dicionários e serialização do corpo enviado ao TagoIO;
+    - envio: enviaDados contra o ServidorSimulado local (conexão nova a cada envio,
+      conexão persistente e envio em lotes), com leituras/s e latência p99;
+    - politica: envio em lotes sem compressão, com gzip/deflate e com lote adaptativo
+      (ver PoliticaEnvio), com leituras/s e bytes por leitura recebidos pelo servidor;
+    - estresse: envio em lotes contra o servidor com latência, erros e desconexões, conferindo
+      pelos dados recebidos que cada leitura chegou uma única vez;
+    - limite: dispositivos gerando acima do limite de requisições do servidor (por token e global),
+      só respeitando o Retry-After dos HTTP 429 e com um LimitadorEnvio compartilhado, com as
+      leituras/s entregues e as respostas 429;
+    - servidor: requisições/s absorvidas pelo ServidorSimulado (com o cliente no mesmo processo);
+    - frota: execução no estilo de main.py (Escalonador + geração + envio) com 10, 1 mil e
+      100 mil dispositivos, com leituras/s e memória por dispositivo;
+    - virtual: um dia de leituras (uma por minuto) de uma frota no tempo virtual (ver
+      Dispositivos.Relogio), com um prazo por dispositivo e com 100 dispositivos por prazo
+      (fusao do Escalonador), com leituras/s e dias simulados por segundo;
+    - importacao: tempo de importação (em um processo novo) e se os módulos de rede
+      (http.client, ssl, tagoio_sdk) foram carregados sem nenhum envio real;
+    - inicializacao: carregar uma frota de 100 mil dispositivos da configuração e agendá-la;
+    - paralelo: a mesma frota distribuída por EscalonadorParalelo com 1 processo e com um por núcleo;
+    - gravacao: leituras/s e bytes por leitura na gravação offline em arquivos colunares
+      (leitura a leitura e, com NumPy, a partir de FrotaSensores) e na reprodução desses arquivos;
+    - lote/colunar (se o NumPy estiver instalado): geraLote e FrotaSensores.
+
+Uso (a partir da raiz do repositório):
+
+    python benchmarks/benchmark.py --saida benchmarks/baseline.json
+    python benchmarks/benchmark.py --compara benchmarks/baseline.json
+
+Com --compara, os resultados são comparados com uma execução anterior e as métricas que
+pioraram além da tolerância são listadas (código de saída 1).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Dispositivos import Relogio
+from Dispositivos.Aleatorio import FluxoAleatorio
+from Dispositivos.ConfiguracaoFrota import montaFrota
+from Dispositivos.Dispositivo import Outlier
+from Dispositivos.Escalonador import Escalonador
+from Dispositivos.Gravacao import GravadorColunar
+from Dispositivos.Reproducao import Reproducao, MAXIMO
+from Dispositivos.EscalonadorParalelo import EscalonadorParalelo
+from Dispositivos.SensorAgua import SensorAgua
+from Dispositivos.SensorLuminosidade import SensorLuminosidade
+from Dispositivos.SensorMovimento import SensorMovimento
+from Dispositivos.SensorPressao import SensorPressao
+from Dispositivos.SensorSom import SensorSom
+from Dispositivos.SensorUmidade import SensorUmidade
+from Dispositivos.Leitura import Leitura, SerializadorTagoIO
+from Dispositivos.LimitadorEnvio import LimitadorEnvio
+from Dispositivos.PoliticaEnvio import PoliticaEnvio
+from Dispositivos.ServidorSimulado import ServidorSimulado
+from Dispositivos.Tempo import agora, formataDados
+from Dispositivos.Termometro import Termometro
+
+SENSORES = (Termometro, SensorAgua, SensorUmidade, SensorLuminosidade, SensorSom, SensorPressao, SensorMovimento)
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULOS_REDE = ("http.client", "ssl", "tagoio_sdk")
+
+# Métricas em que um valor menor é melhor; nas demais (leituras/s, ops/s), maior é melhor.
+MENOR_MELHOR = ("latencia_p99_ms", "bytes_por_dispositivo", "bytes_por_leitura", "segundos", "respostas_limitadas")
+
+
+def _cronometra(funcao, repeticoes: int, rodadas: int = 3) -> float:
+    # Melhor de algumas rodadas, para reduzir o ruído entre execuções.
+    duracoes = []
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        funcao(repeticoes)
+        duracoes.append(time.perf_counter() - inicio)
+    return min(duracoes)
+
+
+def _percentil(amostras: list, p: float) -> float:
+    ordenadas = sorted(amostras)
+    return ordenadas[min(len(ordenadas) - 1, int(p * len(ordenadas)))]
+
+
+def benchmarkGeraDados(repeticoes: int) -> dict:
+    resultados = {}
+    for classe in SENSORES:
+        sensor = classe(token="benchmark")
+
+        def executa(n, sensor=sensor):
+            for _ in range(n):
+                try:
+                    sensor.geraDados()
+                except Outlier:
+                    pass
+        resultados[classe.__name__] = {"leituras_por_segundo": repeticoes / _cronometra(executa, repeticoes)}
+    return resultados
+
+
+def benchmarkAleatorio(repeticoes: int) -> dict:
+    fluxo = FluxoAleatorio.doDispositivo("benchmark", semente=0)
+    sorteios = {
+        "fluxo_uniform": lambda: fluxo.uniform(-1, 1),
+        "fluxo_randint": lambda: fluxo.randint(0, 100),
+        "random_uniform": lambda: random.uniform(-1, 1),
+        "random_randint": lambda: random.randint(0, 100),
+    }
+    resultados = {}
+    for nome, sorteio in sorteios.items():
+        def executa(n, sorteio=sorteio):
+            for _ in range(n):
+                sorteio()
+        resultados[nome] = {"sorteios_por_segundo": repeticoes / _cronometra(executa, repeticoes)}
+    return resultados
+
+
+def benchmarkOutlier(repeticoes: int) -> dict:
+    resultados = {}
+    chamadas = {
+        Termometro: lambda s: s.outlier(temperaturaMedida=s.temperaturaAtual + 0.5, timestampTemperaturaMedida=agora()),
+        SensorAgua: lambda s: s.outlier(nivelMedido=s.nivelAtual),
+        SensorUmidade: lambda s: s.outlier(umidadeMedida=50.0),
+        SensorLuminosidade: lambda s: s.outlier(luminosidadeMedida=500.0),
+        SensorSom: lambda s: s.outlier(somMedida=50.0),
+        SensorPressao: lambda s: s.outlier(pressaoMedida=25.0),
+    }
+    for classe, chamada in chamadas.items():
+        sensor = classe(token="benchmark")
+
+        def executa(n, sensor=sensor, chamada=chamada):
+            for _ in range(n):
+                chamada(sensor)
+        resultados[classe.__name__] = {"verificacoes_por_segundo": repeticoes / _cronometra(executa, repeticoes)}
+    return resultados
+
+
+def benchmarkPayload(repeticoes: int) -> dict:
+    instante = agora()
+
+    def montaDicionarios(n):
+        for i in range(n):
+            {'variable': 'Temperatura', 'value': round(20.0 + i % 7, 2), 'unit': 'C', 'time': instante}
+
+    def montaLeituras(n):
+        for i in range(n):
+            Leitura('Temperatura', round(20.0 + i % 7, 2), 'C', instante)
+
+    lote = [{'variable': 'Temperatura', 'value': 20.0 + i % 7, 'unit': 'C', 'time': instante + i * 10**9}
+            for i in range(1000)]
+    leituras = [Leitura(**dados) for dados in lote]
+    serializador = SerializadorTagoIO()
+
+    def serializa(n):
+        for _ in range(n // 1000 or 1):
+            json.dumps(formataDados(lote)).encode()
+
+    def serializaLeituras(n):
+        for _ in range(n // 1000 or 1):
+            serializador.serializa(leituras)
+
+    return {
+        "dicionarios": {"leituras_por_segundo": repeticoes / _cronometra(montaDicionarios, repeticoes)},
+        "leituras": {"leituras_por_segundo": repeticoes / _cronometra(montaLeituras, repeticoes)},
+        "serializacao": {"leituras_por_segundo": max(repeticoes, 1000) / _cronometra(serializa, repeticoes)},
+        "serializador": {"leituras_por_segundo": max(repeticoes, 1000) / _cronometra(serializaLeituras, repeticoes)},
+    }
+
+
+def benchmarkEnvio(leituras: int, url: str) -> dict:
+    resultados = {}
+    instante = agora()
+    dados = {'variable': 'Temperatura', 'value': 21.5, 'unit': 'C', 'time': instante}
+    for modo, tamanhoLote in (("conexao_nova", 1), ("persistente", 1), ("lote_100", 100)):
+        sensor = Termometro(token="benchmark", url=url, tamanhoLote=tamanhoLote)
+        latencias = []
+        inicio = time.perf_counter()
+        for _ in range(leituras):
+            if modo == "conexao_nova" and sensor.conexao is not None:
+                sensor.conexao.fecha()
+            antes = time.perf_counter()
+            resultado = sensor.enviaDados(dict(dados))
+            if resultado is not None:
+                latencias.append(time.perf_counter() - antes)
+        sensor.encerra()
+        duracao = time.perf_counter() - inicio
+        resultados[modo] = {
+            "leituras_por_segundo": leituras / duracao,
+            "latencia_p99_ms": _percentil(latencias, 0.99) * 1000 if latencias else None,
+        }
+    return resultados
+
+
+def benchmarkPolitica(leituras: int, servidor: ServidorSimulado) -> dict:
+    resultados = {}
+    instante = agora()
+    for nome, politica in (("sem_compressao", None), ("gzip", PoliticaEnvio(compressao="gzip")),
+                           ("deflate", PoliticaEnvio(compressao="deflate")),
+                           ("adaptativo", PoliticaEnvio(compressao="gzip", adaptativo=True, tamanhoLote=10))):
+        sensor = Termometro(token="benchmark", url=servidor.url, tamanhoLote=500, politica=politica)
+        servidor.zera()
+        inicio = time.perf_counter()
+        for i in range(leituras):
+            sensor.enviaDados(Leitura('Temperatura', round(20.0 + (i % 600) / 100, 2), 'C', instante + i * 10**8))
+        sensor.encerra()
+        duracao = time.perf_counter() - inicio
+        resultados[nome] = {
+            "leituras_por_segundo": leituras / duracao,
+            "bytes_por_leitura": servidor.bytes / leituras,
+        }
+        if politica is not None and politica.adaptativo:
+            resultados[nome]["tamanho_lote_final"] = sensor.tamanhoLote
+    return resultados
+
+
+def benchmarkEstresse(leituras: int, dispositivos: int = 20) -> dict:
+    # Envio em lotes com latência exponencial, erros HTTP 500 e conexões derrubadas; os dados
+    # guardados pelo servidor conferem que cada leitura chegou exatamente uma vez.
+    servidor = ServidorSimulado(latencia="exponencial:0.001", taxaErros=0.05, taxaDesconexoes=0.01, semente=0)
+    servidor.inicia()
+    try:
+        instante = agora()
+        sensores = [Termometro(token=f"estresse-{i}", url=servidor.url, tamanhoLote=100) for i in range(dispositivos)]
+        for sensor in sensores:
+            sensor.reenvio.esperaInicial = sensor.reenvio.esperaMaxima = 0.01
+        inicio = time.perf_counter()
+        for i in range(leituras):
+            sensores[i % dispositivos].enviaDados(Leitura('Temperatura', i, 'C', instante))
+        while any(sensor.fila or len(sensor.reenvio) for sensor in sensores):
+            time.sleep(0.01)
+            for sensor in sensores:
+                sensor.descarrega()
+        duracao = time.perf_counter() - inicio
+        for sensor in sensores:
+            sensor.encerra()
+        valores = [registro["value"] for _, registros in servidor.recebidos for registro in registros]
+        return {
+            "leituras_por_segundo": leituras / duracao,
+            "entregues": len(set(valores)) / leituras,
+            "duplicadas": len(valores) - len(set(valores)),
+            "respostas": {str(status): quantidade for status, quantidade in servidor.respostas.items()},
+        }
+    finally:
+        servidor.para()
+
+
+def benchmarkLimite(segundos: float, dispositivos: int = 20, taxa: float = 50) -> dict:
+    # Cada dispositivo gera taxa leituras/s, uma requisição por leitura, contra um servidor que
+    # aceita 5 requisições/s por token e 50 no total: acima do limite, os envios se juntam em lotes.
+    resultados = {}
+    for nome, limitador in (("retry_after", None), ("limitador", LimitadorEnvio(taxaPorToken=5, taxaGlobal=50))):
+        servidor = ServidorSimulado(limitePorToken=5, limiteGlobal=50, registra=False)
+        servidor.inicia()
+        try:
+            instante = agora()
+            sensores = [Termometro(token=f"limite-{i}", url=servidor.url, limitador=limitador) for i in range(dispositivos)]
+            inicio = time.perf_counter()
+            i = 0
+            while time.perf_counter() - inicio < segundos:
+                for sensor in sensores:
+                    sensor.enviaDados(Leitura('Temperatura', i, 'C', instante))
+                    sensor.descarregaSeVencido()
+                i += 1
+                time.sleep(1 / taxa)
+            duracao = time.perf_counter() - inicio
+            estatisticas = servidor.estatisticas()
+            for sensor in sensores:
+                sensor.encerra()
+            resultados[nome] = {
+                "leituras_por_segundo": estatisticas["leituras"] / duracao,
+                "requisicoes_por_segundo": estatisticas["requisicoes"] / duracao,
+                "respostas_limitadas": estatisticas["respostas"].get(429, 0),
+            }
+        finally:
+            servidor.para()
+    return resultados
+
+
+async def _cargaServidor(url: str, conexoes: int, requisicoes: int, profundidade: int = 16) -> None:
+    host, porta = url.rsplit("/", 1)[-1].split(":")
+    corpo = b'{"variable": "Temperatura", "value": 21.5, "unit": "C"}'
+    requisicao = (b"POST /data HTTP/1.1\r\nHost: %s\r\nDevice-Token: carga\r\nContent-Type: application/json\r\n"
+                  b"Content-Length: %d\r\n\r\n%s" % (host.encode(), len(corpo), corpo))
+
+    async def cliente():
+        leitor, escritor = await asyncio.open_connection(host, int(porta))
+        for _ in range(requisicoes // profundidade):
+            # Requisições em sequência na mesma conexão (pipelining), como um cliente sob carga.
+            escritor.write(requisicao * profundidade)
+            for _ in range(profundidade):
+                cabecalho = await leitor.readuntil(b"\r\n\r\n")
+                tamanho = int(cabecalho.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+                await leitor.readexactly(tamanho)
+        escritor.close()
+
+    await asyncio.gather(*(cliente() for _ in range(conexoes)))
+
+
+def benchmarkServidor(requisicoes: int, conexoes: int = 20) -> dict:
+    # Capacidade do ServidorSimulado: o cliente roda no mesmo processo, então o valor é um piso.
+    servidor = ServidorSimulado(registra=False)
+    servidor.inicia()
+    try:
+        inicio = time.perf_counter()
+        asyncio.run(_cargaServidor(servidor.url, conexoes, requisicoes // conexoes))
+        duracao = time.perf_counter() - inicio
+        return {"requisicoes_por_segundo": servidor.requisicoes / duracao}
+    finally:
+        servidor.para()
+
+
+def _tickFrota(dispositivo) -> dict:
+    try:
+        return dispositivo.geraDados()
+    except Outlier:
+        return None
+
+
+def benchmarkFrota(tamanho: int, execucoes: int) -> dict:
+    random.seed(tamanho)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    dispositivos = []
+    for i in range(tamanho):
+        dispositivos.append(SENSORES[i % len(SENSORES)](token=f"benchmark-{i}", tamanhoLote=10, transporte="nulo"))
+    memoria = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+
+    escalonador = Escalonador()
+    for dispositivo in dispositivos:
+        escalonador.adiciona(dispositivo, _tickFrota, intervalo=0.01, execucoes=execucoes)
+    inicio = time.perf_counter()
+    asyncio.run(escalonador.executa())
+    duracao = time.perf_counter() - inicio
+    return {
+        "leituras_por_segundo": tamanho * execucoes / duracao,
+        "bytes_por_dispositivo": memoria / tamanho,
+        "segundos": duracao,
+    }
+
+
+def benchmarkVirtual(tamanho: int, horas: float = 24, fusao: int = 1) -> dict:
+    intervalo = 60
+    execucoes = int(horas * 3600 // intervalo)
+    anterior = Relogio.define(Relogio.RelogioVirtual())
+    try:
+        escalonador = Escalonador(fusao=fusao)
+        for i in range(tamanho):
+            dispositivo = SENSORES[i % len(SENSORES)](token=f"benchmark-{i}", tamanhoLote=10, transporte="nulo", semente=0)
+            escalonador.adiciona(dispositivo, _tickFrota, intervalo=intervalo, execucoes=execucoes)
+        inicio = time.perf_counter()
+        asyncio.run(escalonador.executa())
+        duracao = time.perf_counter() - inicio
+    finally:
+        Relogio.define(anterior)
+    return {
+        "leituras_por_segundo": tamanho * execucoes / duracao,
+        "dias_por_segundo": horas / 24 / duracao,
+        "segundos": duracao,
+    }
+
+
+def _importaEmProcessoNovo(codigo: str) -> tuple:
+    script = (
+        "import sys, time, json\n"
+        "inicio = time.perf_counter()\n"
+        f"{codigo}\n"
+        "duracao = time.perf_counter() - inicio\n"
+        f"print(json.dumps([duracao, [m for m in {MODULOS_REDE!r} if m in sys.modules]]))\n"
+    )
+    saida = subprocess.run([sys.executable, "-c", script], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return tuple(json.loads(saida.stdout.splitlines()[-1]))
+
+
+def benchmarkImportacao(rodadas: int = 5) -> dict:
+    casos = {
+        "pacote": "import Dispositivos",
+        "termometro": "from Dispositivos.Termometro import Termometro",
+        "main": "import main",
+        "geracao_offline": (
+            "from Dispositivos.Termometro import Termometro\n"
+            "t = Termometro(token='x', tamanhoLote=10, transporte='nulo')\n"
+            "for _ in range(100):\n"
+            "    t.enviaDados({'variable': 'Temperatura', 'value': 20.0, 'unit': 'C', 'time': 0})"
+        ),
+    }
+    resultados = {}
+    for nome, codigo in casos.items():
+        medidas = [_importaEmProcessoNovo(codigo) for _ in range(rodadas)]
+        resultados[nome] = {"segundos": min(duracao for duracao, _ in medidas), "modulos_rede": medidas[0][1]}
+    return resultados
+
+
+def benchmarkInicializacao(tamanho: int) -> dict:
+    inicio = time.perf_counter()
+    frota = montaFrota({
+        "padrao": {"intervalo": 10},
+        "grupos": [{"tipo": classe.__name__, "tokens": classe.__name__ + "-{:06d}", "quantidade": tamanho // len(SENSORES)}
+                   for classe in SENSORES],
+    })
+    escalonador = Escalonador()
+    frota.agenda(escalonador, {classe.__name__: _tickFrota for classe in SENSORES})
+    return {"segundos": time.perf_counter() - inicio, "dispositivos": len(frota)}
+
+
+def benchmarkParalelo(tamanho: int, execucoes: int) -> dict:
+    resultados = {}
+    for processos in sorted({1, os.cpu_count() or 1}):
+        escalonador = EscalonadorParalelo(processos=processos, intervaloEstatisticas=0.5)
+        for i in range(tamanho):
+            dispositivo = SENSORES[i % len(SENSORES)](token=f"benchmark-{i}", tamanhoLote=execucoes, transporte="nulo")
+            escalonador.adiciona(dispositivo, _tickFrota, intervalo=0.01, execucoes=execucoes)
+        inicio = time.perf_counter()
+        escalonador.executa()
+        resultados[str(processos)] = {"leituras_por_segundo": tamanho * execucoes / (time.perf_counter() - inicio)}
+    return resultados
+
+
+def benchmarkGravacao(leituras: int, tamanhoFrota: int) -> dict:
+    resultados = {}
+    diretorio = tempfile.mkdtemp(prefix="benchmark-gravacao-")
+    try:
+        gravador = GravadorColunar(os.path.join(diretorio, "leituras"))
+        instante = agora()
+        inicio = time.perf_counter()
+        for i in range(leituras):
+            gravador.grava(f"benchmark-{i % 1000}", "Temperatura", 20.0 + i % 7, "C", instante + i)
+        gravador.fecha()
+        duracao = time.perf_counter() - inicio
+        resultados["leitura_a_leitura"] = {
+            "leituras_por_segundo": leituras / duracao,
+            "bytes_por_leitura": sum(os.path.getsize(arquivo) for arquivo in gravador.arquivos) / leituras,
+        }
+        reproducao = Reproducao(gravador.arquivos, velocidade=MAXIMO, transporte="nulo", tamanhoLote=100).executa()
+        resultados["reproducao"] = {"leituras_por_segundo": reproducao["leituras"] / reproducao["segundos"]}
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return resultados
+        from Dispositivos.Frota import FrotaSensores
+        frota = FrotaSensores(semente=0)
+        for classe in SENSORES[:-1]:
+            frota.adiciona(classe, [f"{classe.__name__}-{i}" for i in range(tamanhoFrota // 6)])
+        gravador = GravadorColunar(os.path.join(diretorio, "frota"))
+        gravadas = 0
+        inicio = time.perf_counter()
+        for _ in range(10):
+            lotes = frota.passo()
+            gravador.gravaFrota(frota, lotes)
+            gravadas += sum(int(lote.aceitos.sum()) for lote in lotes)
+        gravador.fecha()
+        duracao = time.perf_counter() - inicio
+        resultados["frota"] = {
+            "leituras_por_segundo": gravadas / duracao,
+            "bytes_por_leitura": sum(os.path.getsize(arquivo) for arquivo in gravador.arquivos) / gravadas,
+        }
+    finally:
+        shutil.rmtree(diretorio)
+    return resultados
+
+
+def benchmarkNumpy(leituras: int, tamanhoFrota: int) -> dict:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return {}
+    from Dispositivos.Frota import FrotaSensores
+    resultados = {}
+    for classe in SENSORES[:-1]:
+        sensor = classe(token="benchmark")
+        duracao = _cronometra(lambda n, sensor=sensor: sensor.geraLote(n, semente=0), leituras)
+        resultados[f"geraLote_{classe.__name__}"] = {"leituras_por_segundo": leituras / duracao}
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    frota = FrotaSensores(semente=0)
+    for classe in SENSORES[:-1]:
+        frota.adiciona(classe, [f"{classe.__name__}-{i}" for i in range(tamanhoFrota)])
+    memoria = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    passos = 10
+    duracao = _cronometra(lambda n: [frota.passo() for _ in range(n)], passos)
+    resultados["frota_colunar"] = {
+        "leituras_por_segundo": len(frota) * passos / duracao,
+        "bytes_por_dispositivo": memoria / len(frota),
+    }
+    return resultados
+
+
+def executa(rapido: bool = False) -> dict:
+    """
+    Executa todos os benchmarks.
+
+    Parâmetros
+    ----------
+        - rapido (bool): Usa tamanhos reduzidos (para verificação rápida).
+            Padrão = False.
+
+    Retorna
+    -------
+        dict: Os resultados por grupo de benchmark, com informações do ambiente.
+    """
+    random.seed(0)
+    escala = 10 if rapido else 1
+    servidor = ServidorSimulado(registra=False)
+    url = servidor.inicia()
+    try:
+        resultados = {
+            "ambiente": {"python": platform.python_version(), "plataforma": platform.platform(),
+                         "nucleos": os.cpu_count(), "instante": time.time()},
+            "geraDados": benchmarkGeraDados(200_000 // escala),
+            "outlier": benchmarkOutlier(200_000 // escala),
+            "aleatorio": benchmarkAleatorio(200_000 // escala),
+            "payload": benchmarkPayload(200_000 // escala),
+            "envio": benchmarkEnvio(2_000 // escala, url),
+            "politica": benchmarkPolitica(200_000 // escala, servidor),
+            "estresse": benchmarkEstresse(50_000 // escala),
+            "limite": benchmarkLimite(1 if rapido else 4),
+            "servidor": benchmarkServidor(200_000 // escala),
+            "frota": {str(tamanho): benchmarkFrota(tamanho, execucoes=3)
+                      for tamanho in ((10, 1_000, 10_000) if rapido else (10, 1_000, 100_000))},
+            "virtual": {str(fusao): benchmarkVirtual(1_000 // escala, fusao=fusao) for fusao in (1, 100)},
+            "importacao": benchmarkImportacao(),
+            "inicializacao": benchmarkInicializacao(100_000 // escala),
+            "paralelo": benchmarkParalelo(20_000 // escala, execucoes=5),
+            "gravacao": benchmarkGravacao(1_000_000 // escala, 600_000 // escala),
+            "numpy": benchmarkNumpy(1_000_000 // escala, 100_000 // escala),
+        }
+    finally:
+        servidor.para()
+    return resultados
+
+
+def compara(atual: dict, anterior: dict, tolerancia: float, caminho: str = "") -> list:
+    """
+    Lista as métricas que pioraram mais do que a tolerância em relação a uma execução anterior.
+
+    Retorna
+    -------
+        list: Linhas de texto descrevendo cada regressão.
+    """
+    regressoes = []
+    for chave, valor in atual.items():
+        if chave == "ambiente" or chave not in anterior:
+            continue
+        nome = f"{caminho}.{chave}" if caminho else chave
+        if isinstance(valor, dict):
+            regressoes += compara(valor, anterior[chave], tolerancia, nome)
+        elif isinstance(valor, (int, float)) and anterior[chave]:
+            variacao = (valor - anterior[chave]) / anterior[chave]
+            if chave in MENOR_MELHOR:
+                variacao = -variacao
+            if variacao < -tolerancia:
+                regressoes.append(f"{nome}: {anterior[chave]:.4g} -> {valor:.4g} ({variacao:+.1%})")
+    return regressoes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks do pacote Dispositivos")
+    parser.add_argument("--saida", help="grava os resultados neste arquivo JSON")
+    parser.add_argument("--compara", help="compara os resultados com este arquivo JSON")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="piora relativa tolerada (padrão 0.2)")
+    parser.add_argument("--rapido", action="store_true", help="usa tamanhos reduzidos")
+    argumentos = parser.parse_args()
+
+    resultados = executa(rapido=argumentos.rapido)
+    print(json.dumps(resultados, indent=2, ensure_ascii=False))
+    if argumentos.saida:
+        with open(argumentos.saida, "w") as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+    if argumentos.compara:
+        with open(argumentos.compara) as arquivo:
+            regressoes = compara(resultados, json.load(arquivo), argumentos.tolerancia)
+        for linha in regressoes:
+            print("REGRESSÃO", linha)
+        sys.exit(1 if regressoes else 0)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Permite executar "pytest" na raiz do repositório sem instalar o pacote Dispositivos.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,55 @@
+import pickle
+from collections import Counter
+from Dispositivos.Aleatorio import TAMANHO_BLOCO, FluxoAleatorio, chaveDispositivo
+from Dispositivos.SensorAgua import SensorAgua
+from Dispositivos.Termometro import Termometro
+
+
+def _sorteios(fluxo: FluxoAleatorio, n: int = 100) -> list:
+    return [(fluxo.random(), fluxo.uniform(10, 20), fluxo.randint(0, 100), fluxo.inteiro64()) for _ in range(n)]
+
+
+def test_mesma_semente_e_token_repetem_o_fluxo():
+    assert _sorteios(FluxoAleatorio.doDispositivo("a", 42)) == _sorteios(FluxoAleatorio.doDispositivo("a", 42))
+    assert _sorteios(FluxoAleatorio.doDispositivo("a", 42)) != _sorteios(FluxoAleatorio.doDispositivo("b", 42))
+    assert _sorteios(FluxoAleatorio.doDispositivo("a", 42)) != _sorteios(FluxoAleatorio.doDispositivo("a", 43))
+    assert _sorteios(FluxoAleatorio.doDispositivo("a")) != _sorteios(FluxoAleatorio.doDispositivo("a"))
+
+
+def test_valores_conhecidos():
+    # Fixam o formato do fluxo: a mesma semente precisa dar os mesmos números em qualquer plataforma.
+    assert chaveDispositivo(42, "a").hex() == "e7b79a286183f38cf933954ac5f3be9c"
+    assert chaveDispositivo("42", "a") == chaveDispositivo(42, "a")
+    fluxo = FluxoAleatorio(chaveDispositivo(42, "a"))
+    assert fluxo.inteiro64() == 443657301174611424
+    assert fluxo.randint(0, 100) == 5
+    numeros = [fluxo.inteiro64() for _ in range(TAMANHO_BLOCO)]
+    assert fluxo.bloco == 2 and len(set(numeros)) == TAMANHO_BLOCO
+
+
+def test_faixas_e_distribuicao():
+    fluxo = FluxoAleatorio.doDispositivo("faixas", 1)
+    contagem = Counter(fluxo.randint(0, 9) for _ in range(20000))
+    assert set(contagem) == set(range(10))
+    assert all(1700 < quantidade < 2300 for quantidade in contagem.values())
+    uniformes = [fluxo.uniform(-1, 1) for _ in range(20000)]
+    assert all(-1 <= valor <= 1 for valor in uniformes)
+    assert abs(sum(uniformes) / len(uniformes)) < 0.03
+    assert all(0 <= fluxo.random() < 1 for _ in range(1000))
+
+
+def test_fluxo_continua_depois_do_pickle():
+    fluxo = FluxoAleatorio.doDispositivo("p", 7)
+    _sorteios(fluxo, 5)
+    copia = pickle.loads(pickle.dumps(fluxo))
+    assert _sorteios(copia) == _sorteios(fluxo)
+
+
+def test_sensores_com_a_mesma_semente():
+    def leituras(semente):
+        sensores = [Termometro(f"t{i}", transporte="nulo", semente=semente) for i in range(5)]
+        sensores.append(SensorAgua("a", transporte="nulo", semente=semente))
+        return [(s.temperaturaAtual if isinstance(s, Termometro) else s.nivelAtual, s.criaOutlier()) for s in sensores]
+
+    assert leituras(9) == leituras(9)
+    assert leituras(9) != leituras(10)
@@ -0,0 +1,32 @@
+import importlib.util
+import os
+
+_CAMINHO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "benchmark.py")
+_especificacao = importlib.util.spec_from_file_location("benchmark", _CAMINHO)
+benchmark = importlib.util.module_from_spec(_especificacao)
+_especificacao.loader.exec_module(benchmark)
+
+
+def test_compara_aponta_so_as_regressoes():
+    anterior = {
+        "ambiente": {"python": "3.10"},
+        "geraDados": {"Termometro": {"leituras_por_segundo": 1000}, "SensorAgua": {"leituras_por_segundo": 1000}},
+        "envio": {"persistente": {"latencia_p99_ms": 10, "leituras_por_segundo": 500}},
+        "removido": {"x": 1},
+    }
+    atual = {
+        "ambiente": {"python": "3.11"},
+        "geraDados": {"Termometro": {"leituras_por_segundo": 700}, "SensorAgua": {"leituras_por_segundo": 900}},
+        "envio": {"persistente": {"latencia_p99_ms": 13, "leituras_por_segundo": 600}},
+        "novo": {"x": 1},
+    }
+    regressoes = benchmark.compara(atual, anterior, tolerancia=0.2)
+    assert [linha.split(":")[0] for linha in regressoes] == [
+        "geraDados.Termometro.leituras_por_segundo",
+        "envio.persistente.latencia_p99_ms",
+    ]
+    assert benchmark.compara(atual, anterior, tolerancia=0.5) == []
+
+
+def test_compara_ignora_base_zerada():
+    assert benchmark.compara({"a": {"segundos": 5}}, {"a": {"segundos": 0}}, tolerancia=0.1) == []
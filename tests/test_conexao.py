@@ -0,0 +1,73 @@
+import time
+import pytest
+from Dispositivos.Conexao import ConexaoTagoIO
+from Dispositivos.Termometro import Termometro
+from Dispositivos.Leitura import Leitura
+from Dispositivos.PoliticaEnvio import PoliticaEnvio
+from Dispositivos.ServidorSimulado import ServidorSimulado
+from Dispositivos.Transporte import LimiteRequisicoes
+
+
+def test_reaproveita_a_conexao_entre_envios():
+    with ServidorSimulado() as servidor:
+        conexao = ConexaoTagoIO("token", servidor.url)
+        for valor in range(5):
+            assert conexao.sendData({"variable": "x", "value": valor}) == "1 Data Added"
+        conexao.fecha()
+        conexao.sendData({"variable": "x", "value": 5})
+        assert servidor.requisicoes == 6
+        assert servidor.conexoes == 2
+        assert [registros[0]["value"] for _, registros in servidor.recebidos] == list(range(6))
+
+
+def test_envia_lista_de_leituras():
+    with ServidorSimulado() as servidor:
+        conexao = ConexaoTagoIO("token", servidor.url)
+        leituras = [Leitura("temperatura", 21.5, "C", time.time_ns()), {"variable": "umidade", "value": 40}]
+        assert conexao.sendData(leituras) == "2 Data Added"
+        token, registros = servidor.recebidos[0]
+        assert token == "token"
+        assert registros[0]["variable"] == "temperatura" and registros[0]["value"] == 21.5
+        assert isinstance(registros[0]["time"], str)
+        assert registros[1] == {"variable": "umidade", "value": 40}
+
+
+def test_limite_de_requisicoes():
+    with ServidorSimulado(limitePorToken=1, rajada=1) as servidor:
+        conexao = ConexaoTagoIO("token", servidor.url)
+        conexao.sendData({"variable": "x", "value": 1})
+        with pytest.raises(LimiteRequisicoes) as excecao:
+            conexao.sendData({"variable": "x", "value": 2})
+        assert excecao.value.espera >= 1
+        assert servidor.respostas[429] == 1
+
+
+def test_erro_do_servidor():
+    with ServidorSimulado(taxaErros=1.0) as servidor:
+        conexao = ConexaoTagoIO("token", servidor.url)
+        with pytest.raises(Exception, match="Internal server error"):
+            conexao.sendData({"variable": "x", "value": 1})
+
+
+def test_dispositivo_envia_em_lotes():
+    with ServidorSimulado() as servidor:
+        dispositivo = Termometro("lote", url=servidor.url, tamanhoLote=100,
+                                  politica=PoliticaEnvio(compressao="gzip", compressaoMinima=0))
+        for valor in range(250):
+            dispositivo.enviaDados(Leitura("x", valor, "u", time.time_ns()))
+        dispositivo.encerra()
+        assert servidor.porToken["lote"] == 250
+        assert servidor.requisicoes == 3
+        assert servidor.conexoes == 1
+        assert [registro["value"] for _, registros in servidor.recebidos for registro in registros] == list(range(250))
+
+
+def test_reconecta_quando_o_servidor_fecha_a_conexao():
+    servidor = ServidorSimulado()
+    url = servidor.inicia()
+    conexao = ConexaoTagoIO("token", url)
+    conexao.sendData({"variable": "x", "value": 1})
+    servidor.para()
+    with ServidorSimulado(porta=int(url.rsplit(":", 1)[1])) as novo:
+        assert conexao.sendData({"variable": "x", "value": 2}) == "1 Data Added"
+        assert novo.conexoes == 1
@@ -0,0 +1,89 @@
+import datetime
+import json
+import pytest
+from Dispositivos.ConfiguracaoFrota import carregaFrota, montaFrota
+
+yaml = pytest.importorskip("yaml")
+
+YAML = """
+tipos:
+  SensorMovimento:
+    horarioInicial: 8:30
+    diferencaTempoFinal: 2:00
+    janelas: [[22:00, 1:30], [6:00, 5400]]
+grupos:
+  - tipo: SensorMovimento
+    tokens: [a]
+"""
+
+YAML_COM_ASPAS = """
+tipos:
+  SensorMovimento:
+    horarioInicial: "8:30"
+    diferencaTempoFinal: "2:00"
+    janelas: [["22:00", "1:30"], ["6:00", 5400]]
+grupos:
+  - tipo: SensorMovimento
+    tokens: [a]
+"""
+
+
+def _grupo(configuracao: dict):
+    return montaFrota(configuracao).grupos[0].parametros
+
+
+def test_yaml_le_horarios_e_duracoes_sem_aspas(tmp_path):
+    caminho = tmp_path / "frota.yaml"
+    caminho.write_text(YAML)
+    parametros = carregaFrota(str(caminho)).grupos[0].parametros
+    assert parametros["horarioInicial"] == datetime.time(8, 30)
+    assert parametros["diferencaTempoFinal"] == datetime.timedelta(hours=2)
+    assert parametros["janelas"] == [(datetime.time(22), datetime.time(1, 30)),
+                                     (datetime.time(6), datetime.timedelta(seconds=5400))]
+
+
+def test_yaml_com_aspas_e_igual_a_sem_aspas(tmp_path):
+    semAspas = tmp_path / "sem.yaml"
+    semAspas.write_text(YAML)
+    comAspas = tmp_path / "com.yaml"
+    comAspas.write_text(YAML_COM_ASPAS)
+    assert carregaFrota(str(semAspas)).grupos[0].parametros == carregaFrota(str(comAspas)).grupos[0].parametros
+
+
+def test_yaml_mantem_os_demais_numeros(tmp_path):
+    caminho = tmp_path / "frota.yaml"
+    caminho.write_text("padrao: {intervalo: 1.5, execucoes: 10}\ngrupos: [{tipo: Termometro, tokens: [a]}]\n")
+    grupo = carregaFrota(str(caminho)).grupos[0]
+    assert grupo.intervalo == 1.5 and grupo.execucoes == 10
+
+
+@pytest.mark.parametrize("duracao, esperado", [
+    (120, datetime.timedelta(seconds=120)),
+    ("2:00", datetime.timedelta(hours=2)),
+    ("01:30:15", datetime.timedelta(hours=1, minutes=30, seconds=15)),
+    ("26:00", datetime.timedelta(hours=26)),
+])
+def test_duracoes(duracao, esperado):
+    parametros = _grupo({"grupos": [{"tipo": "SensorMovimento", "tokens": ["a"], "diferencaTempoFinal": duracao}]})
+    assert parametros["diferencaTempoFinal"] == esperado
+
+
+@pytest.mark.parametrize("chave, valor", [
+    ("horarioInicial", 960),
+    ("horarioInicial", "16h"),
+    ("horarioInicial", "16:75"),
+    ("diferencaTempoFinal", "duas horas"),
+    ("diferencaTempoFinal", True),
+])
+def test_valores_invalidos(chave, valor):
+    with pytest.raises(ValueError):
+        _grupo({"grupos": [{"tipo": "SensorMovimento", "tokens": ["a"], chave: valor}]})
+
+
+def test_json_e_yaml_dao_a_mesma_frota(tmp_path):
+    configuracao = yaml.safe_load(YAML_COM_ASPAS)
+    caminhoJson = tmp_path / "frota.json"
+    caminhoJson.write_text(json.dumps(configuracao))
+    caminhoYaml = tmp_path / "frota.yaml"
+    caminhoYaml.write_text(YAML)
+    assert carregaFrota(str(caminhoJson)).grupos[0].parametros == carregaFrota(str(caminhoYaml)).grupos[0].parametros
@@ -0,0 +1,93 @@
+import pytest
+from Dispositivos import Relogio
+from Dispositivos.Dispositivo import Dispositivo, Outlier, coletaDados
+from Dispositivos.Metricas import RegistroMetricas
+from Dispositivos.Relogio import RelogioVirtual
+from Dispositivos.Transporte import TRANSPORTES, registraTransporte
+
+
+class SensorTeste(Dispositivo):
+    def __init__(self, token: str, leituras: list, transporte: str = "nulo", **kwargs) -> None:
+        super().__init__(token, transporte=transporte, **kwargs)
+        self.leituras = list(leituras)
+        self.metricas = RegistroMetricas()
+
+    def geraDados(self):
+        leitura = self.leituras.pop(0)
+        if isinstance(leitura, Exception):
+            raise leitura
+        return leitura
+
+
+def test_geraDados_e_abstrato():
+    with pytest.raises(TypeError):
+        Dispositivo("abstrato")
+
+
+def test_coleta_conta_leituras_outliers_e_erros():
+    sensor = SensorTeste("s", [{"value": 1}, Outlier("fora da faixa"), None, KeyError("parametro")])
+    assert coletaDados(sensor) == {"value": 1}
+    assert coletaDados(sensor) is None
+    assert coletaDados(sensor) is None
+    with pytest.raises(KeyError):
+        coletaDados(sensor)
+    assert sensor.metricas.instantaneo()["SensorTeste"] == {"leituras": 1, "outliers": 1, "erros": 1}
+
+
+class TransporteMemoria():
+    requisicoes = []
+
+    def __init__(self, token: str, url: str = None) -> None:
+        self.token = token
+
+    def sendData(self, dados) -> str:
+        TransporteMemoria.requisicoes.append(list(dados))
+        return f"{len(dados)} Data Added"
+
+    def fecha(self) -> None:
+        pass
+
+
+@pytest.fixture
+def transporteMemoria():
+    TransporteMemoria.requisicoes = []
+    registraTransporte("memoria", TransporteMemoria)
+    yield TransporteMemoria.requisicoes
+    del TRANSPORTES["memoria"]
+
+
+@pytest.fixture
+def relogioVirtual():
+    relogio = RelogioVirtual()
+    anterior = Relogio.define(relogio)
+    yield relogio
+    Relogio.define(anterior)
+
+
+def test_envia_um_lote_a_cada_tamanhoLote(transporteMemoria):
+    sensor = SensorTeste("lote", [], tamanhoLote=10, transporte="memoria")
+    resultados = [sensor.enviaDados({"value": valor}) for valor in range(25)]
+    assert [resultado for resultado in resultados if resultado is not None] == ["10 Data Added"] * 2
+    assert [len(lote) for lote in transporteMemoria] == [10, 10]
+    sensor.encerra()
+    assert [dados["value"] for lote in transporteMemoria for dados in lote] == list(range(25))
+
+
+def test_envia_o_lote_vencido(transporteMemoria, relogioVirtual):
+    sensor = SensorTeste("idade", [], tamanhoLote=100, idadeMaximaLote=1000, transporte="memoria")
+    sensor.enviaDados({"value": 0})
+    relogioVirtual.avanca(0.5)
+    sensor.enviaDados({"value": 1})
+    assert not sensor.envioPendente()
+    assert sensor.descarregaSeVencido() is None
+    assert transporteMemoria == []
+    relogioVirtual.avanca(0.5)
+    assert sensor.envioPendente()
+    assert sensor.descarregaSeVencido() == "2 Data Added"
+    assert transporteMemoria == [[{"value": 0}, {"value": 1}]]
+    # Um novo lote conta a idade a partir do seu primeiro item.
+    sensor.enviaDados({"value": 2})
+    relogioVirtual.avanca(0.9)
+    assert sensor.descarregaSeVencido() is None
+    relogioVirtual.avanca(0.1)
+    assert sensor.enviaDados({"value": 3}) == "2 Data Added"
@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import time
+import pytest
+from Dispositivos import Relogio
+from Dispositivos.Dispositivo import Dispositivo
+from Dispositivos.Escalonador import Escalonador, faseInicial, intervaloDaFabrica
+from Dispositivos.Relogio import RelogioVirtual
+
+
+class SensorContador(Dispositivo):
+    intervalo = 5
+
+    def __init__(self, token: str, **kwargs) -> None:
+        super().__init__(token, transporte="nulo", **kwargs)
+        self.instantes = []
+
+    def geraDados(self):
+        self.instantes.append(Relogio.atual.monotonico())
+        return None
+
+
+def registra(dispositivo: SensorContador):
+    return dispositivo.geraDados()
+
+
+def falha(dispositivo: SensorContador):
+    dispositivo.geraDados()
+    raise RuntimeError(dispositivo.token)
+
+
+@pytest.fixture
+def relogioVirtual():
+    relogio = RelogioVirtual()
+    anterior = Relogio.define(relogio)
+    yield relogio
+    Relogio.define(anterior)
+
+
+def _executa(escalonador: Escalonador) -> list:
+    # Executa o escalonador em um loop novo, devolvendo as mensagens de erro reportadas ao loop.
+    erros = []
+    loop = asyncio.new_event_loop()
+    loop.set_exception_handler(lambda _, contexto: erros.append(str(contexto["exception"])))
+    try:
+        loop.run_until_complete(escalonador.executa())
+    finally:
+        loop.close()
+    return erros
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        Escalonador(politicaAtraso="esperar")
+    with pytest.raises(ValueError):
+        Escalonador(fusao=0)
+
+
+def test_fases_espalhadas_no_intervalo():
+    fases = sorted(faseInicial(indice, 10) for indice in range(100))
+    assert fases[-1] == 10 and 0 < fases[0]
+    assert max(b - a for a, b in zip(fases, fases[1:])) < 0.3
+
+
+def test_intervalo_da_fabrica():
+    assert intervaloDaFabrica(SensorContador) == 5
+    assert intervaloDaFabrica(functools.partial(SensorContador, token="x")) == 5
+    assert intervaloDaFabrica(functools.partial(SensorContador, token="x", intervalo=2)) == 2
+    assert intervaloDaFabrica(lambda: SensorContador("x")) is None
+
+
+def test_muitos_dispositivos_em_um_loop(relogioVirtual):
+    escalonador = Escalonador()
+    sensores = [SensorContador(f"s{i}") for i in range(500)]
+    for sensor in sensores:
+        escalonador.adiciona(sensor, registra, execucoes=3)
+    pendentes = [functools.partial(SensorContador, token=f"p{i}") for i in range(500)]
+    for fabrica in pendentes:
+        escalonador.adicionaPendente(fabrica, registra, execucoes=3)
+    assert len(escalonador.dispositivos) == 500
+    assert _executa(escalonador) == []
+    assert escalonador.totalExecucoes == 3000
+    assert len(escalonador.dispositivos) == 1000
+    assert all(len(sensor.instantes) == 3 for sensor in escalonador.dispositivos.values())
+    assert relogioVirtual.monotonico() <= 15
+
+
+@pytest.mark.parametrize("fusao", [1, 4])
+def test_erro_de_um_dispositivo_nao_para_os_demais(relogioVirtual, fusao):
+    escalonador = Escalonador(fusao=fusao)
+    falhos = [SensorContador(f"falho{i}") for i in range(2)]
+    sensores = [SensorContador(f"ok{i}") for i in range(3)]
+    for sensor in falhos:
+        escalonador.adiciona(sensor, falha, execucoes=2)
+    for sensor in sensores:
+        escalonador.adiciona(sensor, registra, execucoes=2)
+    assert sorted(_executa(escalonador)) == ["falho0", "falho0", "falho1", "falho1"]
+    assert all(len(sensor.instantes) == 2 for sensor in falhos + sensores)
+
+
+def test_fusao_junta_dispositivos_com_o_mesmo_agendamento(relogioVirtual):
+    escalonador = Escalonador(fusao=4)
+    for i in range(10):
+        escalonador.adicionaPendente(functools.partial(SensorContador, token=f"p{i}"), registra, execucoes=1)
+    escalonador.adiciona(SensorContador("outro"), registra, intervalo=7, execucoes=1)
+    assert sorted(len(entrada[0]) if type(entrada[0]) is list else 1 for _, _, entrada in escalonador.heap) == [1, 2, 4, 4]
+    _executa(escalonador)
+    assert escalonador.totalExecucoes == 11
+
+
+def test_retira_e_recebe(relogioVirtual):
+    origem, destino = Escalonador(), Escalonador()
+    sensores = [SensorContador(f"s{i}") for i in range(10)]
+    for sensor in sensores:
+        origem.adiciona(sensor, registra, execucoes=2)
+    destino.recebe(origem.retira(4))
+    assert len(origem.dispositivos) == 6 and len(destino.dispositivos) == 4
+    _executa(origem)
+    _executa(destino)
+    assert origem.totalExecucoes == 12 and destino.totalExecucoes == 8
+
+
+def test_para_interrompe_o_loop_permanente():
+    escalonador = Escalonador()
+    sensor = SensorContador("s")
+    escalonador.adiciona(sensor, registra, intervalo=0.01)
+
+    async def executa():
+        asyncio.get_running_loop().call_later(0.1, escalonador.para)
+        await escalonador.executa(permanente=True)
+
+    asyncio.run(executa())
+    assert 3 <= len(sensor.instantes) <= 12
+
+
+@pytest.mark.parametrize("politica, esperado", [
+    ("pular", (13, 3)),
+    ("agrupar", (11, 2)),
+    ("recuperar", (7, 0)),
+])
+def test_politicas_de_atraso(politica, esperado):
+    # A execução do prazo 5, com intervalo 2, terminou em 11.5: os prazos 7, 9 e 11 venceram.
+    assert Escalonador(politicaAtraso=politica).proximoPrazo(5, 2, 11.5) == esperado
+
+
+def test_prazo_no_futuro_nao_perde_nada():
+    for politica in ("pular", "agrupar", "recuperar"):
+        assert Escalonador(politicaAtraso=politica).proximoPrazo(5, 2, 6.9) == (7, 0)
+
+
+def test_prazos_absolutos_sem_deriva(relogioVirtual):
+    escalonador = Escalonador(espalhaFases=False)
+    sensor = SensorContador("s")
+    escalonador.adiciona(sensor, registra, intervalo=0.1, execucoes=1000)
+    _executa(escalonador)
+    assert sensor.instantes == [pytest.approx(0.1 * k) for k in range(1, 1001)]
+
+
+def test_tarefa_lenta_nao_atrasa_os_prazos_seguintes():
+    # Em tempo real, 20 execuções de 30 ms com intervalo de 50 ms: sem deriva, a última
+    # começa perto de 20 * 50 ms, e não de 20 * 80 ms.
+    escalonador = Escalonador(espalhaFases=False)
+    sensor = SensorContador("s")
+
+    def lenta(dispositivo):
+        dispositivo.geraDados()
+        time.sleep(0.03)
+
+    escalonador.adiciona(sensor, lenta, intervalo=0.05, execucoes=20)
+    inicio = time.monotonic()
+    _executa(escalonador)
+    assert sensor.instantes[-1] - inicio == pytest.approx(1.0, abs=0.2)
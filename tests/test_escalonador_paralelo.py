@@ -0,0 +1,30 @@
+import os
+import time
+from Dispositivos.EscalonadorParalelo import EscalonadorParalelo
+from Dispositivos.Termometro import Termometro
+
+
+def tarefa(dispositivo):
+    if dispositivo.token == "morre":
+        os._exit(1)
+    return None
+
+
+def test_executa_todos_os_dispositivos():
+    escalonador = EscalonadorParalelo(processos=2, espalhaFases=False, intervaloEstatisticas=0.1)
+    for indice in range(4):
+        escalonador.adiciona(Termometro(token=f"t{indice}", transporte="nulo"), tarefa, intervalo=0.05, execucoes=3)
+    resultado = escalonador.executa()
+    assert resultado["execucoes"] == 12
+    assert resultado["mortos"] == []
+
+
+def test_processo_que_morre_nao_trava_a_execucao():
+    escalonador = EscalonadorParalelo(processos=2, espalhaFases=False, intervaloEstatisticas=0.1)
+    escalonador.adiciona(Termometro(token="vive", transporte="nulo"), tarefa, intervalo=0.05, execucoes=3)
+    escalonador.adiciona(Termometro(token="morre", transporte="nulo"), tarefa, intervalo=0.05, execucoes=3)
+    inicio = time.monotonic()
+    resultado = escalonador.executa()
+    assert time.monotonic() - inicio < 10
+    assert resultado["mortos"] == [1]
+    assert resultado["execucoes"] == 3
@@ -0,0 +1,60 @@
+import threading
+import time
+from Dispositivos.Dispositivo import Dispositivo
+from Dispositivos.ExecutorEnvio import ExecutorEnvio
+
+
+class DispositivoLento(Dispositivo):
+    def __init__(self, token: str, espera: float = 0.0) -> None:
+        super().__init__(token, transporte="nulo")
+        self.espera = espera
+        self.enviados = []
+        self.simultaneos = 0
+        self.maximoSimultaneos = 0
+        self._travaTeste = threading.Lock()
+
+    def geraDados(self):
+        return None
+
+    def enviaDados(self, dados) -> None:
+        with self._travaTeste:
+            self.simultaneos += 1
+            self.maximoSimultaneos = max(self.maximoSimultaneos, self.simultaneos)
+        time.sleep(self.espera)
+        self.enviados.append(dados)
+        with self._travaTeste:
+            self.simultaneos -= 1
+
+
+def test_encerra_sem_iniciar_envia_a_fila():
+    executor = ExecutorEnvio(trabalhadores=2)
+    dispositivo = DispositivoLento("a")
+    for valor in range(3):
+        executor.submete(dispositivo, {"value": valor})
+    executor.encerra()
+    assert [dados["value"] for dados in dispositivo.enviados] == [0, 1, 2]
+    assert not executor.fila and executor.pendentes == 0
+
+
+def test_envia_em_ordem_uma_thread_por_dispositivo():
+    executor = ExecutorEnvio(trabalhadores=4).inicia()
+    dispositivos = [DispositivoLento(f"d{indice}", espera=0.001) for indice in range(3)]
+    for valor in range(30):
+        for dispositivo in dispositivos:
+            executor.submete(dispositivo, {"value": valor})
+    executor.encerra()
+    for dispositivo in dispositivos:
+        assert [dados["value"] for dados in dispositivo.enviados] == list(range(30))
+        assert dispositivo.maximoSimultaneos == 1
+
+
+def test_bloquear_nao_segura_os_outros_dispositivos():
+    executor = ExecutorEnvio(trabalhadores=2, capacidade=2, politica="bloquear").inicia()
+    lento, rapido = DispositivoLento("lento", espera=0.2), DispositivoLento("rapido")
+    executor.submete(lento, {"value": 0})
+    executor.submete(lento, {"value": 1}, espera=False)
+    executor.submete(lento, {"value": 2}, espera=False)
+    assert not executor.aceita(lento)
+    assert executor.aceita(rapido)
+    executor.encerra()
+    assert len(lento.enviados) == 3
@@ -0,0 +1,82 @@
+import os
+import types
+import pytest
+from Dispositivos import FilaReenvio as moduloFila
+from Dispositivos.FilaReenvio import ARQUIVO_POSICAO, EXTENSAO_SEGMENTO, FilaReenvio
+
+
+def itens(inicio: int, fim: int) -> list:
+    return [{"variable": "x", "value": valor} for valor in range(inicio, fim)]
+
+
+def esvazia(fila: FilaReenvio) -> list:
+    enviados = []
+    while len(fila):
+        lote = fila.proximoLote()
+        enviados.extend(item["value"] for item in lote)
+        fila.confirma(len(lote))
+    return enviados
+
+
+def test_sem_diretorio_descarta_os_mais_antigos():
+    fila = FilaReenvio(capacidade=3)
+    fila.adiciona(itens(0, 5))
+    assert len(fila) == 3
+    assert fila.descartados == 2
+    assert esvazia(fila) == [2, 3, 4]
+
+
+def test_transborda_para_o_disco(tmp_path):
+    fila = FilaReenvio(capacidade=10, diretorio=str(tmp_path), tamanhoLote=4)
+    fila.adiciona(itens(0, 35))
+    assert len(fila) == 35
+    assert len(fila.memoria) == 10
+    assert fila.descartados == 0
+    assert len([nome for nome in os.listdir(tmp_path) if nome.endswith(EXTENSAO_SEGMENTO)]) == 4
+    assert esvazia(fila) == list(range(35))
+    assert os.listdir(tmp_path) == []
+
+
+def test_reabre_apos_queda_na_ordem(tmp_path):
+    fila = FilaReenvio(capacidade=10, diretorio=str(tmp_path), tamanhoLote=7)
+    fila.adiciona(itens(0, 25))
+    fila.confirma(len(fila.proximoLote()))
+    # Queda: a fila não é salva nem fechada, e uma gravação ficou pela metade.
+    fila._arquivo.write(b'{"variable": "x", "val')
+    fila._arquivo.flush()
+    reaberta = FilaReenvio(capacidade=6, diretorio=str(tmp_path), tamanhoLote=7)
+    assert len(reaberta) == 18
+    reaberta.adiciona(itens(25, 30))
+    assert esvazia(reaberta) == list(range(7, 30))
+
+
+def test_posicao_truncada_reenvia_desde_o_inicio(tmp_path):
+    fila = FilaReenvio(capacidade=10, diretorio=str(tmp_path), tamanhoLote=5)
+    fila.adiciona(itens(0, 8))
+    fila.confirma(len(fila.proximoLote()))
+    fila.salva()
+    with open(os.path.join(tmp_path, ARQUIVO_POSICAO), "w") as arquivo:
+        arquivo.write("0")
+    # Sem posição válida, os itens do segmento voltam todos: o reenvio é pelo menos uma vez.
+    reaberta = FilaReenvio(capacidade=10, diretorio=str(tmp_path), tamanhoLote=5)
+    assert esvazia(reaberta) == list(range(8))
+
+
+def test_espera_exponencial(monkeypatch):
+    agora = [100.0]
+    monkeypatch.setattr(moduloFila, "time", types.SimpleNamespace(monotonic=lambda: agora[0]))
+    fila = FilaReenvio(esperaInicial=1.0, esperaMaxima=5.0)
+    assert fila.podeTentar()
+    esperas = []
+    for _ in range(5):
+        fila.registraFalha()
+        esperas.append(fila.espera)
+    assert esperas == [1.0, 2.0, 4.0, 5.0, 5.0]
+    assert not fila.podeTentar()
+    agora[0] += 4.9
+    assert not fila.podeTentar()
+    agora[0] += 0.1
+    assert fila.podeTentar()
+    fila.registraFalha()
+    fila.registraSucesso()
+    assert fila.espera == 0.0 and fila.podeTentar()
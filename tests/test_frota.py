@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from Dispositivos.Frota import FrotaSensores
+from Dispositivos.Leitura import Leitura
+from Dispositivos.Termometro import Termometro
+from Dispositivos.SensorAgua import SensorAgua
+from Dispositivos.Tempo import agora
+
+# Um minuto depois da criação das frotas, para as regras de taxa de variação.
+INSTANTE = agora() + 60 * 10**9
+
+
+def _frota(semente: int = 1) -> FrotaSensores:
+    frota = FrotaSensores(semente=semente)
+    frota.adiciona(Termometro, [f"t{i}" for i in range(100)], chanceOutlier=20)
+    frota.adiciona(SensorAgua, ["a0", "a1", "a2"], nivelMaximo=[100, 200, 300])
+    return frota
+
+
+def test_semente_reproduz_a_frota():
+    a, b = _frota(), _frota()
+    for passo in range(1, 4):
+        for loteA, loteB in zip(a.passo(INSTANTE + passo * 10**9), b.passo(INSTANTE + passo * 10**9)):
+            assert np.array_equal(loteA.valores, loteB.valores) and np.array_equal(loteA.aceitos, loteB.aceitos)
+
+
+def test_indexacao_e_parametros_por_sensor():
+    frota = _frota()
+    assert len(frota) == 103
+    assert [sensor.token for sensor in frota][-3:] == ["a0", "a1", "a2"]
+    assert frota[-1].parametro("nivelMaximo") == 300
+    assert frota[0].parametro("chanceOutlier") == 20
+    with pytest.raises(IndexError):
+        frota[103]
+
+
+def test_passo_atualiza_o_estado_dos_aceitos():
+    frota = _frota()
+    termometros = frota.grupos[0]
+    anteriores = termometros.valores.copy()
+    lote = frota.passo(INSTANTE)[0]
+    aceitos = lote.aceitos
+    assert aceitos.any() and not aceitos.all()
+    assert np.array_equal(termometros.valores[~aceitos], anteriores[~aceitos])
+    assert np.array_equal(np.round(termometros.valores[aceitos], 2), lote.valores[aceitos])
+    assert (termometros.timestamps[aceitos] == INSTANTE).all()
+    leitura = frota[int(np.flatnonzero(aceitos)[0])].dados()
+    assert isinstance(leitura, Leitura) and leitura.unit == "C" and leitura.time == INSTANTE
+
+
+def test_classe_sem_modelo_vetorizado():
+    with pytest.raises(TypeError):
+        FrotaSensores().adiciona(dict, ["x"])
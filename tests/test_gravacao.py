@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from Dispositivos.Frota import FrotaSensores
+from Dispositivos.Gravacao import GravadorColunar, LeitorColunar, arquivosGravados
+from Dispositivos.Leitura import Leitura
+from Dispositivos.SensorMovimento import SensorMovimento
+from Dispositivos.Termometro import Termometro
+from Dispositivos.Transporte import TRANSPORTES, registraTransporte
+
+INSTANTE = 1_700_000_000_000_000_000
+
+
+def _lidos(diretorio) -> list:
+    lidos = []
+    for caminho in arquivosGravados(str(diretorio)):
+        with LeitorColunar(caminho) as leitor:
+            for bloco in leitor.blocos():
+                lidos.extend(bloco.leituras())
+    return lidos
+
+
+def test_grava_e_le_os_tipos_de_valor(tmp_path):
+    leituras = [
+        ("a", Leitura("Temperatura", 21.37, "C", INSTANTE)),
+        ("b", Leitura("NivelAgua", 7, None, INSTANTE + 1)),
+        ("a", Leitura("Movimento", "Movimentação", None, INSTANTE + 2)),
+    ]
+    with GravadorColunar(str(tmp_path), linhasPorBloco=2) as gravador:
+        for token, leitura in leituras:
+            gravador.grava(token, leitura.variable, leitura.value, leitura.unit, leitura.time)
+    assert gravador.linhas == 3
+    assert _lidos(tmp_path) == leituras
+    assert isinstance(_lidos(tmp_path)[1][1].value, int)
+    with LeitorColunar(gravador.arquivos[0]) as leitor:
+        bloco = next(leitor.blocos())
+        assert bloco.token(1) == "b" and bloco.registro(1) == leituras[1][1]
+
+
+def test_rotacao_recomeca_os_dicionarios(tmp_path):
+    with GravadorColunar(str(tmp_path), linhasPorBloco=100, tamanhoMaximoArquivo=1) as gravador:
+        gravador.gravaLote(["x", "y"] * 150, "Temperatura", "C", np.arange(300, dtype=np.float64),
+                           np.full(300, INSTANTE, dtype=np.int64))
+    assert len(gravador.arquivos) == 3
+    lidos = _lidos(tmp_path)
+    assert [token for token, _ in lidos] == ["x", "y"] * 150
+    assert [leitura.value for _, leitura in lidos] == list(range(300))
+
+
+def test_bloco_incompleto_e_ignorado(tmp_path):
+    with GravadorColunar(str(tmp_path), linhasPorBloco=10) as gravador:
+        for i in range(25):
+            gravador.grava("a", "x", i, None, INSTANTE + i)
+    caminho = gravador.arquivos[0]
+    with open(caminho, "r+b") as arquivo:
+        arquivo.truncate(arquivo.seek(0, 2) - 3)
+    assert [leitura.value for _, leitura in _lidos(tmp_path)] == list(range(20))
+
+
+def test_arquivo_invalido(tmp_path):
+    caminho = tmp_path / "leituras-000000.iotc"
+    caminho.write_bytes(b"nada disso")
+    with pytest.raises(ValueError):
+        LeitorColunar(str(caminho))
+
+
+def test_grava_so_os_aceitos_da_frota(tmp_path):
+    frota = FrotaSensores(semente=2)
+    frota.adiciona(Termometro, [f"t{i}" for i in range(50)], chanceOutlier=30)
+    frota.adiciona(SensorMovimento, [f"m{i}" for i in range(10)], chanceMovimento=50)
+    esperado = []
+    with GravadorColunar(str(tmp_path)) as gravador:
+        for passo in range(3):
+            lotes = frota.passo(INSTANTE + passo * 10**9)
+            gravador.gravaFrota(frota, lotes)
+            for grupo, lote in zip(frota.grupos, lotes):
+                esperado += [(grupo.tokens[i], lote.valores[i].item(), int(lote.timestamps[i]))
+                             for i in np.flatnonzero(lote.aceitos) if grupo.modelo.texto is None]
+    lidos = [(token, leitura.value, leitura.time) for token, leitura in _lidos(tmp_path)
+             if leitura.variable == "Temperatura"]
+    assert lidos == esperado
+
+
+def test_transporte_de_gravacao(tmp_path):
+    with GravadorColunar(str(tmp_path)) as gravador:
+        registraTransporte("arquivo", gravador.transporte)
+        try:
+            sensor = Termometro("gravado", transporte="arquivo", tamanhoLote=5)
+            enviados = [Leitura("Temperatura", 20 + i / 10, "C", INSTANTE + i) for i in range(12)]
+            for dados in enviados:
+                sensor.enviaDados(dados)
+            sensor.encerra()
+        finally:
+            del TRANSPORTES["arquivo"]
+    assert _lidos(tmp_path) == [("gravado", dados) for dados in enviados]
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Geração offline: nenhum módulo de rede pode ser importado (ver Dispositivos.Transporte).
+CODIGO = textwrap.dedent("""
+    import sys
+    import Dispositivos
+    from Dispositivos.Termometro import Termometro
+    from Dispositivos.Dispositivo import coletaDados
+
+    termometro = Termometro(token="offline", transporte="nulo")
+    for _ in range(10):
+        coletaDados(termometro)
+    termometro.encerra()
+    print(" ".join(sorted(nome for nome in ("http.client", "ssl", "tagoio_sdk") if nome in sys.modules)))
+""")
+
+
+def test_geracao_offline_nao_importa_modulos_de_rede():
+    resultado = subprocess.run([sys.executable, "-c", CODIGO], capture_output=True, text=True, check=True, cwd=RAIZ)
+    assert resultado.stdout.strip() == ""
+
+
+def test_import_do_pacote_nao_carrega_modulos():
+    codigo = "import sys, Dispositivos; print(sorted(n for n in sys.modules if n.startswith('Dispositivos.')))"
+    resultado = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True, cwd=RAIZ)
+    assert resultado.stdout.strip() == "[]"
+
+
+def test_todos_os_modulos_sao_carregados_sob_demanda():
+    import Dispositivos
+    arquivos = {nome[:-3] for nome in os.listdir(os.path.join(RAIZ, "Dispositivos"))
+                if nome.endswith(".py") and nome != "__init__.py"}
+    assert set(Dispositivos.__all__) == arquivos
+    assert Dispositivos.Leitura.Leitura("x", 1) == {"variable": "x", "value": 1}
@@ -0,0 +1,66 @@
+import random
+from datetime import datetime, time, timedelta
+import numpy as np
+import pytest
+from Dispositivos.JanelasHorario import JanelasHorario
+from Dispositivos.SensorMovimento import SensorMovimento
+
+INICIO = datetime(2024, 3, 1, 12, 0)
+JANELAS = [
+    [(time(19), timedelta(hours=2))],
+    [(time(22), time(2))],
+    [(time(6), time(8)), (time(7, 30), time(9)), (time(23, 30), timedelta(minutes=45))],
+    [(time(0), timedelta(days=1))],
+    [(time(10), timedelta(0))],
+]
+
+
+def _ns(horario: datetime) -> int:
+    return round(horario.timestamp() * 1_000_000) * 1000
+
+
+def _referencia(janelas: list, instante: int) -> bool:
+    # Como o antigo validaHorario: monta as janelas de ontem e de hoje e compara datetimes.
+    momento = datetime.fromtimestamp(instante / 1e9)
+    for inicio, fim in janelas:
+        for dia in (momento.date() - timedelta(days=1), momento.date()):
+            comeco = datetime.combine(dia, inicio)
+            duracao = fim if isinstance(fim, timedelta) else (datetime.combine(dia, fim) - comeco) % timedelta(days=1)
+            if comeco <= momento < comeco + duracao:
+                return True
+    return False
+
+
+@pytest.mark.parametrize("janelas", JANELAS)
+def test_ativa_igual_a_referencia(janelas):
+    indice = JanelasHorario(janelas)
+    gerador = random.Random(1)
+    crescentes = [_ns(INICIO + timedelta(minutes=7 * i)) for i in range(3 * 24 * 60 // 7)]
+    aleatorios = [_ns(INICIO + timedelta(seconds=gerador.uniform(-3 * 86400, 3 * 86400))) for _ in range(1000)]
+    for instante in crescentes + aleatorios:
+        assert indice.ativa(instante) == _referencia(janelas, instante), datetime.fromtimestamp(instante / 1e9)
+
+
+def test_limites_das_janelas():
+    indice = JanelasHorario([(time(22), time(2))])
+    assert indice.ativa(_ns(datetime(2024, 3, 1, 22)))
+    assert indice.ativa(_ns(datetime(2024, 3, 2, 1, 59, 59)))
+    assert not indice.ativa(_ns(datetime(2024, 3, 2, 2)))
+    assert not indice.ativa(_ns(datetime(2024, 3, 1, 21, 59, 59)))
+
+
+@pytest.mark.parametrize("janelas", JANELAS)
+def test_ativaEm_igual_a_ativa(janelas):
+    instantes = np.array([_ns(INICIO + timedelta(minutes=13 * i)) for i in range(2000)], dtype=np.int64)
+    embaralhados = np.random.default_rng(0).permutation(instantes)
+    assert list(JanelasHorario(janelas).ativaEm(embaralhados)) == [JanelasHorario(janelas).ativa(int(i)) for i in embaralhados]
+    assert JanelasHorario(janelas).ativaEm(np.array([], dtype=np.int64)).shape == (0,)
+
+
+def test_sensor_usa_as_janelas():
+    sensor = SensorMovimento("m", transporte="nulo", horarioInicial=time(19), diferencaTempoFinal=timedelta(hours=2))
+    assert sensor.validaHorario(_ns(datetime(2024, 3, 1, 20)))
+    assert not sensor.validaHorario(_ns(datetime(2024, 3, 1, 21, 30)))
+    varias = SensorMovimento("m", transporte="nulo", janelas=[(time(6), time(8)), (time(22), time(2))])
+    assert varias.validaHorario(_ns(datetime(2024, 3, 1, 23)))
+    assert not varias.validaHorario(_ns(datetime(2024, 3, 1, 12)))
@@ -0,0 +1,54 @@
+import json
+import time
+import pytest
+from Dispositivos.Leitura import Leitura, SerializadorTagoIO
+from Dispositivos.Tempo import formataHorario
+
+INSTANTE = time.time_ns()
+
+
+def payloadAntigo(dados) -> bytes:
+    # Como era antes do serializador: dicionários com o horário em texto, via json.dumps.
+    def formata(registro):
+        registro = dict(registro)
+        if isinstance(registro.get("time"), int):
+            registro["time"] = formataHorario(registro["time"])
+        return registro
+    return json.dumps([formata(registro) for registro in dados] if isinstance(dados, list) else formata(dados)).encode()
+
+
+REGISTROS = [
+    Leitura("Temperatura", 21.37, "°C", INSTANTE),
+    Leitura("Temperatura", -0.5, "°F", INSTANTE + 1_000_000_000),
+    {"variable": "Condutividade", "value": 12, "unit": "µS/cm", "time": INSTANTE},
+    {"variable": "Movimento", "value": "detectado", "unit": "", "time": INSTANTE},
+    {"variable": "Nível", "value": 3, "time": INSTANTE},
+    {"variable": "Pressão", "value": 1e-7},
+    Leitura("Som", 65.0),
+    {"variable": "Umidade", "value": True, "unit": "%"},
+    {"variable": "Luz", "value": 1.5, "unit": None, "time": INSTANTE},
+    {"variable": "Extra", "value": 1, "unit": "u", "time": INSTANTE, "metadata": {"origem": "ção"}},
+    {"variable": "Texto", "value": 2, "unit": "u", "time": "2024-01-01 00:00:00"},
+]
+
+
+@pytest.mark.parametrize("registro", REGISTROS, ids=lambda registro: registro["variable"])
+def test_registro_igual_ao_json_dumps(registro):
+    corpo = bytes(SerializadorTagoIO().serializa(registro))
+    assert json.loads(corpo) == json.loads(payloadAntigo(registro))
+    assert corpo == payloadAntigo(registro)
+
+
+def test_lista_igual_ao_json_dumps_e_reaproveita_fragmentos():
+    serializador = SerializadorTagoIO()
+    for _ in range(3):
+        corpo = bytes(serializador.serializa(REGISTROS))
+        assert json.loads(corpo) == json.loads(payloadAntigo(REGISTROS))
+        assert corpo == payloadAntigo(REGISTROS)
+    assert bytes(serializador.serializa([])) == b"[]"
+
+
+def test_leitura_equivale_ao_dicionario():
+    leitura = Leitura("x", 1, None, None)
+    assert leitura == {"variable": "x", "value": 1}
+    assert dict(Leitura("x", 1, "u", 5)) == {"variable": "x", "value": 1, "unit": "u", "time": 5}
@@ -0,0 +1,83 @@
+import types
+import pytest
+from Dispositivos import LimitadorEnvio as moduloLimitador
+from Dispositivos.LimitadorEnvio import BaldeFichas, LimitadorEnvio
+from Dispositivos.Metricas import RegistroMetricas
+from Dispositivos.Relogio import RelogioVirtual
+from Dispositivos.ServidorSimulado import ServidorSimulado
+from Dispositivos.Termometro import Termometro
+from Dispositivos.Transporte import ESPERA_LIMITE_PADRAO, LimiteRequisicoes
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = RelogioVirtual()
+    monkeypatch.setattr(moduloLimitador, "time", types.SimpleNamespace(monotonic=relogio.monotonico))
+    return relogio
+
+
+def test_reserva_enfileira_as_vezes():
+    relogio = RelogioVirtual()
+    balde = BaldeFichas(taxa=2, capacidade=2, instante=relogio.monotonico())
+    assert [balde.reserva(relogio.monotonico()) for _ in range(4)] == [0, 0, 0.5, 1.0]
+    relogio.avanca(1.0)
+    assert balde.reserva(relogio.monotonico()) == 0.5
+    relogio.avanca(10)
+    assert balde.reserva(relogio.monotonico()) == 0
+
+
+def test_retira_recusa_sem_gastar():
+    relogio = RelogioVirtual()
+    balde = BaldeFichas(taxa=1, capacidade=1, instante=relogio.monotonico())
+    assert balde.retira(relogio.monotonico()) == 0
+    assert balde.retira(relogio.monotonico()) == 1.0
+    relogio.avanca(0.75)
+    assert balde.retira(relogio.monotonico()) == pytest.approx(0.25)
+    relogio.avanca(0.25)
+    assert balde.retira(relogio.monotonico()) == 0
+
+
+def test_esvazia_ate_o_fim_do_retry_after():
+    relogio = RelogioVirtual()
+    balde = BaldeFichas(taxa=10, capacidade=10, instante=relogio.monotonico())
+    balde.esvazia(relogio.monotonico() + 3)
+    assert balde.reserva(relogio.monotonico()) == pytest.approx(3.1)
+    relogio.avanca(5)
+    assert balde.reserva(relogio.monotonico()) == 0
+
+
+def test_limitador_por_token_e_global(relogio):
+    limitador = LimitadorEnvio(taxaPorToken=1, rajadaPorToken=1, taxaGlobal=2, rajadaGlobal=2)
+    assert limitador.reserva("a") == 0
+    assert limitador.reserva("b") == 0
+    assert limitador.reserva("c") == 0.5
+    assert limitador.reserva("a") == 1.0
+    limitador.penaliza("b", 4)
+    relogio.avanca(2)
+    assert limitador.reserva("b") == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("valor, espera", [("3", 3.0), ("-1", 0.0), (None, ESPERA_LIMITE_PADRAO),
+                                           ("amanhã", ESPERA_LIMITE_PADRAO),
+                                           ("Thu, 01 Jan 1970 00:00:00 GMT", 0.0)])
+def test_espera_retry_after(valor, espera):
+    assert LimiteRequisicoes.esperaRetryAfter(valor) == espera
+
+
+def test_http_429_retem_o_lote_ate_o_retry_after():
+    with ServidorSimulado(limitePorToken=0.5, rajada=1) as servidor:
+        limitador = LimitadorEnvio(taxaPorToken=100)
+        termometro = Termometro("limitado", url=servidor.url, limitador=limitador)
+        termometro.metricas = RegistroMetricas()
+        assert termometro.enviaDados({"variable": "x", "value": 1}) == "1 Data Added"
+        assert termometro.enviaDados({"variable": "x", "value": 2}) is None
+        assert servidor.respostas[429] == 1
+        # O lote recusado volta para a fila, sem contar como falha, e espera o Retry-After.
+        assert termometro.fila == [{"variable": "x", "value": 2}]
+        assert len(termometro.reenvio) == 0
+        assert termometro.enviaDados({"variable": "x", "value": 3}) is None
+        assert servidor.requisicoes == 2
+        assert not termometro.envioPendente()
+        metricas = termometro.metricas.instantaneo()["Termometro"]
+        assert metricas["envios_limitados"] == 1 and "envios_falha" not in metricas
+        assert limitador.reserva("limitado") >= 1.0
@@ -0,0 +1,94 @@
+import copy
+import numpy as np
+import pytest
+from Dispositivos.Lote import geraLote, geraLoteFrota, modeloDaClasse, _parametros
+from Dispositivos.Outliers import ACEITO, MANTIDO
+from Dispositivos.Termometro import Termometro
+from Dispositivos.SensorAgua import SensorAgua
+from Dispositivos.SensorUmidade import SensorUmidade
+from Dispositivos.SensorLuminosidade import SensorLuminosidade
+from Dispositivos.SensorSom import SensorSom
+from Dispositivos.SensorPressao import SensorPressao
+from Dispositivos.SensorMovimento import SensorMovimento
+
+SENSORES = [Termometro, SensorAgua, SensorUmidade, SensorLuminosidade, SensorSom, SensorPressao]
+
+
+def _sensor(classe: type, chance: int = 5):
+    parametros = {"chanceMovimento": chance} if classe is SensorMovimento else {"chanceOutlier": chance}
+    return classe(token="lote", semente=1, transporte="nulo", **parametros)
+
+
+@pytest.mark.parametrize("classe", SENSORES)
+def test_regras_vetorizadas_iguais_as_de_geraDados(classe):
+    # Os mesmos casos passam pelas regras de outlier escalares (dispositivo.outlier, usadas
+    # por geraDados) e pelo passo vetorizado; desfecho e estado final precisam coincidir.
+    dispositivo = _sensor(classe)
+    modelo = modeloDaClasse(classe)
+    parametros = _parametros(modelo, dispositivo)
+    rng = np.random.default_rng(0)
+    n = 2000
+    atual = modelo.inicial(rng, n, parametros)
+    saltos = rng.uniform(-150, 150, n) * np.where(rng.random(n) < 0.5, 1, 0.02)
+    medido = atual + (np.round(saltos) if atual.dtype.kind == "i" else saltos).astype(atual.dtype)
+    tsAtual = np.full(n, 10**18, dtype=np.int64)
+    ts = tsAtual + rng.integers(0, 60 * 10**9, n)
+    novo, tsNovo, codigos = modelo.passo(atual, tsAtual, medido, ts, np.zeros(n), parametros)
+
+    for i in range(n):
+        setattr(dispositivo, modelo.atributoValor, atual[i].item())
+        setattr(dispositivo, modelo.atributoTimestamp, int(tsAtual[i]))
+        descartado = dispositivo.outlier(medido[i].item(), int(ts[i]))
+        assert descartado == (codigos[i] != ACEITO), (atual[i], medido[i], ts[i] - tsAtual[i])
+        if codigos[i] == MANTIDO:
+            assert getattr(dispositivo, modelo.atributoValor) == atual[i]
+            assert getattr(dispositivo, modelo.atributoTimestamp) == tsAtual[i] == tsNovo[i]
+        elif codigos[i] == ACEITO:
+            assert novo[i] == medido[i]
+
+
+@pytest.mark.parametrize("classe", SENSORES + [SensorMovimento])
+@pytest.mark.parametrize("chance", [0, 5, 50, 100])
+def test_geraLote_igual_ao_passo_a_passo(classe, chance):
+    # As janelas especulativas de geraLote dão o mesmo resultado que aplicar as regras
+    # leitura a leitura, com os mesmos sorteios.
+    dispositivo = _sensor(classe, chance)
+    referencia = copy.deepcopy(dispositivo)
+    n = 1000
+    lote = geraLote(dispositivo, n, intervalo=1, semente=7)
+
+    modelo = modeloDaClasse(classe)
+    parametros = _parametros(modelo, referencia)
+    diferenca, adicional, _, reinicio = modelo.sorteia(np.random.default_rng(7), n, parametros)
+    reinicio = np.asarray(reinicio)
+    atual = getattr(referencia, modelo.atributoValor)
+    tsAtual = getattr(referencia, modelo.atributoTimestamp)
+    ts = tsAtual + np.arange(1, n + 1, dtype=np.int64) * 10**9
+    valores, codigos = [], []
+    for i in range(n):
+        novo, tsNovo, codigo = modelo.passo(np.array([atual]), np.array([tsAtual]),
+                                            np.array([atual + diferenca[i] + adicional[i]]),
+                                            ts[i:i + 1], reinicio[i:i + 1], parametros)
+        atual, tsAtual = novo[0], int(np.asarray(tsNovo).reshape(-1)[0])
+        valores.append(atual)
+        codigos.append(codigo[0])
+    valores = np.array(valores) if modelo.casas is None else np.round(valores, modelo.casas)
+
+    assert np.array_equal(lote.valores, valores)
+    assert np.array_equal(lote.aceitos, np.array(codigos) == ACEITO)
+    # O passeio vetorizado soma com cumsum: o estado final só difere no arredondamento.
+    assert getattr(dispositivo, modelo.atributoValor) == pytest.approx(atual)
+    assert getattr(dispositivo, modelo.atributoTimestamp) == tsAtual
+
+
+def test_semente_reproduz_os_lotes():
+    primeiro, segundo = _sensor(Termometro), _sensor(Termometro)
+    a = primeiro.geraLote(500, semente=3)
+    b = segundo.geraLote(500, semente=3)
+    assert np.array_equal(a.valores, b.valores) and np.array_equal(a.aceitos, b.aceitos)
+
+    frota = [_sensor(classe) for classe in SENSORES]
+    copia = copy.deepcopy(frota)
+    a = geraLoteFrota(frota, instante=10**18, semente=np.random.default_rng(4))
+    b = geraLoteFrota(copia, instante=10**18, semente=4)
+    assert np.array_equal(a.valores, b.valores) and np.array_equal(a.aceitos, b.aceitos)
@@ -0,0 +1,83 @@
+import json
+import threading
+import pytest
+from Dispositivos.Metricas import ExportadorMetricas, Histograma, RegistroMetricas
+
+
+def test_percentis_do_histograma():
+    histograma = Histograma(limites=(0.1, 0.2, 0.4))
+    assert histograma.percentil(0.5) is None
+    for valor in [0.05] * 50 + [0.15] * 40 + [0.3] * 9 + [1.0]:
+        histograma.registra(valor)
+    assert histograma.total == 100
+    assert histograma.contagens == [50, 40, 9, 1]
+    assert histograma.percentil(0.5) == pytest.approx(0.1)
+    assert histograma.percentil(0.7) == pytest.approx(0.15)
+    # A faixa +Inf não tem limite superior: o percentil fica no último limite.
+    assert histograma.percentil(1.0) == 0.4
+
+
+def test_contadores_concorrentes():
+    registro = RegistroMetricas()
+
+    def incrementa():
+        for _ in range(10000):
+            registro.incrementa("leituras", "Termometro")
+
+    threads = [threading.Thread(target=incrementa) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registro.instantaneo() == {"Termometro": {"leituras": 80000}}
+
+
+def test_instantaneo():
+    registro = RegistroMetricas()
+    registro.incrementa("leituras", "Termometro", 3)
+    registro.define("fila_profundidade", "Termometro", 7)
+    registro.ajusta("fila_profundidade", "SensorAgua", 2)
+    registro.ajusta("fila_profundidade", "SensorAgua", -1)
+    registro.registraLatencia("latencia_envio", "Termometro", 0.02)
+    instantaneo = registro.instantaneo()
+    assert instantaneo["SensorAgua"] == {"fila_profundidade": 1}
+    assert instantaneo["Termometro"]["leituras"] == 3
+    assert instantaneo["Termometro"]["fila_profundidade"] == 7
+    assert instantaneo["Termometro"]["latencia_envio"]["total"] == 1
+
+
+def test_formato_prometheus():
+    registro = RegistroMetricas()
+    for tipo in ("SensorAgua", "Termometro"):
+        registro.incrementa("leituras", tipo)
+        registro.registraLatencia("latencia_envio", tipo, 0.02)
+    texto = registro.paraPrometheus()
+    linhas = texto.splitlines()
+    assert texto.endswith("\n")
+    assert linhas.count("# TYPE iot_leituras_total counter") == 1
+    assert 'iot_leituras_total{tipo="Termometro"} 1' in linhas
+    assert 'iot_latencia_envio_segundos_bucket{tipo="SensorAgua",le="+Inf"} 1' in linhas
+    assert 'iot_latencia_envio_segundos_count{tipo="Termometro"} 1' in linhas
+    # Cada família aparece uma só vez, com as suas amostras juntas: os quantis vêm depois dos histogramas.
+    familias = [linha.split()[2] for linha in linhas if linha.startswith("# TYPE")]
+    assert len(familias) == len(set(familias))
+    inicioQuantis = linhas.index("# TYPE iot_latencia_envio_segundos_quantil gauge")
+    assert all("_quantil" in linha for linha in linhas[inicioQuantis:])
+
+
+def test_exportador(tmp_path):
+    registro = RegistroMetricas()
+    registro.incrementa("leituras", "Termometro")
+    prometheus = tmp_path / "metricas.prom"
+    ExportadorMetricas(str(prometheus), registro=registro).grava()
+    assert prometheus.read_text() == registro.paraPrometheus()
+
+    jsonl = tmp_path / "metricas.jsonl"
+    exportador = ExportadorMetricas(str(jsonl), formato="jsonl", intervalo=0.01, registro=registro).inicia()
+    exportador.para()
+    linhas = jsonl.read_text().splitlines()
+    assert len(linhas) >= 1
+    assert json.loads(linhas[-1])["metricas"] == {"Termometro": {"leituras": 1}}
+
+    with pytest.raises(ValueError):
+        ExportadorMetricas(str(tmp_path / "x"), formato="csv")
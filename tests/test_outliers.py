@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from Dispositivos.Outliers import (ACEITO, MANTIDO, REINICIADO, REGRAS, Hampel, Limite, RegrasOutlier, TaxaVariacao,
+                                   ZScoreMovel, registraRegras, regrasDoTipo)
+from Dispositivos.Termometro import Termometro
+
+SEGUNDO = 1_000_000_000
+
+
+class TermometroDerivado(Termometro):
+    pass
+
+
+def test_limite_com_parametros_do_sensor():
+    regra = Limite(0, "maximo")
+    assert not regra.verifica(10, 0, 0, 0, {"maximo": 10}, None)
+    assert regra.verifica(10.1, 0, 0, 0, {"maximo": 10}, None)
+    assert regra.verifica(-0.1, 0, 0, 0, {"maximo": 10}, None)
+    sensor = Termometro("t", transporte="nulo", temperaturaLimite=30)
+    assert Limite(maximo="temperaturaLimite").verifica(31, 0, 0, 0, sensor, None)
+    assert list(regra.verifica(np.array([-1, 5, 11]), 0, 0, 0, {"maximo": np.array([10, 10, 12])}, None)) == [True, False, False]
+
+
+def test_taxa_de_variacao():
+    regra = TaxaVariacao(1, intervalo=6)
+    # 1 a cada 6 s: em 12 s, variações de até 2 são aceitas.
+    assert not regra.verifica(22, 12 * SEGUNDO, 20, 0, {}, None)
+    assert regra.verifica(17.9, 12 * SEGUNDO, 20, 0, {}, None)
+    somenteAumento = TaxaVariacao(5, intervalo=None, somenteAumento=True)
+    assert not somenteAumento.verifica(0, SEGUNDO, 100, 0, {}, None)
+    assert somenteAumento.verifica(106, SEGUNDO, 100, 0, {}, None)
+
+
+def test_primeira_regra_violada_decide():
+    regras = RegrasOutlier([Limite(maximo=100, acao=REINICIADO), TaxaVariacao(1, intervalo=None)])
+    assert regras.verifica(50, 0, 49.5, 0, {}) is None
+    assert regras.verifica(60, 0, 50, 0, {}).acao == MANTIDO
+    assert regras.verifica(150, 0, 50, 0, {}).acao == REINICIADO
+    codigos = regras.verificaArray(np.array([50, 60, 150]), np.zeros(3), np.array([49.5, 50, 50]), np.zeros(3), {})
+    assert list(codigos) == [ACEITO, MANTIDO, REINICIADO]
+
+
+@pytest.mark.parametrize("regra", [ZScoreMovel(janela=20, limite=3), Hampel(janela=7, limite=3, minimo=3)])
+def test_regras_com_janela_escalares_e_vetorizadas(regra):
+    # Uma série por sensor, com picos; o estado de cada sensor só recebe as leituras aceitas.
+    regras = RegrasOutlier([regra])
+    rng = np.random.default_rng(3)
+    n, passos = 20, 300
+    series = rng.normal(50, 2, (passos, n)) + np.where(rng.random((passos, n)) < 0.05, 40, 0)
+    estados = [regras.novoEstado() for _ in range(n)]
+    estadoArray = regras.novoEstado(n)
+    descartados = 0
+    for linha in series:
+        codigos = regras.verificaArray(linha, None, None, None, {}, estadoArray)
+        for sensor in range(n):
+            escalar = regras.verifica(linha[sensor], None, None, None, {}, estados[sensor])
+            assert (escalar is not None) == (codigos[sensor] != ACEITO)
+            if escalar is None:
+                regras.aceita(linha[sensor], estados[sensor])
+        regras.aceitaArray(linha, codigos == ACEITO, estadoArray)
+        descartados += int((codigos != ACEITO).sum())
+    assert descartados > 0.03 * series.size
+
+
+def test_regras_com_janela_precisam_de_estado():
+    with pytest.raises(ValueError):
+        RegrasOutlier([Hampel()]).verificaArray(np.zeros(2), None, None, None, {})
+
+
+def test_registraRegras_vale_para_os_sensores_criados_depois():
+    anteriores = REGRAS["Termometro"]
+    try:
+        registraRegras("Termometro", [Limite(maximo=0)])
+        assert regrasDoTipo(TermometroDerivado) is REGRAS["Termometro"]
+        sensor = TermometroDerivado("t", transporte="nulo")
+        assert sensor.outlier(1, sensor.timestampTemperaturaAtual)
+    finally:
+        REGRAS["Termometro"] = anteriores
+    assert regrasDoTipo("TipoSemRegras").regras == []
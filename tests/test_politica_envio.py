@@ -0,0 +1,80 @@
+import gzip
+import json
+import zlib
+import pytest
+from Dispositivos.Conexao import ConexaoTagoIO
+from Dispositivos.PoliticaEnvio import PoliticaEnvio
+from Dispositivos.ServidorSimulado import ServidorSimulado
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        PoliticaEnvio(compressao="brotli")
+    with pytest.raises(ValueError):
+        PoliticaEnvio(tamanhoMinimo=10, tamanhoMaximo=5)
+    with pytest.raises(ValueError):
+        PoliticaEnvio(reducao=1.5)
+
+
+@pytest.mark.parametrize("compressao, descomprime", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+def test_comprime_a_partir_do_minimo(compressao, descomprime):
+    politica = PoliticaEnvio(compressao=compressao, compressaoMinima=100)
+    assert politica.comprime(b"[]") == (b"[]", None)
+    corpo = json.dumps([{"variable": "x", "value": 1, "unit": "C"}] * 100).encode()
+    comprimido, codificacao = politica.comprime(corpo)
+    assert codificacao == compressao
+    assert len(comprimido) * 10 < len(corpo)
+    assert descomprime(comprimido) == corpo
+
+
+@pytest.mark.parametrize("compressao", ["gzip", "deflate"])
+def test_conexao_envia_comprimido(compressao):
+    with ServidorSimulado() as servidor:
+        politica = PoliticaEnvio(compressao=compressao, compressaoMinima=0)
+        conexao = ConexaoTagoIO("token", servidor.url, politica=politica)
+        registros = [{"variable": "x", "value": 1, "unit": "C"}] * 200
+        assert conexao.sendData(registros) == "200 Data Added"
+        assert servidor.recebidos[0][1] == registros
+        assert servidor.bytes < len(json.dumps(registros))
+
+
+def test_sem_adaptativo_mantem_o_lote_do_dispositivo():
+    politica = PoliticaEnvio()
+    assert politica.tamanhoLote(50) == 50
+    for _ in range(10):
+        politica.registraEnvio(50, 0.01)
+    assert politica.tamanhoLote(50) == 50
+
+
+def test_lote_cresce_enquanto_a_vazao_melhora_e_volta_quando_piora():
+    politica = PoliticaEnvio(adaptativo=True, tamanhoLote=100, amostras=1, aumento=0.5)
+    tamanhos = [politica.tamanhoLote(100)]
+    # Cada requisição custa 0.1 s mais 1 ms por leitura: lotes maiores melhoram a vazão.
+    for _ in range(4):
+        tamanho = politica.tamanhoLote(100)
+        politica.registraEnvio(tamanho, 0.1 + tamanho * 0.001)
+        tamanhos.append(politica.tamanhoLote(100))
+    assert tamanhos == sorted(tamanhos) and tamanhos[-1] > tamanhos[0]
+    # A vazão piora (latência por leitura muito maior): o lote passa a diminuir.
+    tamanho = politica.tamanhoLote(100)
+    politica.registraEnvio(tamanho, tamanho * 0.1)
+    assert politica.tamanhoLote(100) < tamanho
+
+
+def test_timeout_e_excesso_de_erros_reduzem_o_lote():
+    politica = PoliticaEnvio(adaptativo=True, tamanhoLote=400, tamanhoMinimo=10, limiteErros=0.25)
+    politica.registraFalha(TimeoutError())
+    assert politica.tamanhoLote(400) == 200
+    politica.registraFalha(ConnectionError())
+    politica.registraFalha(ConnectionError())
+    assert politica.tamanhoLote(400) == 100
+    for _ in range(10):
+        politica.registraFalha(TimeoutError())
+    assert politica.tamanhoLote(400) == 10
+
+
+def test_copia_recomeca_o_estado_adaptativo():
+    politica = PoliticaEnvio(compressao="gzip", adaptativo=True, tamanhoLote=100)
+    politica.registraFalha(TimeoutError())
+    copia = politica.copia()
+    assert copia.tamanhoLote(1) == 100 and copia.compressao == "gzip"
@@ -0,0 +1,76 @@
+import asyncio
+import time
+import pytest
+from Dispositivos import Relogio
+from Dispositivos.Dispositivo import coletaDados
+from Dispositivos.Escalonador import Escalonador
+from Dispositivos.Relogio import RelogioReal, RelogioVirtual
+from Dispositivos.Tempo import agora
+from Dispositivos.Termometro import Termometro
+
+INICIO = 1_700_000_000_000_000_000
+MINUTO = 60 * 1_000_000_000
+
+
+@pytest.fixture
+def relogioVirtual():
+    relogio = RelogioVirtual(INICIO)
+    anterior = Relogio.define(relogio)
+    yield relogio
+    Relogio.define(anterior)
+
+
+def test_relogio_virtual_so_avanca(relogioVirtual):
+    assert agora() == INICIO and relogioVirtual.monotonico() == 0
+    relogioVirtual.avanca(1.5)
+    relogioVirtual.avancaAte(1.0)
+    assert relogioVirtual.monotonico() == 1.5
+    assert agora() == INICIO + 1_500_000_000
+
+
+def test_define_devolve_o_anterior():
+    virtual = RelogioVirtual()
+    anterior = Relogio.define(virtual)
+    try:
+        assert isinstance(anterior, RelogioReal)
+        assert Relogio.define(None) is virtual
+        assert isinstance(Relogio.atual, RelogioReal) and not Relogio.atual.virtual
+    finally:
+        Relogio.define(anterior)
+
+
+def _semana(semente: int) -> list:
+    # Uma semana de leituras de minuto em minuto, no tempo virtual.
+    coletadas = []
+
+    def coleta(dispositivo):
+        dados = coletaDados(dispositivo)
+        if dados is not None:
+            coletadas.append((dados["value"], dados["time"]))
+
+    escalonador = Escalonador(espalhaFases=False)
+    escalonador.adiciona(Termometro("t", transporte="nulo", semente=semente), coleta, intervalo=60,
+                         execucoes=7 * 24 * 60)
+    asyncio.run(escalonador.executa())
+    return coletadas
+
+
+def test_uma_semana_no_tempo_virtual(relogioVirtual):
+    inicio = time.monotonic()
+    coletadas = _semana(1)
+    assert time.monotonic() - inicio < 10
+    assert relogioVirtual.monotonico() == 7 * 24 * 60 * 60
+    assert len(coletadas) > 7 * 24 * 60 * 0.5
+    assert all((instante - INICIO) % MINUTO == 0 for _, instante in coletadas)
+    assert coletadas[-1][1] <= INICIO + 7 * 24 * 60 * MINUTO
+
+
+def test_simulacao_se_repete_com_a_mesma_semente():
+    execucoes = []
+    for _ in range(2):
+        anterior = Relogio.define(RelogioVirtual(INICIO))
+        try:
+            execucoes.append(_semana(1))
+        finally:
+            Relogio.define(anterior)
+    assert execucoes[0] == execucoes[1]
@@ -0,0 +1,81 @@
+import threading
+import pytest
+from Dispositivos.ExecutorEnvio import ExecutorEnvio
+from Dispositivos.Gravacao import GravadorColunar
+from Dispositivos.Reproducao import DispositivoGravado, Reproducao
+from Dispositivos.ServidorSimulado import ServidorSimulado
+from Dispositivos.Tempo import agora
+
+INSTANTE = 1_700_000_000_000_000_000
+
+
+def _grava(diretorio, leituras: int = 60, tokens: int = 3, passo: int = 10_000_000) -> str:
+    # Leituras espaçadas de passo ns, alternando os tokens.
+    with GravadorColunar(str(diretorio), linhasPorBloco=16) as gravador:
+        for i in range(leituras):
+            gravador.grava(f"t{i % tokens}", "Temperatura", float(i), "C", INSTANTE + i * passo)
+    return str(diretorio)
+
+
+def _valores(servidor: ServidorSimulado) -> dict:
+    valores = {}
+    for token, registros in servidor.recebidos:
+        valores.setdefault(token, []).extend(registro["value"] for registro in registros)
+    return valores
+
+
+def test_velocidade_invalida(tmp_path):
+    for velocidade in (0, -1, "rapido"):
+        with pytest.raises(ValueError):
+            Reproducao(str(tmp_path), velocidade=velocidade)
+
+
+def test_reproduz_no_maximo_pelo_caminho_de_envio(tmp_path):
+    diretorio = _grava(tmp_path)
+    with ServidorSimulado() as servidor:
+        resultado = Reproducao(diretorio, velocidade="maximo", url=servidor.url, tamanhoLote=8).executa()
+    assert resultado["leituras"] == 60 and resultado["dispositivos"] == 3
+    valores = _valores(servidor)
+    assert valores == {f"t{t}": [float(i) for i in range(t, 60, 3)] for t in range(3)}
+    assert servidor.requisicoes == 9
+
+
+def test_velocidade_segue_os_instantes_gravados(tmp_path):
+    # 60 leituras a cada 10 ms gravados: 0.59 s em tempo real, metade disso com velocidade 2.
+    diretorio = _grava(tmp_path)
+    with ServidorSimulado() as servidor:
+        resultado = Reproducao(diretorio, velocidade=2, url=servidor.url).executa()
+    assert resultado["segundos"] == pytest.approx(0.295, abs=0.1)
+    assert sum(len(valores) for valores in _valores(servidor).values()) == 60
+
+
+def test_atualiza_instantes_e_fabrica(tmp_path):
+    diretorio = _grava(tmp_path, leituras=10, tokens=1)
+    criados = []
+
+    def fabrica(token):
+        dispositivo = DispositivoGravado(token=token, transporte="nulo", tamanhoLote=100)
+        enviados = []
+        dispositivo.enviaDados = lambda dados: enviados.append(dict(dados))
+        criados.append((token, enviados))
+        return dispositivo
+
+    antes = agora()
+    Reproducao(diretorio, velocidade="maximo", fabrica=fabrica, atualizaInstantes=True).executa()
+    [(token, enviados)] = criados
+    assert token == "t0" and len(enviados) == 10
+    assert enviados[0]["time"] >= antes
+    assert [dados["time"] - enviados[0]["time"] for dados in enviados] == [i * 10_000_000 for i in range(10)]
+
+
+def test_para_interrompe_com_executor(tmp_path):
+    diretorio = _grava(tmp_path, leituras=200, passo=1_000_000_000)
+    with ServidorSimulado() as servidor:
+        executor = ExecutorEnvio(trabalhadores=2).inicia()
+        reproducao = Reproducao(diretorio, velocidade=1, url=servidor.url, executor=executor, tamanhoLote=1)
+        threading.Timer(0.2, reproducao.para).start()
+        resultado = reproducao.executa()
+        executor.encerra()
+    assert resultado["segundos"] < 1
+    assert 1 <= resultado["leituras"] < 200
+    assert servidor.requisicoes == resultado["leituras"]
@@ -0,0 +1,108 @@
+import gzip
+import http.client
+import json
+import random
+import time
+import zlib
+import pytest
+from Dispositivos.ServidorSimulado import ServidorSimulado, distribuicaoLatencia
+
+
+def requisita(servidor, corpo: bytes, cabecalhos: dict = None, metodo: str = "POST", caminho: str = "/data"):
+    conexao = http.client.HTTPConnection(servidor.url[len("http://"):], timeout=5)
+    try:
+        conexao.request(metodo, caminho, body=corpo, headers=cabecalhos or {})
+        resposta = conexao.getresponse()
+        return resposta.status, json.loads(resposta.read()), resposta.getheader("Retry-After")
+    finally:
+        conexao.close()
+
+
+def test_distribuicao_latencia():
+    assert distribuicaoLatencia(None) is None
+    assert distribuicaoLatencia(0) is None
+    assert distribuicaoLatencia(0.25)() == 0.25
+    assert distribuicaoLatencia("0.5")() == 0.5
+    uniforme = distribuicaoLatencia("uniforme:0.01,0.02", random.Random(1))
+    assert all(0.01 <= uniforme() <= 0.02 for _ in range(100))
+    with pytest.raises(ValueError):
+        distribuicaoLatencia("cauchy:1")
+
+
+def test_aceita_registros_e_conta_por_token():
+    with ServidorSimulado() as servidor:
+        corpo = json.dumps([{"variable": "x", "value": 1}, {"variable": "y", "value": 2}]).encode()
+        assert requisita(servidor, corpo, {"Device-Token": "a"})[:2] == (200, {"status": True, "result": "2 Data Added"})
+        assert requisita(servidor, b'{"variable": "x", "value": 3}', {"token": "b"})[0] == 200
+        assert servidor.porToken == {"a": 2, "b": 1}
+        assert servidor.recebidos[1] == ("b", [{"variable": "x", "value": 3}])
+        assert servidor.estatisticas()["leituras"] == 3
+        servidor.zera()
+        assert servidor.estatisticas()["requisicoes"] == 0 and servidor.recebidos == []
+
+
+@pytest.mark.parametrize("codificacao, comprime", [("gzip", gzip.compress), ("deflate", zlib.compress)])
+def test_descomprime_o_corpo(codificacao, comprime):
+    with ServidorSimulado() as servidor:
+        corpo = comprime(json.dumps([{"variable": "x", "value": valor} for valor in range(50)]).encode())
+        status, _, _ = requisita(servidor, corpo, {"Device-Token": "a", "Content-Encoding": codificacao})
+        assert status == 200
+        assert servidor.leituras == 50
+        assert servidor.bytes == len(corpo)
+
+
+def test_respostas_de_erro():
+    with ServidorSimulado() as servidor:
+        assert requisita(servidor, b"[]")[0] == 401
+        assert requisita(servidor, b"", {"Device-Token": "a"}, metodo="GET", caminho="/outro")[0] == 404
+        assert requisita(servidor, b"{", {"Device-Token": "a"})[0] == 400
+        assert servidor.respostas == {401: 1, 404: 1, 400: 1}
+
+
+def test_injecao_de_falhas_reproduzivel():
+    contagens = []
+    for _ in range(2):
+        with ServidorSimulado(taxaErros=0.3, taxaDesconexoes=0.2, semente=7) as servidor:
+            for _ in range(50):
+                try:
+                    requisita(servidor, b'{"variable": "x", "value": 1}', {"Device-Token": "a"})
+                except (http.client.HTTPException, ConnectionError):
+                    pass
+            contagens.append(dict(servidor.respostas))
+    assert contagens[0] == contagens[1]
+    assert contagens[0][500] > 0 and contagens[0]["desconexao"] > 0
+    assert sum(contagens[0].values()) == 50
+
+
+def test_limite_global_responde_429_com_retry_after():
+    with ServidorSimulado(limiteGlobal=0.5, rajada=2) as servidor:
+        respostas = [requisita(servidor, b'{"variable": "x", "value": 1}', {"Device-Token": token})
+                     for token in ("a", "b", "c")]
+        assert [status for status, _, _ in respostas] == [200, 200, 429]
+        assert respostas[2][2] == "2"
+
+
+def test_latencia_e_drenagem():
+    with ServidorSimulado(latencia=0.05) as servidor:
+        inicio = time.perf_counter()
+        requisita(servidor, b'{"variable": "x", "value": 1}', {"Device-Token": "a"})
+        assert time.perf_counter() - inicio >= 0.05
+    with ServidorSimulado(vazaoMaxima=1000) as servidor:
+        corpo = json.dumps([{"variable": "x", "value": 1}] * 200).encode()
+        inicio = time.perf_counter()
+        for _ in range(2):
+            requisita(servidor, corpo, {"Device-Token": "a"})
+        assert time.perf_counter() - inicio >= 0.15
+
+
+def test_para_fecha_as_conexoes_persistentes():
+    servidor = ServidorSimulado()
+    servidor.inicia()
+    conexao = http.client.HTTPConnection(servidor.url[len("http://"):], timeout=5)
+    conexao.request("POST", "/data", body=b'{"variable": "x", "value": 1}', headers={"Device-Token": "a"})
+    conexao.getresponse().read()
+    servidor.para()
+    with pytest.raises((http.client.HTTPException, ConnectionError)):
+        conexao.request("POST", "/data", body=b'{"variable": "x", "value": 2}', headers={"Device-Token": "a"})
+        conexao.getresponse()
+    conexao.close()
@@ -0,0 +1,28 @@
+import time
+from Dispositivos.Tempo import FORMATO_HORARIO, agora, formataDados, formataHorario
+
+INSTANTE = 1_700_000_000_123_456_789
+
+
+def test_agora_em_nanossegundos():
+    antes = time.time_ns()
+    instante = agora()
+    assert isinstance(instante, int) and antes <= instante <= time.time_ns()
+
+
+def test_formata_como_strftime():
+    esperado = time.strftime(FORMATO_HORARIO, time.localtime(INSTANTE // 1_000_000_000))
+    assert formataHorario(INSTANTE) == esperado
+    # Mesmo segundo: o texto vem do cache.
+    assert formataHorario(INSTANTE + 800_000_000) is formataHorario(INSTANTE)
+
+
+def test_formataDados_nao_altera_os_originais():
+    registro = {"variable": "x", "value": 1, "time": INSTANTE}
+    semHorario = {"variable": "y", "value": 2}
+    textual = {"variable": "z", "value": 3, "time": "2024-01-01, 00:00:00"}
+    formatados = formataDados([registro, semHorario, textual])
+    assert formatados[0] == {"variable": "x", "value": 1, "time": formataHorario(INSTANTE)}
+    assert registro["time"] == INSTANTE
+    assert formatados[1] is semHorario and formatados[2] is textual
+    assert formataDados(registro)["time"] == formataHorario(INSTANTE)
@@ -0,0 +1,38 @@
+import sys
+import types
+import pytest
+from Dispositivos.Termometro import Termometro
+from Dispositivos.PoliticaEnvio import PoliticaEnvio
+from Dispositivos.Transporte import criaTransporte
+
+
+class DeviceFalso():
+    enviados = []
+
+    def __init__(self, parametros: dict) -> None:
+        self.token = parametros["token"]
+
+    def sendData(self, dados):
+        DeviceFalso.enviados.append((self.token, dados))
+        return f"{len(dados) if isinstance(dados, list) else 1} Data Added"
+
+
+@pytest.fixture
+def sdkFalso(monkeypatch):
+    DeviceFalso.enviados = []
+    monkeypatch.setitem(sys.modules, "tagoio_sdk", types.SimpleNamespace(Device=DeviceFalso))
+    return DeviceFalso
+
+
+def test_transporte_desconhecido():
+    with pytest.raises(ValueError):
+        criaTransporte("pombo", token="t")
+
+
+@pytest.mark.parametrize("compressao", [None, "gzip", "deflate"])
+def test_sdk_ignora_a_compressao(sdkFalso, compressao):
+    dispositivo = Termometro("sdk", transporte="sdk", politica=PoliticaEnvio(compressao=compressao))
+    resultado = dispositivo.enviaDados({"variable": "x", "value": 1})
+    dispositivo.encerra()
+    assert resultado == "1 Data Added"
+    assert sdkFalso.enviados == [("sdk", [{"variable": "x", "value": 1}])]